@@ -1,6 +1,31 @@
 """A client library for accessing Video Game Exchange API"""
 
-from .client import AuthenticatedClient, Client
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .client import AuthenticatedClient, Client
+
+# Imported on first access, so `import video_game_exchange_api_client` stays cheap for tools that only need
+# one endpoint module
+_LAZY_ATTRIBUTES = {
+    "AuthenticatedClient": ".client",
+    "Client": ".client",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
+
 
 __all__ = (
     "AuthenticatedClient",
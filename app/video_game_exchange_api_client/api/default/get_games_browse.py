@@ -0,0 +1,238 @@
+from http import HTTPStatus
+from typing import Any
+
+import httpx
+
+from ... import errors
+from ...cache import parse_cached
+from ...client import AuthenticatedClient, Client
+from ...models.game_browse import GameBrowse
+from ...types import UNSET, Response, Unset
+
+
+def _get_kwargs(
+    *,
+    platform: list[str] | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    title: str | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+
+    params: dict[str, Any] = {}
+
+    json_platform: list[str] | Unset = UNSET
+    if not isinstance(platform, Unset):
+        json_platform = platform
+
+    params["platform"] = json_platform
+
+    params["owner_id"] = owner_id
+
+    params["title"] = title
+
+    params["after_id"] = after_id
+
+    params["limit"] = limit
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: dict[str, Any] = {
+        "method": "get",
+        "url": "/games/browse",
+        "params": params,
+    }
+
+    _kwargs["headers"] = headers
+    return _kwargs
+
+
+def _parse_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> GameBrowse | None:
+    if response.status_code == 200:
+        response_200 = GameBrowse.from_dict(client.codec.loads(response.content))
+
+        return response_200
+
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Response[GameBrowse]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parse=lambda: parse_cached(
+            response, __name__, lambda: _parse_response(client=client, response=response), client.cache
+        ),
+        lean=client.lean_responses,
+    )
+
+
+def sync_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    platform: list[str] | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    title: str | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> Response[GameBrowse]:
+    """Browse games with platform facets
+
+     One page of games matching the filters, plus how many games each platform has for the same filters
+    (ignoring the platform filter itself).
+
+    Args:
+        platform (list[str] | Unset): Only games on these platforms; repeat for several.
+        owner_id (int | Unset):
+        title (str | Unset): Case-insensitive substring of the title.
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[GameBrowse]
+    """
+
+    kwargs = _get_kwargs(
+        platform=platform,
+        owner_id=owner_id,
+        title=title,
+        after_id=after_id,
+        limit=limit,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: AuthenticatedClient | Client,
+    platform: list[str] | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    title: str | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> GameBrowse | None:
+    """Browse games with platform facets
+
+     One page of games matching the filters, plus how many games each platform has for the same filters
+    (ignoring the platform filter itself).
+
+    Args:
+        platform (list[str] | Unset): Only games on these platforms; repeat for several.
+        owner_id (int | Unset):
+        title (str | Unset): Case-insensitive substring of the title.
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        GameBrowse
+    """
+
+    return sync_detailed(
+        client=client,
+        platform=platform,
+        owner_id=owner_id,
+        title=title,
+        after_id=after_id,
+        limit=limit,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    platform: list[str] | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    title: str | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> Response[GameBrowse]:
+    """Browse games with platform facets
+
+     One page of games matching the filters, plus how many games each platform has for the same filters
+    (ignoring the platform filter itself).
+
+    Args:
+        platform (list[str] | Unset): Only games on these platforms; repeat for several.
+        owner_id (int | Unset):
+        title (str | Unset): Case-insensitive substring of the title.
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[GameBrowse]
+    """
+
+    kwargs = _get_kwargs(
+        platform=platform,
+        owner_id=owner_id,
+        title=title,
+        after_id=after_id,
+        limit=limit,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: AuthenticatedClient | Client,
+    platform: list[str] | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    title: str | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> GameBrowse | None:
+    """Browse games with platform facets
+
+     One page of games matching the filters, plus how many games each platform has for the same filters
+    (ignoring the platform filter itself).
+
+    Args:
+        platform (list[str] | Unset): Only games on these platforms; repeat for several.
+        owner_id (int | Unset):
+        title (str | Unset): Case-insensitive substring of the title.
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        GameBrowse
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            platform=platform,
+            owner_id=owner_id,
+            title=title,
+            after_id=after_id,
+            limit=limit,
+        )
+    ).parsed
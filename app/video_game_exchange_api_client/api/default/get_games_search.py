@@ -0,0 +1,234 @@
+from http import HTTPStatus
+from typing import Any
+
+import httpx
+
+from ... import errors
+from ...cache import parse_cached
+from ...client import AuthenticatedClient, Client
+from ...models.game import Game
+from ...types import UNSET, Response, Unset
+
+
+def _get_kwargs(
+    *,
+    title: str | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    platform: list[str] | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+
+    params: dict[str, Any] = {}
+
+    params["title"] = title
+
+    params["owner_id"] = owner_id
+
+    json_platform: list[str] | Unset = UNSET
+    if not isinstance(platform, Unset):
+        json_platform = platform
+
+    params["platform"] = json_platform
+
+    params["after_id"] = after_id
+
+    params["limit"] = limit
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: dict[str, Any] = {
+        "method": "get",
+        "url": "/games/search",
+        "params": params,
+    }
+
+    _kwargs["headers"] = headers
+    return _kwargs
+
+
+def _parse_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> list[Game] | None:
+    if response.status_code == 200:
+        response_200 = Game.from_list(client.codec.loads(response.content))
+
+        return response_200
+
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Response[list[Game]]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parse=lambda: parse_cached(
+            response, __name__, lambda: _parse_response(client=client, response=response), client.cache
+        ),
+        lean=client.lean_responses,
+    )
+
+
+def sync_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    title: str | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    platform: list[str] | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> Response[list[Game]]:
+    """Search games
+
+     Search games by title, owner and platform, one page at a time.
+
+    Args:
+        title (str | Unset): Case-insensitive substring of the title.
+        owner_id (int | Unset):
+        platform (list[str] | Unset): Only games on these platforms; repeat for several.
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[list[Game]]
+    """
+
+    kwargs = _get_kwargs(
+        title=title,
+        owner_id=owner_id,
+        platform=platform,
+        after_id=after_id,
+        limit=limit,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: AuthenticatedClient | Client,
+    title: str | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    platform: list[str] | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> list[Game] | None:
+    """Search games
+
+     Search games by title, owner and platform, one page at a time.
+
+    Args:
+        title (str | Unset): Case-insensitive substring of the title.
+        owner_id (int | Unset):
+        platform (list[str] | Unset): Only games on these platforms; repeat for several.
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        list[Game]
+    """
+
+    return sync_detailed(
+        client=client,
+        title=title,
+        owner_id=owner_id,
+        platform=platform,
+        after_id=after_id,
+        limit=limit,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    title: str | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    platform: list[str] | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> Response[list[Game]]:
+    """Search games
+
+     Search games by title, owner and platform, one page at a time.
+
+    Args:
+        title (str | Unset): Case-insensitive substring of the title.
+        owner_id (int | Unset):
+        platform (list[str] | Unset): Only games on these platforms; repeat for several.
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[list[Game]]
+    """
+
+    kwargs = _get_kwargs(
+        title=title,
+        owner_id=owner_id,
+        platform=platform,
+        after_id=after_id,
+        limit=limit,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: AuthenticatedClient | Client,
+    title: str | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    platform: list[str] | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+) -> list[Game] | None:
+    """Search games
+
+     Search games by title, owner and platform, one page at a time.
+
+    Args:
+        title (str | Unset): Case-insensitive substring of the title.
+        owner_id (int | Unset):
+        platform (list[str] | Unset): Only games on these platforms; repeat for several.
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        list[Game]
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            title=title,
+            owner_id=owner_id,
+            platform=platform,
+            after_id=after_id,
+            limit=limit,
+        )
+    ).parsed
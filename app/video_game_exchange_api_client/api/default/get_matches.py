@@ -0,0 +1,213 @@
+from http import HTTPStatus
+from typing import Any, cast
+
+import httpx
+
+from ... import errors
+from ...cache import parse_cached
+from ...client import AuthenticatedClient, Client
+from ...models.trade_match import TradeMatch
+from ...types import UNSET, Response, Unset
+
+
+def _get_kwargs(
+    *,
+    max_length: int | Unset = 4,
+    limit: int | Unset = 20,
+    x_user_id: int,
+) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+    headers["X-User-ID"] = str(x_user_id)
+
+    params: dict[str, Any] = {}
+
+    params["max_length"] = max_length
+
+    params["limit"] = limit
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: dict[str, Any] = {
+        "method": "get",
+        "url": "/matches",
+        "params": params,
+    }
+
+    _kwargs["headers"] = headers
+    return _kwargs
+
+
+def _parse_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Any | list[TradeMatch] | None:
+    if response.status_code == 200:
+        response_200 = TradeMatch.from_list(client.codec.loads(response.content))
+
+        return response_200
+
+    if response.status_code == 401:
+        response_401 = cast(Any, None)
+        return response_401
+
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(
+    *, client: AuthenticatedClient | Client, response: httpx.Response
+) -> Response[Any | list[TradeMatch]]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parse=lambda: parse_cached(
+            response, __name__, lambda: _parse_response(client=client, response=response), client.cache
+        ),
+        lean=client.lean_responses,
+    )
+
+
+def sync_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    max_length: int | Unset = 4,
+    limit: int | Unset = 20,
+    x_user_id: int,
+) -> Response[Any | list[TradeMatch]]:
+    """Find multi-party trades
+
+     Trades of 2 to 4 users, built from pending offers, in which the calling user and everyone else
+    receives a game they asked for: each user gets the game requested by their offer from the next user
+    in the cycle. Shortest trades first.
+
+    Args:
+        max_length (int | Unset): Most users in one trade Default: 4.
+        limit (int | Unset): Maximum number of trades to return Default: 20.
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Any | list[TradeMatch]]
+    """
+
+    kwargs = _get_kwargs(
+        max_length=max_length,
+        limit=limit,
+        x_user_id=x_user_id,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: AuthenticatedClient | Client,
+    max_length: int | Unset = 4,
+    limit: int | Unset = 20,
+    x_user_id: int,
+) -> Any | list[TradeMatch] | None:
+    """Find multi-party trades
+
+     Trades of 2 to 4 users, built from pending offers, in which the calling user and everyone else
+    receives a game they asked for: each user gets the game requested by their offer from the next user
+    in the cycle. Shortest trades first.
+
+    Args:
+        max_length (int | Unset): Most users in one trade Default: 4.
+        limit (int | Unset): Maximum number of trades to return Default: 20.
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Any | list[TradeMatch]
+    """
+
+    return sync_detailed(
+        client=client,
+        max_length=max_length,
+        limit=limit,
+        x_user_id=x_user_id,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    max_length: int | Unset = 4,
+    limit: int | Unset = 20,
+    x_user_id: int,
+) -> Response[Any | list[TradeMatch]]:
+    """Find multi-party trades
+
+     Trades of 2 to 4 users, built from pending offers, in which the calling user and everyone else
+    receives a game they asked for: each user gets the game requested by their offer from the next user
+    in the cycle. Shortest trades first.
+
+    Args:
+        max_length (int | Unset): Most users in one trade Default: 4.
+        limit (int | Unset): Maximum number of trades to return Default: 20.
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Any | list[TradeMatch]]
+    """
+
+    kwargs = _get_kwargs(
+        max_length=max_length,
+        limit=limit,
+        x_user_id=x_user_id,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: AuthenticatedClient | Client,
+    max_length: int | Unset = 4,
+    limit: int | Unset = 20,
+    x_user_id: int,
+) -> Any | list[TradeMatch] | None:
+    """Find multi-party trades
+
+     Trades of 2 to 4 users, built from pending offers, in which the calling user and everyone else
+    receives a game they asked for: each user gets the game requested by their offer from the next user
+    in the cycle. Shortest trades first.
+
+    Args:
+        max_length (int | Unset): Most users in one trade Default: 4.
+        limit (int | Unset): Maximum number of trades to return Default: 20.
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Any | list[TradeMatch]
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            max_length=max_length,
+            limit=limit,
+            x_user_id=x_user_id,
+        )
+    ).parsed
@@ -0,0 +1,225 @@
+from http import HTTPStatus
+from typing import Any, cast
+
+import httpx
+
+from ... import errors
+from ...cache import parse_cached
+from ...client import AuthenticatedClient, Client
+from ...models.trade_offer import TradeOffer
+from ...models.trade_offer_status import TradeOfferStatus
+from ...types import UNSET, Response, Unset
+
+
+def _get_kwargs(
+    *,
+    status: TradeOfferStatus | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+    x_user_id: int,
+) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+    headers["X-User-ID"] = str(x_user_id)
+
+    params: dict[str, Any] = {}
+
+    json_status: str | Unset = UNSET
+    if not isinstance(status, Unset):
+        json_status = status.value
+
+    params["status"] = json_status
+
+    params["after_id"] = after_id
+
+    params["limit"] = limit
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: dict[str, Any] = {
+        "method": "get",
+        "url": "/offers",
+        "params": params,
+    }
+
+    _kwargs["headers"] = headers
+    return _kwargs
+
+
+def _parse_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Any | list[TradeOffer] | None:
+    if response.status_code == 200:
+        response_200 = TradeOffer.from_list(client.codec.loads(response.content))
+
+        return response_200
+
+    if response.status_code == 401:
+        response_401 = cast(Any, None)
+        return response_401
+
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(
+    *, client: AuthenticatedClient | Client, response: httpx.Response
+) -> Response[Any | list[TradeOffer]]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parse=lambda: parse_cached(
+            response, __name__, lambda: _parse_response(client=client, response=response), client.cache
+        ),
+        lean=client.lean_responses,
+    )
+
+
+def sync_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    status: TradeOfferStatus | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+    x_user_id: int,
+) -> Response[Any | list[TradeOffer]]:
+    """List offers received
+
+     List trade offers for games owned by the calling user, one page at a time.
+
+    Args:
+        status (TradeOfferStatus | Unset):
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Any | list[TradeOffer]]
+    """
+
+    kwargs = _get_kwargs(
+        status=status,
+        after_id=after_id,
+        limit=limit,
+        x_user_id=x_user_id,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: AuthenticatedClient | Client,
+    status: TradeOfferStatus | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+    x_user_id: int,
+) -> Any | list[TradeOffer] | None:
+    """List offers received
+
+     List trade offers for games owned by the calling user, one page at a time.
+
+    Args:
+        status (TradeOfferStatus | Unset):
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Any | list[TradeOffer]
+    """
+
+    return sync_detailed(
+        client=client,
+        status=status,
+        after_id=after_id,
+        limit=limit,
+        x_user_id=x_user_id,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    status: TradeOfferStatus | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+    x_user_id: int,
+) -> Response[Any | list[TradeOffer]]:
+    """List offers received
+
+     List trade offers for games owned by the calling user, one page at a time.
+
+    Args:
+        status (TradeOfferStatus | Unset):
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Any | list[TradeOffer]]
+    """
+
+    kwargs = _get_kwargs(
+        status=status,
+        after_id=after_id,
+        limit=limit,
+        x_user_id=x_user_id,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: AuthenticatedClient | Client,
+    status: TradeOfferStatus | Unset = UNSET,
+    after_id: int | Unset = UNSET,
+    limit: int | Unset = 100,
+    x_user_id: int,
+) -> Any | list[TradeOffer] | None:
+    """List offers received
+
+     List trade offers for games owned by the calling user, one page at a time.
+
+    Args:
+        status (TradeOfferStatus | Unset):
+        after_id (int | Unset): Return items with an id greater than this.
+        limit (int | Unset): Maximum number of items to return. Default: 100.
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Any | list[TradeOffer]
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            status=status,
+            after_id=after_id,
+            limit=limit,
+            x_user_id=x_user_id,
+        )
+    ).parsed
@@ -6,6 +6,7 @@ import httpx
 
 from ... import errors
 from ...client import AuthenticatedClient, Client
+from ...codec import JSONCodec
 from ...models.user_partial_update import UserPartialUpdate
 from ...types import Response
 
@@ -14,6 +15,7 @@ def _get_kwargs(
     user_id: int,
     *,
     body: UserPartialUpdate,
+    codec: JSONCodec,
 ) -> dict[str, Any]:
     headers: dict[str, Any] = {}
 
@@ -24,7 +26,7 @@ def _get_kwargs(
         ),
     }
 
-    _kwargs["json"] = body.to_dict()
+    _kwargs["content"] = codec.dumps(body.to_dict())
 
     headers["Content-Type"] = "application/json"
 
@@ -53,7 +55,8 @@ def _build_response(*, client: AuthenticatedClient | Client, response: httpx.Res
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parse=lambda: _parse_response(client=client, response=response),
+        lean=client.lean_responses,
     )
 
 
@@ -82,6 +85,7 @@ def sync_detailed(
     kwargs = _get_kwargs(
         user_id=user_id,
         body=body,
+        codec=client.codec,
     )
 
     response = client.get_httpx_client().request(
@@ -116,6 +120,7 @@ async def asyncio_detailed(
     kwargs = _get_kwargs(
         user_id=user_id,
         body=body,
+        codec=client.codec,
     )
 
     response = await client.get_async_httpx_client().request(**kwargs)
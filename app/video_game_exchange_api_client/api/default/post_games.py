@@ -5,6 +5,7 @@ import httpx
 
 from ... import errors
 from ...client import AuthenticatedClient, Client
+from ...codec import JSONCodec
 from ...models.game import Game
 from ...models.game_create import GameCreate
 from ...types import Response
@@ -13,6 +14,7 @@ from ...types import Response
 def _get_kwargs(
     *,
     body: GameCreate,
+    codec: JSONCodec,
 ) -> dict[str, Any]:
     headers: dict[str, Any] = {}
 
@@ -21,7 +23,7 @@ def _get_kwargs(
         "url": "/games",
     }
 
-    _kwargs["json"] = body.to_dict()
+    _kwargs["content"] = codec.dumps(body.to_dict())
 
     headers["Content-Type"] = "application/json"
 
@@ -31,7 +33,7 @@ def _get_kwargs(
 
 def _parse_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Any | Game | None:
     if response.status_code == 201:
-        response_201 = Game.from_dict(response.json())
+        response_201 = Game.from_dict(client.codec.loads(response.content))
 
         return response_201
 
@@ -50,7 +52,8 @@ def _build_response(*, client: AuthenticatedClient | Client, response: httpx.Res
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parse=lambda: _parse_response(client=client, response=response),
+        lean=client.lean_responses,
     )
 
 
@@ -76,6 +79,7 @@ def sync_detailed(
 
     kwargs = _get_kwargs(
         body=body,
+        codec=client.codec,
     )
 
     response = client.get_httpx_client().request(
@@ -133,6 +137,7 @@ async def asyncio_detailed(
 
     kwargs = _get_kwargs(
         body=body,
+        codec=client.codec,
     )
 
     response = await client.get_async_httpx_client().request(**kwargs)
@@ -0,0 +1,195 @@
+from http import HTTPStatus
+from typing import Any, cast
+
+import httpx
+
+from ... import errors
+from ...client import AuthenticatedClient, Client
+from ...codec import JSONCodec
+from ...models.trade_offer import TradeOffer
+from ...models.trade_offer_create import TradeOfferCreate
+from ...types import Response
+
+
+def _get_kwargs(
+    *,
+    body: TradeOfferCreate,
+    codec: JSONCodec,
+    x_user_id: int,
+) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+    headers["X-User-ID"] = str(x_user_id)
+
+    _kwargs: dict[str, Any] = {
+        "method": "post",
+        "url": "/offers",
+    }
+
+    _kwargs["content"] = codec.dumps(body.to_dict())
+
+    headers["Content-Type"] = "application/json"
+
+    _kwargs["headers"] = headers
+    return _kwargs
+
+
+def _parse_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Any | TradeOffer | None:
+    if response.status_code == 200:
+        response_200 = TradeOffer.from_dict(client.codec.loads(response.content))
+
+        return response_200
+
+    if response.status_code == 401:
+        response_401 = cast(Any, None)
+        return response_401
+
+    if response.status_code == 403:
+        response_403 = cast(Any, None)
+        return response_403
+
+    if response.status_code == 404:
+        response_404 = cast(Any, None)
+        return response_404
+
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Response[Any | TradeOffer]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parse=lambda: _parse_response(client=client, response=response),
+        lean=client.lean_responses,
+    )
+
+
+def sync_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    body: TradeOfferCreate,
+    x_user_id: int,
+) -> Response[Any | TradeOffer]:
+    """Make a trade offer
+
+     Offer one of your games in exchange for another.
+
+    Args:
+        body (TradeOfferCreate):
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Any | TradeOffer]
+    """
+
+    kwargs = _get_kwargs(
+        body=body,
+        x_user_id=x_user_id,
+        codec=client.codec,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: AuthenticatedClient | Client,
+    body: TradeOfferCreate,
+    x_user_id: int,
+) -> Any | TradeOffer | None:
+    """Make a trade offer
+
+     Offer one of your games in exchange for another.
+
+    Args:
+        body (TradeOfferCreate):
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Any | TradeOffer
+    """
+
+    return sync_detailed(
+        client=client,
+        body=body,
+        x_user_id=x_user_id,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: AuthenticatedClient | Client,
+    body: TradeOfferCreate,
+    x_user_id: int,
+) -> Response[Any | TradeOffer]:
+    """Make a trade offer
+
+     Offer one of your games in exchange for another.
+
+    Args:
+        body (TradeOfferCreate):
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Any | TradeOffer]
+    """
+
+    kwargs = _get_kwargs(
+        body=body,
+        x_user_id=x_user_id,
+        codec=client.codec,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: AuthenticatedClient | Client,
+    body: TradeOfferCreate,
+    x_user_id: int,
+) -> Any | TradeOffer | None:
+    """Make a trade offer
+
+     Offer one of your games in exchange for another.
+
+    Args:
+        body (TradeOfferCreate):
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Any | TradeOffer
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            body=body,
+            x_user_id=x_user_id,
+        )
+    ).parsed
@@ -6,6 +6,7 @@ import httpx
 
 from ... import errors
 from ...client import AuthenticatedClient, Client
+from ...codec import JSONCodec
 from ...models.game_update import GameUpdate
 from ...types import Response
 
@@ -14,6 +15,7 @@ def _get_kwargs(
     game_id: int,
     *,
     body: GameUpdate,
+    codec: JSONCodec,
 ) -> dict[str, Any]:
     headers: dict[str, Any] = {}
 
@@ -24,7 +26,7 @@ def _get_kwargs(
         ),
     }
 
-    _kwargs["json"] = body.to_dict()
+    _kwargs["content"] = codec.dumps(body.to_dict())
 
     headers["Content-Type"] = "application/json"
 
@@ -50,7 +52,8 @@ def _build_response(*, client: AuthenticatedClient | Client, response: httpx.Res
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parse=lambda: _parse_response(client=client, response=response),
+        lean=client.lean_responses,
     )
 
 
@@ -79,6 +82,7 @@ def sync_detailed(
     kwargs = _get_kwargs(
         game_id=game_id,
         body=body,
+        codec=client.codec,
     )
 
     response = client.get_httpx_client().request(
@@ -113,6 +117,7 @@ async def asyncio_detailed(
     kwargs = _get_kwargs(
         game_id=game_id,
         body=body,
+        codec=client.codec,
     )
 
     response = await client.get_async_httpx_client().request(**kwargs)
@@ -0,0 +1,216 @@
+from http import HTTPStatus
+from typing import Any, cast
+from urllib.parse import quote
+
+import httpx
+
+from ... import errors
+from ...client import AuthenticatedClient, Client
+from ...models.trade_offer import TradeOffer
+from ...models.trade_offer_status import TradeOfferStatus
+from ...types import UNSET, Response
+
+
+def _get_kwargs(
+    offer_id: int,
+    *,
+    status: TradeOfferStatus,
+    x_user_id: int,
+) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+    headers["X-User-ID"] = str(x_user_id)
+
+    params: dict[str, Any] = {}
+
+    json_status = status.value
+
+    params["status"] = json_status
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: dict[str, Any] = {
+        "method": "put",
+        "url": "/offers/{offer_id}".format(
+            offer_id=quote(str(offer_id), safe=""),
+        ),
+        "params": params,
+    }
+
+    _kwargs["headers"] = headers
+    return _kwargs
+
+
+def _parse_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Any | TradeOffer | None:
+    if response.status_code == 200:
+        response_200 = TradeOffer.from_dict(client.codec.loads(response.content))
+
+        return response_200
+
+    if response.status_code == 400:
+        response_400 = cast(Any, None)
+        return response_400
+
+    if response.status_code == 401:
+        response_401 = cast(Any, None)
+        return response_401
+
+    if response.status_code == 403:
+        response_403 = cast(Any, None)
+        return response_403
+
+    if response.status_code == 404:
+        response_404 = cast(Any, None)
+        return response_404
+
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(*, client: AuthenticatedClient | Client, response: httpx.Response) -> Response[Any | TradeOffer]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parse=lambda: _parse_response(client=client, response=response),
+        lean=client.lean_responses,
+    )
+
+
+def sync_detailed(
+    offer_id: int,
+    *,
+    client: AuthenticatedClient | Client,
+    status: TradeOfferStatus,
+    x_user_id: int,
+) -> Response[Any | TradeOffer]:
+    """Update a trade offer's status
+
+     Accept or reject an offer, as its requester or the owner of the requested game.
+
+    Args:
+        offer_id (int):
+        status (TradeOfferStatus):
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Any | TradeOffer]
+    """
+
+    kwargs = _get_kwargs(
+        offer_id=offer_id,
+        status=status,
+        x_user_id=x_user_id,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    offer_id: int,
+    *,
+    client: AuthenticatedClient | Client,
+    status: TradeOfferStatus,
+    x_user_id: int,
+) -> Any | TradeOffer | None:
+    """Update a trade offer's status
+
+     Accept or reject an offer, as its requester or the owner of the requested game.
+
+    Args:
+        offer_id (int):
+        status (TradeOfferStatus):
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Any | TradeOffer
+    """
+
+    return sync_detailed(
+        offer_id=offer_id,
+        client=client,
+        status=status,
+        x_user_id=x_user_id,
+    ).parsed
+
+
+async def asyncio_detailed(
+    offer_id: int,
+    *,
+    client: AuthenticatedClient | Client,
+    status: TradeOfferStatus,
+    x_user_id: int,
+) -> Response[Any | TradeOffer]:
+    """Update a trade offer's status
+
+     Accept or reject an offer, as its requester or the owner of the requested game.
+
+    Args:
+        offer_id (int):
+        status (TradeOfferStatus):
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Any | TradeOffer]
+    """
+
+    kwargs = _get_kwargs(
+        offer_id=offer_id,
+        status=status,
+        x_user_id=x_user_id,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    offer_id: int,
+    *,
+    client: AuthenticatedClient | Client,
+    status: TradeOfferStatus,
+    x_user_id: int,
+) -> Any | TradeOffer | None:
+    """Update a trade offer's status
+
+     Accept or reject an offer, as its requester or the owner of the requested game.
+
+    Args:
+        offer_id (int):
+        status (TradeOfferStatus):
+        x_user_id (int):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Any | TradeOffer
+    """
+
+    return (
+        await asyncio_detailed(
+            offer_id=offer_id,
+            client=client,
+            status=status,
+            x_user_id=x_user_id,
+        )
+    ).parsed
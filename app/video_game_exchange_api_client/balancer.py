@@ -0,0 +1,304 @@
+"""Client-side load balancing across several API replicas"""
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from typing import Any
+
+import httpx
+
+# Statuses that count as a replica failing (a 429 or 4xx is the caller's problem, not the replica's)
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+LEAST_OUTSTANDING = "least_outstanding"
+POWER_OF_TWO = "p2c"
+
+
+class Endpoint:
+    """One replica, with the counters the balancer chooses by"""
+
+    def __init__(self, base_url: str) -> None:
+        self.url = httpx.URL(base_url)
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.healthy = True
+
+    @property
+    def origin(self) -> str:
+        return f"{self.url.scheme}://{self.url.netloc.decode('ascii')}"
+
+    def available(self, now: float) -> bool:
+        return self.healthy and now >= self.ejected_until
+
+
+class Balancer:
+    """Spreads requests over several base URLs, skipping replicas that fail
+
+    Each request goes to the replica with the fewest requests in flight (``least_outstanding``), or to the less
+    busy of two replicas picked at random (``p2c``, power of two choices, which avoids every client piling onto the
+    same replica at once). The scheme, host and port of the request URL are replaced; the path is kept.
+
+    Replicas are taken out of rotation two ways:
+
+    - Passive ejection: after ``eject_after`` consecutive connection errors or 5xx responses a replica is skipped for
+      ``eject_for`` seconds, then tried again.
+    - Active health checks: every ``health_interval`` seconds a background thread requests ``health_path`` from
+      each replica and skips those that don't answer with a 2xx until they do. Set ``health_interval`` to None to
+      disable the checks.
+
+    If every replica is out of rotation, requests are spread over all of them rather than failing outright.
+
+    Args:
+        base_urls: The replicas, e.g. ``["http://api1:8000", "http://api2:8000", "http://api3:8000"]``
+        strategy: ``"p2c"`` or ``"least_outstanding"``
+        eject_after: Consecutive failures before a replica is ejected
+        eject_for: Seconds an ejected replica is skipped
+        health_path: The path probed by the health checks
+        health_interval: Seconds between health check rounds, or None for no health checks
+        health_timeout: Timeout of each health check request, in seconds
+        health_transport: The transport health checks are sent with (defaults to a plain ``httpx.HTTPTransport``).
+            A transport passed in stays open; the caller closes it.
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        *,
+        strategy: str = POWER_OF_TWO,
+        eject_after: int = 3,
+        eject_for: float = 30.0,
+        health_path: str = "/whoami",
+        health_interval: float | None = 5.0,
+        health_timeout: float = 2.0,
+        health_transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        if not base_urls:
+            raise ValueError("Balancer needs at least one base URL")
+        if strategy not in (POWER_OF_TWO, LEAST_OUTSTANDING):
+            raise ValueError(f"Unknown strategy {strategy!r}, expected {POWER_OF_TWO!r} or {LEAST_OUTSTANDING!r}")
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.eject_for = eject_for
+        self.health_path = health_path
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.health_transport = health_transport
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_thread: threading.Thread | None = None
+        # Reused by every health check round
+        self._health_client: httpx.Client | None = None
+
+    def choose(self) -> Endpoint:
+        """Pick the replica for the next request and count it as outstanding"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint.available(now)] or self.endpoints
+            if self.strategy == POWER_OF_TWO and len(candidates) > 2:
+                first, second = random.sample(candidates, 2)
+                endpoint = first if first.outstanding <= second.outstanding else second
+            else:
+                fewest = min(endpoint.outstanding for endpoint in candidates)
+                endpoint = random.choice([endpoint for endpoint in candidates if endpoint.outstanding == fewest])
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+
+    def record(self, endpoint: Endpoint, response: httpx.Response | None) -> None:
+        """Update ``endpoint``'s failure count from ``response`` (None for a connection error)"""
+        with self._lock:
+            if response is not None and response.status_code not in FAILURE_STATUSES:
+                endpoint.consecutive_failures = 0
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.eject_after:
+                endpoint.ejected_until = time.monotonic() + self.eject_for
+                endpoint.consecutive_failures = 0
+
+    def route(self, request: httpx.Request, endpoint: Endpoint) -> httpx.Request:
+        """A copy of ``request`` addressed to ``endpoint``"""
+        url = request.url.copy_with(scheme=endpoint.url.scheme, host=endpoint.url.host, port=endpoint.url.port)
+        headers = request.headers.copy()
+        headers["Host"] = url.netloc.decode("ascii")
+        return httpx.Request(request.method, url, headers=headers, stream=request.stream, extensions=request.extensions)
+
+    # ---- health checks ----
+
+    def check_health(self) -> None:
+        """Probe every replica once, updating whether it is in rotation"""
+        if self._health_client is None:
+            self._health_client = httpx.Client(transport=self.health_transport, timeout=self.health_timeout)
+        for endpoint in self.endpoints:
+            try:
+                healthy = self._health_client.get(endpoint.url.join(self.health_path)).is_success
+            except httpx.HTTPError:
+                healthy = False
+            with self._lock:
+                endpoint.healthy = healthy
+                if healthy:
+                    endpoint.ejected_until = 0.0
+
+    def start_health_checks(self) -> None:
+        """Start the background health checks, if enabled and not already running"""
+        if self.health_interval is None:
+            return
+        with self._lock:
+            if self._health_thread is not None or self._stop.is_set():
+                return
+            self._health_thread = threading.Thread(
+                target=self._run_health_checks, name="video-game-exchange-health", daemon=True
+            )
+            # Started under the lock, so close() never sees a thread it can't join yet
+            self._health_thread.start()
+
+    def _run_health_checks(self) -> None:
+        assert self.health_interval is not None
+        while not self._stop.is_set():
+            self.check_health()
+            self._stop.wait(self.health_interval)
+
+    def close(self) -> None:
+        """Stop the background health checks, waiting for a round in progress to finish"""
+        self._stop.set()
+        with self._lock:
+            thread = self._health_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        client, self._health_client = self._health_client, None
+        # Closing the client closes its transport, which is only ours to close if we created it
+        if client is not None and self.health_transport is None:
+            client.close()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-replica counters, keyed by origin"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                endpoint.origin: {
+                    "outstanding": endpoint.outstanding,
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "healthy": endpoint.healthy,
+                    "ejected": now < endpoint.ejected_until,
+                }
+                for endpoint in self.endpoints
+            }
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Keeps a request counted as outstanding until its response body is closed"""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._release is not None:
+                self._release, release = None, self._release
+                release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    """Keeps a request counted as outstanding until its response body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release, release = None, self._release
+                release()
+
+
+class BalancingTransport(httpx.BaseTransport):
+    """Sends each request to the replica chosen by ``balancer``"""
+
+    def __init__(self, transport: httpx.BaseTransport, balancer: Balancer) -> None:
+        self.transport = transport
+        self.balancer = balancer
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.balancer.start_health_checks()
+        endpoint = self.balancer.choose()
+        try:
+            response = self.transport.handle_request(self.balancer.route(request, endpoint))
+        except BaseException as error:
+            if isinstance(error, httpx.TransportError):
+                self.balancer.record(endpoint, None)
+            self.balancer.release(endpoint)
+            raise
+        self.balancer.record(endpoint, response)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, lambda: self.balancer.release(endpoint)),  # type: ignore[arg-type]
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self.balancer.close()
+        self.transport.close()
+
+
+class AsyncBalancingTransport(httpx.AsyncBaseTransport):
+    """Sends each request to the replica chosen by ``balancer``"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, balancer: Balancer) -> None:
+        self.transport = transport
+        self.balancer = balancer
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.balancer.start_health_checks()
+        endpoint = self.balancer.choose()
+        try:
+            response = await self.transport.handle_async_request(self.balancer.route(request, endpoint))
+        except BaseException as error:
+            if isinstance(error, httpx.TransportError):
+                self.balancer.record(endpoint, None)
+            self.balancer.release(endpoint)
+            raise
+        self.balancer.record(endpoint, response)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_AsyncReleasingStream(response.stream, lambda: self.balancer.release(endpoint)),  # type: ignore[arg-type]
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        # Joining the health thread may wait for a probe, so it happens off the event loop
+        await asyncio.to_thread(self.balancer.close)
+        await self.transport.aclose()
+
+
+__all__ = [
+    "AsyncBalancingTransport",
+    "Balancer",
+    "BalancingTransport",
+    "Endpoint",
+]
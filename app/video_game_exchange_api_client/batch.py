@@ -0,0 +1,176 @@
+"""Helpers for calling an endpoint for many items with bounded concurrency"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any, Generic, TypeVar
+
+from attrs import define
+
+from .client import AuthenticatedClient, Client
+from .types import Response
+
+T = TypeVar("T")
+ItemT = TypeVar("ItemT")
+
+
+@define
+class BatchResult(Generic[ItemT, T]):
+    """The outcome of one item in a batch call
+
+    Attributes:
+        item: The input (id or request body) this result belongs to
+        response: The endpoint response, or None if the request raised
+        error: The exception raised for this item (transport error, errors.UnexpectedStatus, ...), if any
+    """
+
+    item: ItemT
+    response: Response[T] | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request completed with a 2xx status"""
+        return self.error is None and self.response is not None and 200 <= self.response.status_code < 300
+
+    @property
+    def parsed(self) -> T | None:
+        return self.response.parsed if self.response is not None else None
+
+
+def _checked(item: ItemT, response: Response[T]) -> BatchResult[ItemT, T]:
+    # Responses parse lazily, so errors.UnexpectedStatus is only raised here, where it is collected as the error
+    response.parsed
+    return BatchResult(item=item, response=response)
+
+
+async def _gather_bounded(
+    call: Callable[[ItemT], Awaitable[Response[T]]],
+    items: Iterable[ItemT],
+    concurrency: int,
+) -> list[BatchResult[ItemT, T]]:
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item: ItemT) -> BatchResult[ItemT, T]:
+        async with semaphore:
+            try:
+                return _checked(item, await call(item))
+            except Exception as error:
+                return BatchResult(item=item, error=error)
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
+
+
+def _map_threaded(
+    call: Callable[[ItemT], Response[T]],
+    items: Iterable[ItemT],
+    concurrency: int,
+) -> list[BatchResult[ItemT, T]]:
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    def run(item: ItemT) -> BatchResult[ItemT, T]:
+        try:
+            return _checked(item, call(item))
+        except Exception as error:
+            return BatchResult(item=item, error=error)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(run, items))
+
+
+async def get_many(
+    ids: Iterable[Any],
+    *,
+    client: AuthenticatedClient | Client,
+    endpoint: ModuleType,
+    concurrency: int = 10,
+) -> list[BatchResult[Any, Any]]:
+    """Fetch many resources by id through one shared ``httpx.AsyncClient``
+
+    Args:
+        ids: The path ids to fetch, e.g. game ids
+        client: The client whose async httpx client is shared by every request
+        endpoint: An endpoint module taking a single path id, e.g. ``api.default.get_games_game_id``
+        concurrency: The maximum number of requests in flight at once
+
+    Returns:
+        One BatchResult per id, in the order of ``ids``. Failures are collected per item instead of raised.
+    """
+
+    return await _gather_bounded(lambda id: endpoint.asyncio_detailed(id, client=client), ids, concurrency)
+
+
+async def create_many(
+    bodies: Iterable[Any],
+    *,
+    client: AuthenticatedClient | Client,
+    endpoint: ModuleType,
+    concurrency: int = 10,
+) -> list[BatchResult[Any, Any]]:
+    """Send many request bodies through one shared ``httpx.AsyncClient``
+
+    Args:
+        bodies: The request bodies, e.g. GameCreate instances
+        client: The client whose async httpx client is shared by every request
+        endpoint: An endpoint module taking a ``body``, e.g. ``api.default.post_games``
+        concurrency: The maximum number of requests in flight at once
+
+    Returns:
+        One BatchResult per body, in the order of ``bodies``. Failures are collected per item instead of raised.
+    """
+
+    return await _gather_bounded(lambda body: endpoint.asyncio_detailed(client=client, body=body), bodies, concurrency)
+
+
+def sync_get_many(
+    ids: Iterable[Any],
+    *,
+    client: AuthenticatedClient | Client,
+    endpoint: ModuleType,
+    concurrency: int = 10,
+) -> list[BatchResult[Any, Any]]:
+    """Fetch many resources by id from a thread pool sharing one ``httpx.Client``
+
+    Args:
+        ids: The path ids to fetch, e.g. game ids
+        client: The client whose httpx client is shared by every thread
+        endpoint: An endpoint module taking a single path id, e.g. ``api.default.get_games_game_id``
+        concurrency: The number of worker threads
+
+    Returns:
+        One BatchResult per id, in the order of ``ids``. Failures are collected per item instead of raised.
+    """
+
+    # Build the shared httpx.Client up front so the worker threads don't race to create it
+    client.get_httpx_client()
+    return _map_threaded(lambda id: endpoint.sync_detailed(id, client=client), ids, concurrency)
+
+
+def sync_create_many(
+    bodies: Iterable[Any],
+    *,
+    client: AuthenticatedClient | Client,
+    endpoint: ModuleType,
+    concurrency: int = 10,
+) -> list[BatchResult[Any, Any]]:
+    """Send many request bodies from a thread pool sharing one ``httpx.Client``
+
+    Args:
+        bodies: The request bodies, e.g. GameCreate instances
+        client: The client whose httpx client is shared by every thread
+        endpoint: An endpoint module taking a ``body``, e.g. ``api.default.post_games``
+        concurrency: The number of worker threads
+
+    Returns:
+        One BatchResult per body, in the order of ``bodies``. Failures are collected per item instead of raised.
+    """
+
+    client.get_httpx_client()
+    return _map_threaded(lambda body: endpoint.sync_detailed(client=client, body=body), bodies, concurrency)
+
+
+__all__ = ["BatchResult", "create_many", "get_many", "sync_create_many", "sync_get_many"]
@@ -0,0 +1,355 @@
+"""An opt-in HTTP cache for GET requests, with ETag revalidation"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import httpx
+from attrs import define, field
+
+T = TypeVar("T")
+
+# The response extension under which the cache entry backing a response is exposed
+CACHE_ENTRY_EXTENSION = "video_game_exchange_cache_entry"
+
+# The response extension under which other layers (such as request coalescing) share parsed models; the value
+# has the same ``memo(key, parse, stats)`` method as CacheEntry
+PARSE_MEMO_EXTENSION = "video_game_exchange_parse_memo"
+
+# Headers a 304 Not Modified may update on the stored response
+_REVALIDATION_HEADERS = ("Cache-Control", "Date", "ETag", "Expires", "Last-Modified", "Vary")
+
+
+def _cache_control(headers: httpx.Headers) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+@define
+class CacheStats:
+    """Counters describing how well a ResponseCache is doing
+
+    Attributes:
+        hits: Requests answered from a fresh entry, without touching the network
+        misses: Requests that had no usable entry and went to the server
+        revalidations: Stale entries confirmed by a 304 Not Modified, so no body was transferred
+        parse_hits: Responses whose parsed model was reused instead of parsed again
+        stores: Responses written to the cache; refreshes by a 304 count as revalidations instead
+        evictions: Entries dropped from memory to stay within ``max_entries``
+    """
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    parse_hits: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """The share of lookups served without downloading a body (fresh hits and revalidations)"""
+        served = self.hits + self.revalidations
+        total = served + self.misses
+        return served / total if total else 0.0
+
+
+@define
+class CacheEntry:
+    """A stored response, plus the models already parsed from it"""
+
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    stored_at: float
+    max_age: float | None
+    vary: dict[str, str | None]
+    parsed: dict[str, Any] = field(factory=dict)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False)
+
+    @property
+    def etag(self) -> str | None:
+        return httpx.Headers(self.headers).get("ETag")
+
+    def is_fresh(self, now: float) -> bool:
+        return self.max_age is not None and now - self.stored_at < self.max_age
+
+    def matches(self, request: httpx.Request) -> bool:
+        return all(request.headers.get(name) == value for name, value in self.vary.items())
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+            extensions={CACHE_ENTRY_EXTENSION: self},
+        )
+
+    def memo(self, key: str, parse: Callable[[], T], stats: CacheStats | None = None) -> T:
+        """Return the value parsed under ``key``, calling ``parse`` only the first time"""
+        with self._lock:
+            if key in self.parsed:
+                if stats is not None:
+                    stats.parse_hits += 1
+                return self.parsed[key]
+        value = parse()
+        with self._lock:
+            return self.parsed.setdefault(key, value)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "url": self.url,
+                "status_code": self.status_code,
+                "headers": self.headers,
+                "content": base64.b64encode(self.content).decode("ascii"),
+                "stored_at": self.stored_at,
+                "max_age": self.max_age,
+                "vary": self.vary,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "CacheEntry":
+        d = json.loads(data)
+        return cls(
+            url=d["url"],
+            status_code=d["status_code"],
+            headers=[tuple(header) for header in d["headers"]],
+            content=base64.b64decode(d["content"]),
+            stored_at=d["stored_at"],
+            max_age=d["max_age"],
+            vary=d["vary"],
+        )
+
+
+class ResponseCache:
+    """An LRU cache of GET responses, optionally persisted to a directory
+
+    Responses are stored when they are ``200 OK`` and allowed by ``Cache-Control`` (``no-store`` is honored).
+    While ``max-age`` has not elapsed the stored response is returned without a request. Afterwards, or when
+    the response said ``no-cache``, the request is sent with ``If-None-Match`` and a ``304`` reuses the stored
+    body. Headers named in ``Vary`` must match for an entry to be used.
+
+    The models parsed from a cached response are kept with it, so repeated reads skip parsing too. Those
+    models are shared between callers and should be treated as read-only.
+
+    Args:
+        max_entries: How many responses to keep in memory
+        directory: If set, responses are also written here and survive restarts
+    """
+
+    def __init__(self, max_entries: int = 1024, directory: str | os.PathLike[str] | None = None) -> None:
+        self.max_entries = max_entries
+        self.directory = os.fspath(directory) if directory is not None else None
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory or "", hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def get(self, url: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                entry = CacheEntry.from_json(f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(entry)
+        return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        self.stats.stores += 1
+        self._save(entry)
+
+    def _save(self, entry: CacheEntry) -> None:
+        self._remember(entry)
+        if self.directory is not None:
+            path = self._path(entry.url)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(entry.to_json())
+            os.replace(path + ".tmp", path)
+
+    def delete(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(url, None)
+        if self.directory is not None:
+            try:
+                os.remove(self._path(url))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[entry.url] = entry
+            self._entries.move_to_end(entry.url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    # ---- request handling shared by the sync and async transports ----
+
+    def lookup(self, request: httpx.Request) -> tuple[CacheEntry | None, httpx.Response | None]:
+        """Return the entry to revalidate (if any) and, when fresh, the response to serve directly"""
+        if request.method != "GET" or "no-store" in _cache_control(request.headers):
+            return None, None
+        entry = self.get(str(request.url))
+        if entry is None or not entry.matches(request):
+            self.stats.misses += 1
+            return None, None
+        if entry.is_fresh(time.time()) and "no-cache" not in _cache_control(request.headers):
+            self.stats.hits += 1
+            return entry, entry.to_response(request)
+        if entry.etag is None:
+            self.stats.misses += 1
+            return None, None
+        request.headers["If-None-Match"] = entry.etag
+        return entry, None
+
+    def complete(self, request: httpx.Request, entry: CacheEntry | None, response: httpx.Response) -> httpx.Response:
+        """Turn the network response into the one returned to the caller, storing or refreshing entries"""
+        if entry is not None and response.status_code == 304:
+            response.close()
+            self.stats.revalidations += 1
+            refreshed = httpx.Headers(entry.headers)
+            for name in _REVALIDATION_HEADERS:
+                if name in response.headers:
+                    refreshed[name] = response.headers[name]
+            entry.headers = list(refreshed.items())
+            entry.stored_at = time.time()
+            # A 304 without Cache-Control keeps the stored freshness lifetime
+            entry.max_age = self._max_age(refreshed)
+            # Counted under revalidations, not stores
+            self._save(entry)
+            return entry.to_response(request)
+        if entry is not None:
+            self.stats.misses += 1
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            # A successful write makes the stored representation of that URL stale
+            self.delete(str(request.url))
+            return response
+        if request.method != "GET" or response.status_code != 200:
+            return response
+        directives = _cache_control(response.headers)
+        if "no-store" in directives or response.headers.get("Vary") == "*":
+            return response
+        vary = {
+            name.strip().lower(): request.headers.get(name.strip())
+            for name in response.headers.get("Vary", "").split(",")
+            if name.strip()
+        }
+        new_entry = CacheEntry(
+            url=str(request.url),
+            status_code=response.status_code,
+            headers=list(response.headers.items()),
+            content=response.content,
+            stored_at=time.time(),
+            max_age=self._max_age(response.headers),
+            vary=vary,
+        )
+        if new_entry.max_age is None and new_entry.etag is None:
+            # Nothing to revalidate with and no freshness lifetime: not worth keeping
+            return response
+        self.put(new_entry)
+        response.extensions[CACHE_ENTRY_EXTENSION] = new_entry
+        return response
+
+    @staticmethod
+    def _max_age(headers: httpx.Headers) -> float | None:
+        directives = _cache_control(headers)
+        if "no-cache" in directives:
+            return None
+        try:
+            return float(directives["max-age"]) if directives.get("max-age") is not None else None
+        except ValueError:
+            return None
+
+
+class CachingTransport(httpx.BaseTransport):
+    """Serves GET requests from a ResponseCache before falling through to ``transport``"""
+
+    def __init__(self, transport: httpx.BaseTransport, cache: ResponseCache) -> None:
+        self.transport = transport
+        self.cache = cache
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        entry, cached = self.cache.lookup(request)
+        if cached is not None:
+            return cached
+        response = self.transport.handle_request(request)
+        if request.method == "GET" and response.status_code == 200:
+            response.read()
+        return self.cache.complete(request, entry, response)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport):
+    """Serves GET requests from a ResponseCache before falling through to ``transport``"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: ResponseCache) -> None:
+        self.transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry, cached = self.cache.lookup(request)
+        if cached is not None:
+            return cached
+        response = await self.transport.handle_async_request(request)
+        if request.method == "GET" and response.status_code == 200:
+            await response.aread()
+        return self.cache.complete(request, entry, response)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def parse_cached(response: httpx.Response, key: str, parse: Callable[[], T], cache: ResponseCache | None) -> T:
+    """Parse ``response`` with ``parse``, reusing the result stored with its cache entry if there is one, or the
+    result shared by the other waiters on a coalesced request"""
+    entry: CacheEntry | None = response.extensions.get(CACHE_ENTRY_EXTENSION)
+    if entry is not None:
+        return entry.memo(key, parse, cache.stats if cache is not None else None)
+    shared = response.extensions.get(PARSE_MEMO_EXTENSION)
+    if shared is not None:
+        return shared.memo(key, parse)
+    return parse()
+
+
+__all__ = [
+    "AsyncCachingTransport",
+    "CacheEntry",
+    "CacheStats",
+    "CachingTransport",
+    "ResponseCache",
+    "parse_cached",
+]
@@ -1,9 +1,19 @@
 import ssl
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import httpx
 from attrs import define, evolve, field
 
+from .codec import JSONCodec, get_codec
+from .transport import DEFAULT_LIMITS, SharedTransports, make_limits
+
+if TYPE_CHECKING:
+    # Only needed when a cache or retry policy is configured, so they are imported in the _transport_args methods
+    from .balancer import Balancer
+    from .cache import ResponseCache
+    from .coalesce import RequestCoalescer
+    from .resilience import CircuitBreakers, RetryPolicy
+
 
 @define
 class Client:
@@ -25,22 +35,68 @@ class Client:
 
         ``follow_redirects``: Whether or not to follow redirects. Default value is False.
 
+        ``limits``: The ``httpx.Limits`` for the connection pool. Defaults to ``transport.DEFAULT_LIMITS``, which keeps
+        up to 100 connections alive for 30 seconds.
+
+        ``keepalive_expiry``: How long idle connections stay in the pool, in seconds. Overrides
+        ``limits.keepalive_expiry``.
+
+        ``http2``: Whether or not to negotiate HTTP/2, multiplexing requests over fewer connections. Requires the
+        ``h2`` package (``pip install httpx[http2]``). Default value is False.
+
+        ``shared_transports``: The ``transport.SharedTransports`` holding this client's connection pools. Clients
+        created with ``with_headers``, ``with_cookies``, ``with_timeout`` or ``attrs.evolve`` share it, and so share
+        their connections.
+
+        ``cache``: An optional ``cache.ResponseCache`` serving repeated GET requests from memory (or disk), revalidated
+        with ETags. Clients derived from this one share it.
+
+        ``retry``: An optional ``resilience.RetryPolicy``. Idempotent requests failing with a connection error or a
+        429/502/503/504 are retried with jittered exponential backoff (or after ``Retry-After``), within a retry budget.
+
+        ``circuit_breakers``: An optional ``resilience.CircuitBreakers``. After repeated failures from a base URL,
+        requests to it raise ``errors.CircuitOpenError`` immediately until a probe request succeeds.
+
+        ``balancer``: An optional ``balancer.Balancer`` spreading requests over several replicas (for example api1,
+        api2 and api3 inside the Docker network, skipping nginx), with passive ejection and ``/whoami`` health checks.
+        Only the scheme, host and port of ``base_url`` are replaced.
+
+        ``coalescer``: An optional ``coalesce.RequestCoalescer``. Identical GET requests in flight at the same time on the
+        async client are sent once, and every caller gets the same parsed result. Its ``stats`` count the duplicates
+        suppressed.
+
         ``httpx_args``: A dictionary of additional arguments to be passed to the ``httpx.Client`` and ``httpx.AsyncClient`` constructor.
+        Passing a ``transport`` here bypasses ``limits``, ``keepalive_expiry``, ``http2`` and ``shared_transports``.
 
 
     Attributes:
         raise_on_unexpected_status: Whether or not to raise an errors.UnexpectedStatus if the API returns a
             status code that was not documented in the source OpenAPI document. Can also be provided as a keyword
             argument to the constructor.
+        lean_responses: Whether or not ``Response`` objects from ``*_detailed`` functions should release their raw
+            ``content`` and ``headers`` once ``parsed`` has been read, keeping only the parsed value in memory.
+        codec: The ``codec.JSONCodec`` used to encode request bodies and decode responses, or the name of one
+            ("orjson", "msgspec" or "json"). The default, "auto", uses orjson or msgspec when installed.
     """
 
     raise_on_unexpected_status: bool = field(default=False, kw_only=True)
+    lean_responses: bool = field(default=False, kw_only=True)
+    codec: JSONCodec = field(default="auto", converter=get_codec, kw_only=True)
     _base_url: str = field(alias="base_url")
     _cookies: dict[str, str] = field(factory=dict, kw_only=True, alias="cookies")
     _headers: dict[str, str] = field(factory=dict, kw_only=True, alias="headers")
     _timeout: httpx.Timeout | None = field(default=None, kw_only=True, alias="timeout")
     _verify_ssl: str | bool | ssl.SSLContext = field(default=True, kw_only=True, alias="verify_ssl")
     _follow_redirects: bool = field(default=False, kw_only=True, alias="follow_redirects")
+    _limits: httpx.Limits = field(default=DEFAULT_LIMITS, kw_only=True, alias="limits")
+    _keepalive_expiry: float | None = field(default=None, kw_only=True, alias="keepalive_expiry")
+    _http2: bool = field(default=False, kw_only=True, alias="http2")
+    _shared_transports: SharedTransports = field(factory=SharedTransports, kw_only=True, alias="shared_transports")
+    _cache: "ResponseCache | None" = field(default=None, kw_only=True, alias="cache")
+    _retry: "RetryPolicy | None" = field(default=None, kw_only=True, alias="retry")
+    _circuit_breakers: "CircuitBreakers | None" = field(default=None, kw_only=True, alias="circuit_breakers")
+    _balancer: "Balancer | None" = field(default=None, kw_only=True, alias="balancer")
+    _coalescer: "RequestCoalescer | None" = field(default=None, kw_only=True, alias="coalescer")
     _httpx_args: dict[str, Any] = field(factory=dict, kw_only=True, alias="httpx_args")
     _client: httpx.Client | None = field(default=None, init=False)
     _async_client: httpx.AsyncClient | None = field(default=None, init=False)
@@ -69,6 +125,58 @@ class Client:
             self._async_client.timeout = timeout
         return evolve(self, timeout=timeout)
 
+    @property
+    def cache(self) -> "ResponseCache | None":
+        """The response cache used by this client, if any"""
+        return self._cache
+
+    @property
+    def balancer(self) -> "Balancer | None":
+        """The load balancer used by this client, if any"""
+        return self._balancer
+
+    def _transport_args(self) -> dict[str, Any]:
+        """httpx_args, with ``transport`` set to this client's layered transport"""
+        transport = self._httpx_args.get("transport") or self._shared_transports.sync_transport(
+            verify=self._verify_ssl, limits=make_limits(self._limits, self._keepalive_expiry), http2=self._http2
+        )
+        if self._balancer is not None:
+            from .balancer import BalancingTransport
+
+            transport = BalancingTransport(transport, self._balancer)
+        if self._retry is not None or self._circuit_breakers is not None:
+            from .resilience import RetryTransport
+
+            transport = RetryTransport(transport, self._retry, self._circuit_breakers)
+        if self._cache is not None:
+            from .cache import CachingTransport
+
+            transport = CachingTransport(transport, self._cache)
+        return {**self._httpx_args, "transport": transport}
+
+    def _async_transport_args(self) -> dict[str, Any]:
+        """httpx_args, with ``transport`` set to this client's layered async transport"""
+        transport = self._httpx_args.get("transport") or self._shared_transports.async_transport(
+            verify=self._verify_ssl, limits=make_limits(self._limits, self._keepalive_expiry), http2=self._http2
+        )
+        if self._balancer is not None:
+            from .balancer import AsyncBalancingTransport
+
+            transport = AsyncBalancingTransport(transport, self._balancer)
+        if self._retry is not None or self._circuit_breakers is not None:
+            from .resilience import AsyncRetryTransport
+
+            transport = AsyncRetryTransport(transport, self._retry, self._circuit_breakers)
+        if self._cache is not None:
+            from .cache import AsyncCachingTransport
+
+            transport = AsyncCachingTransport(transport, self._cache)
+        if self._coalescer is not None:
+            from .coalesce import AsyncCoalescingTransport
+
+            transport = AsyncCoalescingTransport(transport, self._coalescer)
+        return {**self._httpx_args, "transport": transport}
+
     def set_httpx_client(self, client: httpx.Client) -> "Client":
         """Manually set the underlying httpx.Client
 
@@ -87,7 +195,7 @@ class Client:
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **self._transport_args(),
             )
         return self._client
 
@@ -118,7 +226,7 @@ class Client:
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **self._async_transport_args(),
             )
         return self._async_client
 
@@ -152,25 +260,71 @@ class AuthenticatedClient:
 
         ``follow_redirects``: Whether or not to follow redirects. Default value is False.
 
+        ``limits``: The ``httpx.Limits`` for the connection pool. Defaults to ``transport.DEFAULT_LIMITS``, which keeps
+        up to 100 connections alive for 30 seconds.
+
+        ``keepalive_expiry``: How long idle connections stay in the pool, in seconds. Overrides
+        ``limits.keepalive_expiry``.
+
+        ``http2``: Whether or not to negotiate HTTP/2, multiplexing requests over fewer connections. Requires the
+        ``h2`` package (``pip install httpx[http2]``). Default value is False.
+
+        ``shared_transports``: The ``transport.SharedTransports`` holding this client's connection pools. Clients
+        created with ``with_headers``, ``with_cookies``, ``with_timeout`` or ``attrs.evolve`` share it, and so share
+        their connections.
+
+        ``cache``: An optional ``cache.ResponseCache`` serving repeated GET requests from memory (or disk), revalidated
+        with ETags. Clients derived from this one share it.
+
+        ``retry``: An optional ``resilience.RetryPolicy``. Idempotent requests failing with a connection error or a
+        429/502/503/504 are retried with jittered exponential backoff (or after ``Retry-After``), within a retry budget.
+
+        ``circuit_breakers``: An optional ``resilience.CircuitBreakers``. After repeated failures from a base URL,
+        requests to it raise ``errors.CircuitOpenError`` immediately until a probe request succeeds.
+
+        ``balancer``: An optional ``balancer.Balancer`` spreading requests over several replicas (for example api1,
+        api2 and api3 inside the Docker network, skipping nginx), with passive ejection and ``/whoami`` health checks.
+        Only the scheme, host and port of ``base_url`` are replaced.
+
+        ``coalescer``: An optional ``coalesce.RequestCoalescer``. Identical GET requests in flight at the same time on the
+        async client are sent once, and every caller gets the same parsed result. Its ``stats`` count the duplicates
+        suppressed.
+
         ``httpx_args``: A dictionary of additional arguments to be passed to the ``httpx.Client`` and ``httpx.AsyncClient`` constructor.
+        Passing a ``transport`` here bypasses ``limits``, ``keepalive_expiry``, ``http2`` and ``shared_transports``.
 
 
     Attributes:
         raise_on_unexpected_status: Whether or not to raise an errors.UnexpectedStatus if the API returns a
             status code that was not documented in the source OpenAPI document. Can also be provided as a keyword
             argument to the constructor.
+        lean_responses: Whether or not ``Response`` objects from ``*_detailed`` functions should release their raw
+            ``content`` and ``headers`` once ``parsed`` has been read, keeping only the parsed value in memory.
+        codec: The ``codec.JSONCodec`` used to encode request bodies and decode responses, or the name of one
+            ("orjson", "msgspec" or "json"). The default, "auto", uses orjson or msgspec when installed.
         token: The token to use for authentication
         prefix: The prefix to use for the Authorization header
         auth_header_name: The name of the Authorization header
     """
 
     raise_on_unexpected_status: bool = field(default=False, kw_only=True)
+    lean_responses: bool = field(default=False, kw_only=True)
+    codec: JSONCodec = field(default="auto", converter=get_codec, kw_only=True)
     _base_url: str = field(alias="base_url")
     _cookies: dict[str, str] = field(factory=dict, kw_only=True, alias="cookies")
     _headers: dict[str, str] = field(factory=dict, kw_only=True, alias="headers")
     _timeout: httpx.Timeout | None = field(default=None, kw_only=True, alias="timeout")
     _verify_ssl: str | bool | ssl.SSLContext = field(default=True, kw_only=True, alias="verify_ssl")
     _follow_redirects: bool = field(default=False, kw_only=True, alias="follow_redirects")
+    _limits: httpx.Limits = field(default=DEFAULT_LIMITS, kw_only=True, alias="limits")
+    _keepalive_expiry: float | None = field(default=None, kw_only=True, alias="keepalive_expiry")
+    _http2: bool = field(default=False, kw_only=True, alias="http2")
+    _shared_transports: SharedTransports = field(factory=SharedTransports, kw_only=True, alias="shared_transports")
+    _cache: "ResponseCache | None" = field(default=None, kw_only=True, alias="cache")
+    _retry: "RetryPolicy | None" = field(default=None, kw_only=True, alias="retry")
+    _circuit_breakers: "CircuitBreakers | None" = field(default=None, kw_only=True, alias="circuit_breakers")
+    _balancer: "Balancer | None" = field(default=None, kw_only=True, alias="balancer")
+    _coalescer: "RequestCoalescer | None" = field(default=None, kw_only=True, alias="coalescer")
     _httpx_args: dict[str, Any] = field(factory=dict, kw_only=True, alias="httpx_args")
     _client: httpx.Client | None = field(default=None, init=False)
     _async_client: httpx.AsyncClient | None = field(default=None, init=False)
@@ -203,6 +357,58 @@ class AuthenticatedClient:
             self._async_client.timeout = timeout
         return evolve(self, timeout=timeout)
 
+    @property
+    def cache(self) -> "ResponseCache | None":
+        """The response cache used by this client, if any"""
+        return self._cache
+
+    @property
+    def balancer(self) -> "Balancer | None":
+        """The load balancer used by this client, if any"""
+        return self._balancer
+
+    def _transport_args(self) -> dict[str, Any]:
+        """httpx_args, with ``transport`` set to this client's layered transport"""
+        transport = self._httpx_args.get("transport") or self._shared_transports.sync_transport(
+            verify=self._verify_ssl, limits=make_limits(self._limits, self._keepalive_expiry), http2=self._http2
+        )
+        if self._balancer is not None:
+            from .balancer import BalancingTransport
+
+            transport = BalancingTransport(transport, self._balancer)
+        if self._retry is not None or self._circuit_breakers is not None:
+            from .resilience import RetryTransport
+
+            transport = RetryTransport(transport, self._retry, self._circuit_breakers)
+        if self._cache is not None:
+            from .cache import CachingTransport
+
+            transport = CachingTransport(transport, self._cache)
+        return {**self._httpx_args, "transport": transport}
+
+    def _async_transport_args(self) -> dict[str, Any]:
+        """httpx_args, with ``transport`` set to this client's layered async transport"""
+        transport = self._httpx_args.get("transport") or self._shared_transports.async_transport(
+            verify=self._verify_ssl, limits=make_limits(self._limits, self._keepalive_expiry), http2=self._http2
+        )
+        if self._balancer is not None:
+            from .balancer import AsyncBalancingTransport
+
+            transport = AsyncBalancingTransport(transport, self._balancer)
+        if self._retry is not None or self._circuit_breakers is not None:
+            from .resilience import AsyncRetryTransport
+
+            transport = AsyncRetryTransport(transport, self._retry, self._circuit_breakers)
+        if self._cache is not None:
+            from .cache import AsyncCachingTransport
+
+            transport = AsyncCachingTransport(transport, self._cache)
+        if self._coalescer is not None:
+            from .coalesce import AsyncCoalescingTransport
+
+            transport = AsyncCoalescingTransport(transport, self._coalescer)
+        return {**self._httpx_args, "transport": transport}
+
     def set_httpx_client(self, client: httpx.Client) -> "AuthenticatedClient":
         """Manually set the underlying httpx.Client
 
@@ -222,7 +428,7 @@ class AuthenticatedClient:
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **self._transport_args(),
             )
         return self._client
 
@@ -254,7 +460,7 @@ class AuthenticatedClient:
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **self._async_transport_args(),
             )
         return self._async_client
 
@@ -0,0 +1,121 @@
+"""Single-flight coalescing of identical concurrent GET requests on an async client"""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import httpx
+from attrs import define
+
+from .cache import PARSE_MEMO_EXTENSION
+
+T = TypeVar("T")
+
+COALESCED_METHODS = frozenset({"GET", "HEAD"})
+
+
+@define
+class CoalescingStats:
+    """Counters describing how much work a RequestCoalescer saved
+
+    Attributes:
+        requests: GET and HEAD requests seen
+        sent: Requests actually sent, one per group of identical concurrent requests
+        suppressed: Requests that joined one already in flight instead of being sent
+        parse_hits: Responses whose parsed model was shared instead of parsed again
+    """
+
+    requests: int = 0
+    sent: int = 0
+    suppressed: int = 0
+    parse_hits: int = 0
+
+
+class SharedParse:
+    """The models parsed from one coalesced response, shared by everyone who waited on it"""
+
+    def __init__(self, stats: CoalescingStats) -> None:
+        self._stats = stats
+        self._parsed: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def memo(self, key: str, parse: Callable[[], T], stats: Any = None) -> T:
+        """Return the value parsed under ``key``, calling ``parse`` only the first time"""
+        with self._lock:
+            if key in self._parsed:
+                self._stats.parse_hits += 1
+                return self._parsed[key]
+        value = parse()
+        with self._lock:
+            return self._parsed.setdefault(key, value)
+
+
+class RequestCoalescer:
+    """Opt-in single-flight for a Client: concurrent identical GETs share one request and one parsed result
+
+    Requests are identical when their method, URL and headers all match, so requests made on behalf of different
+    users (e.g. different ``X-User-ID`` headers) are never merged. Only requests that are in flight at the same
+    time are merged; nothing is kept once the response has been delivered (use ``cache.ResponseCache`` for that).
+    The shared models should be treated as read-only.
+
+    Coalescing applies to ``httpx.AsyncClient`` requests, where many tasks can wait on the same response cheaply.
+    """
+
+    def __init__(self) -> None:
+        self.stats = CoalescingStats()
+
+
+@define
+class _Result:
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    content: bytes
+    extensions: dict[str, Any]
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(
+            self.status_code, headers=self.headers, content=self.content, extensions=dict(self.extensions)
+        )
+
+
+class AsyncCoalescingTransport(httpx.AsyncBaseTransport):
+    """Lets concurrent identical GET and HEAD requests share one call to ``transport``"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, coalescer: RequestCoalescer) -> None:
+        self.transport = transport
+        self.coalescer = coalescer
+        self._in_flight: dict[tuple, asyncio.Future[_Result]] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in COALESCED_METHODS:
+            return await self.transport.handle_async_request(request)
+        stats = self.coalescer.stats
+        stats.requests += 1
+        key = (request.method, str(request.url), tuple(request.headers.raw))
+        future = self._in_flight.get(key)
+        if future is None:
+            stats.sent += 1
+            # The request runs in its own task so that one waiter being cancelled doesn't fail the others
+            future = asyncio.ensure_future(self._send(request))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            stats.suppressed += 1
+        result = await asyncio.shield(future)
+        return result.to_response()
+
+    async def _send(self, request: httpx.Request) -> _Result:
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        extensions = {**response.extensions, PARSE_MEMO_EXTENSION: SharedParse(self.coalescer.stats)}
+        return _Result(response.status_code, response.headers.raw, content, extensions)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+__all__ = ["AsyncCoalescingTransport", "CoalescingStats", "RequestCoalescer", "SharedParse"]
@@ -0,0 +1,79 @@
+"""JSON encoders and decoders the client can use for request and response bodies"""
+
+import json
+from typing import Any, Protocol
+
+
+class JSONCodec(Protocol):
+    """Turns request bodies into JSON bytes and response bodies back into Python objects"""
+
+    name: str
+
+    def dumps(self, obj: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any: ...
+
+
+class StdlibCodec:
+    """The standard library ``json`` module, encoding the same way httpx's ``json=`` argument does"""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """`orjson <https://github.com/ijl/orjson>`_: usually several times faster than ``json`` at decoding"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class MsgspecCodec:
+    """`msgspec <https://jcristharif.com/msgspec/>`_'s JSON encoder and decoder"""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self.dumps = msgspec.json.Encoder().encode
+        self.loads = msgspec.json.Decoder().decode
+
+
+_CODECS: dict[str, type[Any]] = {"json": StdlibCodec, "orjson": OrjsonCodec, "msgspec": MsgspecCodec}
+
+
+def get_codec(codec: "str | JSONCodec" = "auto") -> JSONCodec:
+    """Resolve a codec name ("auto", "orjson", "msgspec" or "json") to a codec; codec objects pass through
+
+    "auto" picks the fastest installed library: orjson, then msgspec, then the standard library.
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the named library is not installed
+    """
+    if not isinstance(codec, str):
+        return codec
+    if codec == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _CODECS[name]()
+            except ImportError:
+                continue
+        return StdlibCodec()
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown JSON codec {codec!r}, expected one of: auto, {', '.join(_CODECS)}")
+    return _CODECS[codec]()
+
+
+__all__ = ["JSONCodec", "MsgspecCodec", "OrjsonCodec", "StdlibCodec", "get_codec"]
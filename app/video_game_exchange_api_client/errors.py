@@ -13,4 +13,14 @@ class UnexpectedStatus(Exception):
         )
 
 
-__all__ = ["UnexpectedStatus"]
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker for its base URL is open"""
+
+    def __init__(self, origin: str, retry_after: float):
+        self.origin = origin
+        self.retry_after = retry_after
+
+        super().__init__(f"Circuit breaker for {origin} is open; not sending requests for another {retry_after:.1f}s")
+
+
+__all__ = ["CircuitOpenError", "UnexpectedStatus"]
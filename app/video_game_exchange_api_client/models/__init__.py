@@ -1,21 +1,70 @@
 """Contains all the data models used in inputs/outputs"""
 
-from .game import Game
-from .game_create import GameCreate
-from .game_create_condition import GameCreateCondition
-from .game_partial_update import GamePartialUpdate
-from .game_update import GameUpdate
-from .user import User
-from .user_create import UserCreate
-from .user_partial_update import UserPartialUpdate
-from .user_update import UserUpdate
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .game import Game
+    from .game_browse import GameBrowse
+    from .game_browse_platform_counts import GameBrowsePlatformCounts
+    from .game_create import GameCreate
+    from .game_create_condition import GameCreateCondition
+    from .game_partial_update import GamePartialUpdate
+    from .game_update import GameUpdate
+    from .trade_match import TradeMatch
+    from .trade_offer import TradeOffer
+    from .trade_offer_create import TradeOfferCreate
+    from .trade_offer_status import TradeOfferStatus
+    from .user import User
+    from .user_create import UserCreate
+    from .user_partial_update import UserPartialUpdate
+    from .user_update import UserUpdate
+
+# Each model is imported on first access, so an endpoint module only loads the models it uses
+_LAZY_ATTRIBUTES = {
+    "Game": ".game",
+    "GameBrowse": ".game_browse",
+    "GameBrowsePlatformCounts": ".game_browse_platform_counts",
+    "GameCreate": ".game_create",
+    "GameCreateCondition": ".game_create_condition",
+    "GamePartialUpdate": ".game_partial_update",
+    "GameUpdate": ".game_update",
+    "TradeMatch": ".trade_match",
+    "TradeOffer": ".trade_offer",
+    "TradeOfferCreate": ".trade_offer_create",
+    "TradeOfferStatus": ".trade_offer_status",
+    "User": ".user",
+    "UserCreate": ".user_create",
+    "UserPartialUpdate": ".user_partial_update",
+    "UserUpdate": ".user_update",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
+
 
 __all__ = (
     "Game",
+    "GameBrowse",
+    "GameBrowsePlatformCounts",
     "GameCreate",
     "GameCreateCondition",
     "GamePartialUpdate",
     "GameUpdate",
+    "TradeMatch",
+    "TradeOffer",
+    "TradeOfferCreate",
+    "TradeOfferStatus",
     "User",
     "UserCreate",
     "UserPartialUpdate",
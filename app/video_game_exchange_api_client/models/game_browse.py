@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from attrs import define as _attrs_define
+from attrs import field as _attrs_field
+
+from ..types import UNSET, Unset
+
+if TYPE_CHECKING:
+    from ..models.game import Game
+    from ..models.game_browse_platform_counts import GameBrowsePlatformCounts
+
+
+T = TypeVar("T", bound="GameBrowse")
+
+_KNOWN_KEYS = frozenset({"items", "platform_counts", "total"})
+
+
+@_attrs_define
+class GameBrowse:
+    """
+    Attributes:
+        items (list[Game] | Unset):
+        platform_counts (GameBrowsePlatformCounts | Unset): Games per platform matching every filter except platform.
+        total (int | Unset): Games matching every filter.
+    """
+
+    items: list[Game] | Unset = UNSET
+    platform_counts: GameBrowsePlatformCounts | Unset = UNSET
+    total: int | Unset = UNSET
+    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        items: list[dict[str, Any]] | Unset = UNSET
+        if not isinstance(self.items, Unset):
+            items = [items_item.to_dict() for items_item in self.items]
+
+        platform_counts: dict[str, Any] | Unset = UNSET
+        if not isinstance(self.platform_counts, Unset):
+            platform_counts = self.platform_counts.to_dict()
+
+        total = self.total
+
+        field_dict: dict[str, Any] = {}
+        field_dict.update(self.additional_properties)
+        field_dict.update({})
+        if items is not UNSET:
+            field_dict["items"] = items
+        if platform_counts is not UNSET:
+            field_dict["platform_counts"] = platform_counts
+        if total is not UNSET:
+            field_dict["total"] = total
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
+        from ..models.game import Game
+        from ..models.game_browse_platform_counts import GameBrowsePlatformCounts
+
+        _items = src_dict.get("items", UNSET)
+        items: list[Game] | Unset
+        if isinstance(_items, Unset):
+            items = UNSET
+        else:
+            items = Game.from_list(_items)
+
+        _platform_counts = src_dict.get("platform_counts", UNSET)
+        platform_counts: GameBrowsePlatformCounts | Unset
+        if isinstance(_platform_counts, Unset):
+            platform_counts = UNSET
+        else:
+            platform_counts = GameBrowsePlatformCounts.from_dict(_platform_counts)
+
+        total = src_dict.get("total", UNSET)
+
+        game_browse = cls(
+            items=items,
+            platform_counts=platform_counts,
+            total=total,
+        )
+
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            game_browse.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
+        return game_browse
+
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
+    @property
+    def additional_keys(self) -> list[str]:
+        return list(self.additional_properties.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.additional_properties
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from typing import Any, TypeVar
 
 from attrs import define as _attrs_define
@@ -11,6 +11,8 @@ from ..types import UNSET, Unset
 
 T = TypeVar("T", bound="GameCreate")
 
+_KNOWN_KEYS = frozenset({"name", "publisher", "year", "system", "condition", "previousOwners"})
+
 
 @_attrs_define
 class GameCreate:
@@ -63,18 +65,17 @@ class GameCreate:
 
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        d = dict(src_dict)
-        name = d.pop("name")
+        name = src_dict["name"]
 
-        publisher = d.pop("publisher")
+        publisher = src_dict["publisher"]
 
-        year = d.pop("year")
+        year = src_dict["year"]
 
-        system = d.pop("system")
+        system = src_dict["system"]
 
-        condition = GameCreateCondition(d.pop("condition"))
+        condition = GameCreateCondition(src_dict["condition"])
 
-        previous_owners = d.pop("previousOwners", UNSET)
+        previous_owners = src_dict.get("previousOwners", UNSET)
 
         game_create = cls(
             name=name,
@@ -85,9 +86,15 @@ class GameCreate:
             previous_owners=previous_owners,
         )
 
-        game_create.additional_properties = d
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            game_create.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
         return game_create
 
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
     @property
     def additional_keys(self) -> list[str]:
         return list(self.additional_properties.keys())
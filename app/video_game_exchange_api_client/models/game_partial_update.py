@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from typing import Any, TypeVar
 
 from attrs import define as _attrs_define
@@ -10,6 +10,8 @@ from ..types import UNSET, Unset
 
 T = TypeVar("T", bound="GamePartialUpdate")
 
+_KNOWN_KEYS = frozenset({"name", "publisher", "year", "system", "condition", "previousOwners"})
+
 
 @_attrs_define
 class GamePartialUpdate:
@@ -64,18 +66,17 @@ class GamePartialUpdate:
 
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        d = dict(src_dict)
-        name = d.pop("name", UNSET)
+        name = src_dict.get("name", UNSET)
 
-        publisher = d.pop("publisher", UNSET)
+        publisher = src_dict.get("publisher", UNSET)
 
-        year = d.pop("year", UNSET)
+        year = src_dict.get("year", UNSET)
 
-        system = d.pop("system", UNSET)
+        system = src_dict.get("system", UNSET)
 
-        condition = d.pop("condition", UNSET)
+        condition = src_dict.get("condition", UNSET)
 
-        previous_owners = d.pop("previousOwners", UNSET)
+        previous_owners = src_dict.get("previousOwners", UNSET)
 
         game_partial_update = cls(
             name=name,
@@ -86,9 +87,15 @@ class GamePartialUpdate:
             previous_owners=previous_owners,
         )
 
-        game_partial_update.additional_properties = d
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            game_partial_update.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
         return game_partial_update
 
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
     @property
     def additional_keys(self) -> list[str]:
         return list(self.additional_properties.keys())
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from typing import Any, TypeVar
 
 from attrs import define as _attrs_define
@@ -10,6 +10,8 @@ from ..types import UNSET, Unset
 
 T = TypeVar("T", bound="GameUpdate")
 
+_KNOWN_KEYS = frozenset({"name", "publisher", "year", "system", "condition", "previousOwners"})
+
 
 @_attrs_define
 class GameUpdate:
@@ -62,18 +64,17 @@ class GameUpdate:
 
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        d = dict(src_dict)
-        name = d.pop("name")
+        name = src_dict["name"]
 
-        publisher = d.pop("publisher")
+        publisher = src_dict["publisher"]
 
-        year = d.pop("year")
+        year = src_dict["year"]
 
-        system = d.pop("system")
+        system = src_dict["system"]
 
-        condition = d.pop("condition")
+        condition = src_dict["condition"]
 
-        previous_owners = d.pop("previousOwners", UNSET)
+        previous_owners = src_dict.get("previousOwners", UNSET)
 
         game_update = cls(
             name=name,
@@ -84,9 +85,15 @@ class GameUpdate:
             previous_owners=previous_owners,
         )
 
-        game_update.additional_properties = d
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            game_update.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
         return game_update
 
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
     @property
     def additional_keys(self) -> list[str]:
         return list(self.additional_properties.keys())
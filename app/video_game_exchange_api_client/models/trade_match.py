@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any, TypeVar, cast
+
+from attrs import define as _attrs_define
+from attrs import field as _attrs_field
+
+from ..types import UNSET, Unset
+
+T = TypeVar("T", bound="TradeMatch")
+
+_KNOWN_KEYS = frozenset({"users", "offer_ids"})
+
+
+@_attrs_define
+class TradeMatch:
+    """
+    Attributes:
+        users (list[int] | Unset): The users in the trade, starting with the caller.
+        offer_ids (list[int] | Unset): The pending offer through which each user receives a game from the next one.
+    """
+
+    users: list[int] | Unset = UNSET
+    offer_ids: list[int] | Unset = UNSET
+    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        users: list[int] | Unset = UNSET
+        if not isinstance(self.users, Unset):
+            users = self.users
+
+        offer_ids: list[int] | Unset = UNSET
+        if not isinstance(self.offer_ids, Unset):
+            offer_ids = self.offer_ids
+
+        field_dict: dict[str, Any] = {}
+        field_dict.update(self.additional_properties)
+        field_dict.update({})
+        if users is not UNSET:
+            field_dict["users"] = users
+        if offer_ids is not UNSET:
+            field_dict["offer_ids"] = offer_ids
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
+        users = cast(list[int], src_dict.get("users", UNSET))
+
+        offer_ids = cast(list[int], src_dict.get("offer_ids", UNSET))
+
+        trade_match = cls(
+            users=users,
+            offer_ids=offer_ids,
+        )
+
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            trade_match.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
+        return trade_match
+
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
+    @property
+    def additional_keys(self) -> list[str]:
+        return list(self.additional_properties.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.additional_properties
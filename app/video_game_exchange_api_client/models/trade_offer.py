@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any, TypeVar
+
+from attrs import define as _attrs_define
+from attrs import field as _attrs_field
+
+from ..models.trade_offer_status import TradeOfferStatus
+from ..types import UNSET, Unset
+
+T = TypeVar("T", bound="TradeOffer")
+
+_KNOWN_KEYS = frozenset({"id", "offered_game_id", "requested_game_id", "requester_id", "status"})
+
+
+@_attrs_define
+class TradeOffer:
+    """
+    Attributes:
+        id (int | Unset):
+        offered_game_id (int | Unset):
+        requested_game_id (int | Unset):
+        requester_id (int | Unset):
+        status (TradeOfferStatus | Unset):
+    """
+
+    id: int | Unset = UNSET
+    offered_game_id: int | Unset = UNSET
+    requested_game_id: int | Unset = UNSET
+    requester_id: int | Unset = UNSET
+    status: TradeOfferStatus | Unset = UNSET
+    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        id = self.id
+
+        offered_game_id = self.offered_game_id
+
+        requested_game_id = self.requested_game_id
+
+        requester_id = self.requester_id
+
+        status: str | Unset = UNSET
+        if not isinstance(self.status, Unset):
+            status = self.status.value
+
+        field_dict: dict[str, Any] = {}
+        field_dict.update(self.additional_properties)
+        field_dict.update({})
+        if id is not UNSET:
+            field_dict["id"] = id
+        if offered_game_id is not UNSET:
+            field_dict["offered_game_id"] = offered_game_id
+        if requested_game_id is not UNSET:
+            field_dict["requested_game_id"] = requested_game_id
+        if requester_id is not UNSET:
+            field_dict["requester_id"] = requester_id
+        if status is not UNSET:
+            field_dict["status"] = status
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
+        id = src_dict.get("id", UNSET)
+
+        offered_game_id = src_dict.get("offered_game_id", UNSET)
+
+        requested_game_id = src_dict.get("requested_game_id", UNSET)
+
+        requester_id = src_dict.get("requester_id", UNSET)
+
+        _status = src_dict.get("status", UNSET)
+        status: TradeOfferStatus | Unset
+        if isinstance(_status, Unset):
+            status = UNSET
+        else:
+            status = TradeOfferStatus(_status)
+
+        trade_offer = cls(
+            id=id,
+            offered_game_id=offered_game_id,
+            requested_game_id=requested_game_id,
+            requester_id=requester_id,
+            status=status,
+        )
+
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            trade_offer.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
+        return trade_offer
+
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
+    @property
+    def additional_keys(self) -> list[str]:
+        return list(self.additional_properties.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.additional_properties
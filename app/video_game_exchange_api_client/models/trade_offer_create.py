@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any, TypeVar
+
+from attrs import define as _attrs_define
+from attrs import field as _attrs_field
+
+T = TypeVar("T", bound="TradeOfferCreate")
+
+_KNOWN_KEYS = frozenset({"offered_game_id", "requested_game_id"})
+
+
+@_attrs_define
+class TradeOfferCreate:
+    """
+    Attributes:
+        offered_game_id (int): The requester's game being offered
+        requested_game_id (int): The game wanted in return
+    """
+
+    offered_game_id: int
+    requested_game_id: int
+    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        offered_game_id = self.offered_game_id
+
+        requested_game_id = self.requested_game_id
+
+        field_dict: dict[str, Any] = {}
+        field_dict.update(self.additional_properties)
+        field_dict.update(
+            {
+                "offered_game_id": offered_game_id,
+                "requested_game_id": requested_game_id,
+            }
+        )
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
+        offered_game_id = src_dict["offered_game_id"]
+
+        requested_game_id = src_dict["requested_game_id"]
+
+        trade_offer_create = cls(
+            offered_game_id=offered_game_id,
+            requested_game_id=requested_game_id,
+        )
+
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            trade_offer_create.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
+        return trade_offer_create
+
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
+    @property
+    def additional_keys(self) -> list[str]:
+        return list(self.additional_properties.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.additional_properties
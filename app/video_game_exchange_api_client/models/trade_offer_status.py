@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class TradeOfferStatus(str, Enum):
+    ACCEPTED = "accepted"
+    PENDING = "pending"
+    REJECTED = "rejected"
+
+    def __str__(self) -> str:
+        return str(self.value)
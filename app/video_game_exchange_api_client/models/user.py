@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from typing import Any, TypeVar
 
 from attrs import define as _attrs_define
@@ -10,6 +10,8 @@ from ..types import UNSET, Unset
 
 T = TypeVar("T", bound="User")
 
+_KNOWN_KEYS = frozenset({"id", "username", "email", "address"})
+
 
 @_attrs_define
 class User:
@@ -52,14 +54,13 @@ class User:
 
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        d = dict(src_dict)
-        id = d.pop("id", UNSET)
+        id = src_dict.get("id", UNSET)
 
-        username = d.pop("username", UNSET)
+        username = src_dict.get("username", UNSET)
 
-        email = d.pop("email", UNSET)
+        email = src_dict.get("email", UNSET)
 
-        address = d.pop("address", UNSET)
+        address = src_dict.get("address", UNSET)
 
         user = cls(
             id=id,
@@ -68,9 +69,15 @@ class User:
             address=address,
         )
 
-        user.additional_properties = d
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            user.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
         return user
 
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
     @property
     def additional_keys(self) -> list[str]:
         return list(self.additional_properties.keys())
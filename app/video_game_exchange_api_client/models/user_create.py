@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from typing import Any, TypeVar
 
 from attrs import define as _attrs_define
@@ -8,6 +8,8 @@ from attrs import field as _attrs_field
 
 T = TypeVar("T", bound="UserCreate")
 
+_KNOWN_KEYS = frozenset({"username", "email", "password", "address"})
+
 
 @_attrs_define
 class UserCreate:
@@ -49,14 +51,13 @@ class UserCreate:
 
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        d = dict(src_dict)
-        username = d.pop("username")
+        username = src_dict["username"]
 
-        email = d.pop("email")
+        email = src_dict["email"]
 
-        password = d.pop("password")
+        password = src_dict["password"]
 
-        address = d.pop("address")
+        address = src_dict["address"]
 
         user_create = cls(
             username=username,
@@ -65,9 +66,15 @@ class UserCreate:
             address=address,
         )
 
-        user_create.additional_properties = d
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            user_create.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
         return user_create
 
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
     @property
     def additional_keys(self) -> list[str]:
         return list(self.additional_properties.keys())
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from typing import Any, TypeVar
 
 from attrs import define as _attrs_define
@@ -8,6 +8,8 @@ from attrs import field as _attrs_field
 
 T = TypeVar("T", bound="UserUpdate")
 
+_KNOWN_KEYS = frozenset({"username", "email", "address"})
+
 
 @_attrs_define
 class UserUpdate:
@@ -44,12 +46,11 @@ class UserUpdate:
 
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        d = dict(src_dict)
-        username = d.pop("username")
+        username = src_dict["username"]
 
-        email = d.pop("email")
+        email = src_dict["email"]
 
-        address = d.pop("address")
+        address = src_dict["address"]
 
         user_update = cls(
             username=username,
@@ -57,9 +58,15 @@ class UserUpdate:
             address=address,
         )
 
-        user_update.additional_properties = d
+        if not _KNOWN_KEYS.issuperset(src_dict):
+            user_update.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN_KEYS}
         return user_update
 
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in src_list]
+
     @property
     def additional_keys(self) -> list[str]:
         return list(self.additional_properties.keys())
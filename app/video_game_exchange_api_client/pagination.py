@@ -0,0 +1,279 @@
+"""Iterate over every item of a paginated list endpoint, one page at a time
+
+List endpoints return at most ``limit`` items ordered by id and take ``after_id`` to continue after the last id
+seen. These helpers follow that cursor until a short page marks the end. With ``prefetch`` the next page is
+requested while the caller works through the current one, so a large export streams at network speed while no
+more than two pages are held in memory.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import ModuleType
+from typing import Any
+
+from . import errors
+from .api.default import get_games, get_games_search, get_offers, get_users
+from .client import AuthenticatedClient, Client
+from .models import Game, TradeOffer, TradeOfferStatus, User
+from .types import UNSET, Unset
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def _page(response: Any) -> list[Any]:
+    if response.status_code != 200:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    return response.parsed
+
+
+def _next_cursor(page: list[Any], page_size: int) -> int | None:
+    """The ``after_id`` for the page after ``page``, or None if ``page`` was the last one"""
+    if len(page) < page_size:
+        return None
+    return page[-1].id
+
+
+def iter_pages(
+    endpoint: ModuleType,
+    *,
+    client: AuthenticatedClient | Client,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    **params: Any,
+) -> Iterator[list[Any]]:
+    """Yield successive pages from a list endpoint module such as ``get_games``
+
+    Args:
+        endpoint: The endpoint module; its ``sync_detailed`` must accept ``after_id`` and ``limit``
+        client: The client to send the requests with
+        page_size: Items per request (the server allows up to 1000)
+        prefetch: Fetch the next page on a background thread while the current one is being consumed
+        **params: Extra arguments for the endpoint, such as ``status`` or ``x_user_id``
+
+    Raises:
+        errors.UnexpectedStatus: If a page comes back with a status other than 200
+    """
+
+    def fetch(after_id: int | Unset) -> list[Any]:
+        return _page(endpoint.sync_detailed(client=client, after_id=after_id, limit=page_size, **params))
+
+    if not prefetch:
+        after_id: int | Unset = UNSET
+        while True:
+            page = fetch(after_id)
+            yield page
+            cursor = _next_cursor(page, page_size)
+            if cursor is None:
+                return
+            after_id = cursor
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="video-game-exchange-prefetch")
+    try:
+        pending: Future[list[Any]] | None = executor.submit(fetch, UNSET)
+        while pending is not None:
+            page = pending.result()
+            cursor = _next_cursor(page, page_size)
+            pending = executor.submit(fetch, cursor) if cursor is not None else None
+            yield page
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_pages(
+    endpoint: ModuleType,
+    *,
+    client: AuthenticatedClient | Client,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    **params: Any,
+) -> AsyncIterator[list[Any]]:
+    """Yield successive pages from a list endpoint module such as ``get_games``
+
+    Args:
+        endpoint: The endpoint module; its ``asyncio_detailed`` must accept ``after_id`` and ``limit``
+        client: The client to send the requests with
+        page_size: Items per request (the server allows up to 1000)
+        prefetch: Fetch the next page in a task while the current one is being consumed
+        **params: Extra arguments for the endpoint, such as ``status`` or ``x_user_id``
+
+    Raises:
+        errors.UnexpectedStatus: If a page comes back with a status other than 200
+    """
+
+    async def fetch(after_id: int | Unset) -> list[Any]:
+        return _page(await endpoint.asyncio_detailed(client=client, after_id=after_id, limit=page_size, **params))
+
+    if not prefetch:
+        after_id: int | Unset = UNSET
+        while True:
+            page = await fetch(after_id)
+            yield page
+            cursor = _next_cursor(page, page_size)
+            if cursor is None:
+                return
+            after_id = cursor
+
+    pending: asyncio.Task[list[Any]] | None = asyncio.ensure_future(fetch(UNSET))
+    try:
+        while pending is not None:
+            page = await pending
+            cursor = _next_cursor(page, page_size)
+            pending = asyncio.ensure_future(fetch(cursor)) if cursor is not None else None
+            yield page
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def _items(pages: Iterator[list[Any]]) -> Iterator[Any]:
+    for page in pages:
+        yield from page
+
+
+async def _aitems(pages: AsyncIterator[list[Any]]) -> AsyncIterator[Any]:
+    try:
+        async for page in pages:
+            for item in page:
+                yield item
+    finally:
+        await pages.aclose()  # type: ignore[attr-defined]
+
+
+def iter_users(
+    *, client: AuthenticatedClient | Client, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True
+) -> Iterator[User]:
+    """Every user, in id order"""
+    return _items(iter_pages(get_users, client=client, page_size=page_size, prefetch=prefetch))
+
+
+def aiter_users(
+    *, client: AuthenticatedClient | Client, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True
+) -> AsyncIterator[User]:
+    """Every user, in id order"""
+    return _aitems(aiter_pages(get_users, client=client, page_size=page_size, prefetch=prefetch))
+
+
+def iter_games(
+    *,
+    client: AuthenticatedClient | Client,
+    platform: list[str] | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> Iterator[Game]:
+    """Every game, optionally only those on ``platform`` or owned by ``owner_id``, in id order"""
+    return _items(
+        iter_pages(
+            get_games, client=client, page_size=page_size, prefetch=prefetch, platform=platform, owner_id=owner_id
+        )
+    )
+
+
+def aiter_games(
+    *,
+    client: AuthenticatedClient | Client,
+    platform: list[str] | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> AsyncIterator[Game]:
+    """Every game, optionally only those on ``platform`` or owned by ``owner_id``, in id order"""
+    return _aitems(
+        aiter_pages(
+            get_games, client=client, page_size=page_size, prefetch=prefetch, platform=platform, owner_id=owner_id
+        )
+    )
+
+
+def iter_game_search(
+    *,
+    client: AuthenticatedClient | Client,
+    title: str | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    platform: list[str] | Unset = UNSET,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> Iterator[Game]:
+    """Every game matching ``title``, ``owner_id`` and ``platform``, in id order"""
+    return _items(
+        iter_pages(
+            get_games_search,
+            client=client,
+            page_size=page_size,
+            prefetch=prefetch,
+            title=title,
+            owner_id=owner_id,
+            platform=platform,
+        )
+    )
+
+
+def aiter_game_search(
+    *,
+    client: AuthenticatedClient | Client,
+    title: str | Unset = UNSET,
+    owner_id: int | Unset = UNSET,
+    platform: list[str] | Unset = UNSET,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> AsyncIterator[Game]:
+    """Every game matching ``title``, ``owner_id`` and ``platform``, in id order"""
+    return _aitems(
+        aiter_pages(
+            get_games_search,
+            client=client,
+            page_size=page_size,
+            prefetch=prefetch,
+            title=title,
+            owner_id=owner_id,
+            platform=platform,
+        )
+    )
+
+
+def iter_offers(
+    *,
+    client: AuthenticatedClient | Client,
+    x_user_id: int,
+    status: TradeOfferStatus | Unset = UNSET,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> Iterator[TradeOffer]:
+    """Every offer received by ``x_user_id``, optionally only those with ``status``, in id order"""
+    return _items(
+        iter_pages(
+            get_offers, client=client, page_size=page_size, prefetch=prefetch, x_user_id=x_user_id, status=status
+        )
+    )
+
+
+def aiter_offers(
+    *,
+    client: AuthenticatedClient | Client,
+    x_user_id: int,
+    status: TradeOfferStatus | Unset = UNSET,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> AsyncIterator[TradeOffer]:
+    """Every offer received by ``x_user_id``, optionally only those with ``status``, in id order"""
+    return _aitems(
+        aiter_pages(
+            get_offers, client=client, page_size=page_size, prefetch=prefetch, x_user_id=x_user_id, status=status
+        )
+    )
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "aiter_game_search",
+    "aiter_games",
+    "aiter_offers",
+    "aiter_pages",
+    "aiter_users",
+    "iter_game_search",
+    "iter_games",
+    "iter_offers",
+    "iter_pages",
+    "iter_users",
+]
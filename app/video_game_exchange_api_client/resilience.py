@@ -0,0 +1,307 @@
+"""Retries with backoff and per-origin circuit breaking, as httpx transports"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from .errors import CircuitOpenError
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+# Statuses that count against a server's circuit breaker (429 means "slow down", not "broken")
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def is_idempotent(request: httpx.Request) -> bool:
+    """Whether ``request`` is safe to send twice: an idempotent method, or a POST with an ``Idempotency-Key``"""
+    return request.method in IDEMPOTENT_METHODS or "Idempotency-Key" in request.headers
+
+
+class RetryBudget:
+    """Caps retries to a fraction of recent traffic so a struggling cluster isn't hit with a retry storm
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one. ``min_tokens`` lets a quiet client
+    still retry occasionally; the balance never exceeds ``max_tokens``.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0, max_tokens: float = 100.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a request
+
+    Args:
+        max_attempts: Total attempts per request, including the first
+        backoff_base: The first backoff ceiling in seconds; it doubles with every attempt
+        backoff_max: The largest backoff ceiling in seconds. The actual delay is drawn uniformly below the
+            ceiling ("full jitter"), so clients that failed together don't retry together
+        retry_statuses: Response statuses worth retrying
+        respect_retry_after: Wait as long as a ``Retry-After`` header asks, up to ``max_retry_after`` seconds.
+            A longer ``Retry-After`` returns the response instead of waiting
+        budget: The retry budget shared by every request using this policy
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 5.0,
+        retry_statuses: frozenset[int] = RETRYABLE_STATUSES,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 30.0,
+        budget: RetryBudget | None = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def backoff(self, attempt: int) -> float:
+        """A jittered delay before retry number ``attempt`` (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def retry_after(self, response: httpx.Response) -> float | None:
+        value = response.headers.get("Retry-After")
+        if value is None or not self.respect_retry_after:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def should_retry_error(self, request: httpx.Request, error: httpx.TransportError) -> bool:
+        # A failed connect means the server never saw the request, so even a POST is safe to resend
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return True
+        return is_idempotent(request)
+
+    def delay_for_response(self, request: httpx.Request, response: httpx.Response, attempt: int) -> float | None:
+        """How long to wait before retrying after ``response``, or None to return it"""
+        if not is_idempotent(request) or response.status_code not in self.retry_statuses:
+            return None
+        retry_after = self.retry_after(response)
+        if retry_after is None:
+            return self.backoff(attempt)
+        return retry_after if retry_after <= self.max_retry_after else None
+
+
+class CircuitBreaker:
+    """Tracks one origin: opens after ``failure_threshold`` consecutive failures, lets one probe through
+    after ``reset_timeout`` seconds (half-open), and closes again when that probe succeeds"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, origin: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.origin = origin
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(self.origin, max(0.0, remaining))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Forget a request that ended without an outcome (cancelled, or failed outside the transport), so a
+        half-open breaker lets the next one probe instead of rejecting everything"""
+        with self._lock:
+            self._probing = False
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per origin (scheme, host and port), created on first use
+
+    Clients derived from one another share this registry, so they agree on which replicas are down.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: httpx.URL) -> CircuitBreaker:
+        origin = f"{url.scheme}://{url.netloc.decode('ascii')}"
+        with self._lock:
+            breaker = self._breakers.get(origin)
+            if breaker is None:
+                breaker = self._breakers[origin] = CircuitBreaker(origin, self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def states(self) -> dict[str, str]:
+        with self._lock:
+            return {origin: breaker.state for origin, breaker in self._breakers.items()}
+
+
+def _record(breaker: CircuitBreaker | None, response: httpx.Response | None) -> None:
+    if breaker is None:
+        return
+    if response is None or response.status_code in FAILURE_STATUSES:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Retries failed requests according to ``policy`` and fails fast while a circuit is open"""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        policy: RetryPolicy | None = None,
+        breakers: CircuitBreakers | None = None,
+    ) -> None:
+        self.transport = transport
+        self.policy = policy
+        self.breakers = breakers
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = self.breakers.for_url(request.url) if self.breakers is not None else None
+        if self.policy is not None:
+            self.policy.budget.deposit()
+        attempt = 1
+        while True:
+            if breaker is not None:
+                breaker.before_request()
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError as error:
+                _record(breaker, None)
+                if self.policy is None or not self.policy.should_retry_error(request, error):
+                    raise
+                if not self._can_retry(attempt):
+                    raise
+                time.sleep(self.policy.backoff(attempt))
+            except BaseException:
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+            else:
+                _record(breaker, response)
+                delay = self.policy.delay_for_response(request, response, attempt) if self.policy else None
+                if delay is None or not self._can_retry(attempt):
+                    return response
+                response.close()
+                time.sleep(delay)
+            attempt += 1
+
+    def _can_retry(self, attempt: int) -> bool:
+        return self.policy is not None and attempt < self.policy.max_attempts and self.policy.budget.withdraw()
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Retries failed requests according to ``policy`` and fails fast while a circuit is open"""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        policy: RetryPolicy | None = None,
+        breakers: CircuitBreakers | None = None,
+    ) -> None:
+        self.transport = transport
+        self.policy = policy
+        self.breakers = breakers
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = self.breakers.for_url(request.url) if self.breakers is not None else None
+        if self.policy is not None:
+            self.policy.budget.deposit()
+        attempt = 1
+        while True:
+            if breaker is not None:
+                breaker.before_request()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as error:
+                _record(breaker, None)
+                if self.policy is None or not self.policy.should_retry_error(request, error):
+                    raise
+                if not self._can_retry(attempt):
+                    raise
+                await asyncio.sleep(self.policy.backoff(attempt))
+            except BaseException:
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+            else:
+                _record(breaker, response)
+                delay = self.policy.delay_for_response(request, response, attempt) if self.policy else None
+                if delay is None or not self._can_retry(attempt):
+                    return response
+                await response.aclose()
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    def _can_retry(self, attempt: int) -> bool:
+        return self.policy is not None and attempt < self.policy.max_attempts and self.policy.budget.withdraw()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+__all__ = [
+    "AsyncRetryTransport",
+    "CircuitBreaker",
+    "CircuitBreakers",
+    "RetryBudget",
+    "RetryPolicy",
+    "RetryTransport",
+]
@@ -0,0 +1,129 @@
+"""Connection pooling shared between clients"""
+
+import ssl
+import threading
+from typing import Any
+
+import httpx
+
+# httpx keeps only 20 idle connections for 5 seconds by default, so high-fanout jobs keep
+# reconnecting. Behind nginx (keepalive_timeout 75s) idle connections can live much longer.
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100, keepalive_expiry=30.0)
+
+
+def make_limits(limits: httpx.Limits, keepalive_expiry: float | None = None) -> httpx.Limits:
+    """Return ``limits`` with ``keepalive_expiry`` applied, if given"""
+    if keepalive_expiry is None:
+        return limits
+    return httpx.Limits(
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+class _PoolEntry:
+    def __init__(self, transport: Any) -> None:
+        self.transport = transport
+        self.users = 0
+
+
+class _LeasedTransport(httpx.BaseTransport):
+    """A handle on a shared transport; the pool closes when its last handle does"""
+
+    def __init__(self, owner: "SharedTransports", key: tuple, entry: _PoolEntry) -> None:
+        self._owner = owner
+        self._key = key
+        self._entry = entry
+        self._released = False
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._entry.transport.handle_request(request)
+
+    def close(self) -> None:
+        if not self._released:
+            self._released = True
+            if self._owner._release(self._owner._sync, self._key, self._entry):
+                self._entry.transport.close()
+
+
+class _AsyncLeasedTransport(httpx.AsyncBaseTransport):
+    """A handle on a shared async transport; the pool closes when its last handle does"""
+
+    def __init__(self, owner: "SharedTransports", key: tuple, entry: _PoolEntry) -> None:
+        self._owner = owner
+        self._key = key
+        self._entry = entry
+        self._released = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._entry.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        if not self._released:
+            self._released = True
+            if self._owner._release(self._owner._async, self._key, self._entry):
+                await self._entry.transport.aclose()
+
+
+class SharedTransports:
+    """Connection pools shared by a Client and every client derived from it
+
+    ``Client.with_headers``, ``with_cookies``, ``with_timeout`` and ``attrs.evolve`` copy this object, so the
+    derived clients reuse the same TCP/TLS connections instead of opening their own. Clients with different
+    ``verify_ssl``, ``limits`` or ``http2`` settings get separate pools. A pool is closed when the last httpx
+    client using it is closed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sync: dict[tuple, _PoolEntry] = {}
+        self._async: dict[tuple, _PoolEntry] = {}
+
+    @staticmethod
+    def _key(verify: str | bool | ssl.SSLContext, limits: httpx.Limits, http2: bool) -> tuple:
+        return (
+            id(verify) if isinstance(verify, ssl.SSLContext) else verify,
+            limits.max_connections,
+            limits.max_keepalive_connections,
+            limits.keepalive_expiry,
+            http2,
+        )
+
+    def _acquire(self, pools: dict[tuple, _PoolEntry], key: tuple, factory: Any) -> _PoolEntry:
+        with self._lock:
+            entry = pools.get(key)
+            if entry is None:
+                entry = pools[key] = _PoolEntry(factory())
+            entry.users += 1
+            return entry
+
+    def _release(self, pools: dict[tuple, _PoolEntry], key: tuple, entry: _PoolEntry) -> bool:
+        with self._lock:
+            entry.users -= 1
+            if entry.users > 0:
+                return False
+            if pools.get(key) is entry:
+                del pools[key]
+            return True
+
+    def sync_transport(
+        self, *, verify: str | bool | ssl.SSLContext, limits: httpx.Limits, http2: bool
+    ) -> httpx.BaseTransport:
+        """Get a handle on the shared ``httpx.HTTPTransport`` for these settings"""
+        key = self._key(verify, limits, http2)
+        entry = self._acquire(self._sync, key, lambda: httpx.HTTPTransport(verify=verify, limits=limits, http2=http2))
+        return _LeasedTransport(self, key, entry)
+
+    def async_transport(
+        self, *, verify: str | bool | ssl.SSLContext, limits: httpx.Limits, http2: bool
+    ) -> httpx.AsyncBaseTransport:
+        """Get a handle on the shared ``httpx.AsyncHTTPTransport`` for these settings"""
+        key = self._key(verify, limits, http2)
+        entry = self._acquire(
+            self._async, key, lambda: httpx.AsyncHTTPTransport(verify=verify, limits=limits, http2=http2)
+        )
+        return _AsyncLeasedTransport(self, key, entry)
+
+
+__all__ = ["DEFAULT_LIMITS", "SharedTransports", "make_limits"]
@@ -1,10 +1,10 @@
 """Contains some shared types for properties"""
 
-from collections.abc import Mapping, MutableMapping
+from collections.abc import Callable, Mapping, MutableMapping
 from http import HTTPStatus
-from typing import IO, BinaryIO, Generic, Literal, TypeVar
+from typing import IO, Any, BinaryIO, Generic, Literal, TypeVar
 
-from attrs import define
+from attrs import define, field
 
 
 class Unset:
@@ -41,14 +41,61 @@ class File:
 T = TypeVar("T")
 
 
+class _NotParsed:
+    def __repr__(self) -> str:
+        return "<not parsed>"
+
+
+_NOT_PARSED: Any = _NotParsed()
+
+
+class ResponseReleased(Exception):
+    """Raised when reading the content or headers of a lean Response after they were released"""
+
+
 @define
 class Response(Generic[T]):
-    """A response from an endpoint"""
-
-    status_code: HTTPStatus
-    content: bytes
-    headers: MutableMapping[str, str]
-    parsed: T | None
+    """A response from an endpoint
 
+    When created with ``parse``, ``parsed`` is computed the first time it is read, so callers that only check
+    ``status_code`` never pay for decoding. Errors from parsing (such as errors.UnexpectedStatus) are raised at
+    that point. With ``lean=True`` the raw ``content`` and ``headers`` are released once ``parsed`` has been
+    computed, so only the parsed value stays in memory; reading them afterwards raises ResponseReleased.
+    """
 
-__all__ = ["UNSET", "File", "FileTypes", "RequestFiles", "Response", "Unset"]
+    status_code: HTTPStatus
+    _content: bytes | None = field(alias="content")
+    _headers: MutableMapping[str, str] | None = field(alias="headers")
+    _parsed: T | None = field(default=_NOT_PARSED, alias="parsed")
+    _parse: Callable[[], T | None] | None = field(default=None, kw_only=True, alias="parse", repr=False, eq=False)
+    lean: bool = field(default=False, kw_only=True)
+
+    @property
+    def parsed(self) -> T | None:
+        if self._parsed is _NOT_PARSED:
+            # The parser is dropped only once it succeeded, so a failure is raised again on every read
+            self._parsed = self._parse() if self._parse is not None else None
+            self._parse = None
+            if self.lean:
+                self._content = None
+                self._headers = None
+        return self._parsed
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._parsed is not _NOT_PARSED
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            raise ResponseReleased("content was released after parsing (lean response)")
+        return self._content
+
+    @property
+    def headers(self) -> MutableMapping[str, str]:
+        if self._headers is None:
+            raise ResponseReleased("headers were released after parsing (lean response)")
+        return self._headers
+
+
+__all__ = ["UNSET", "File", "FileTypes", "RequestFiles", "Response", "ResponseReleased", "Unset"]
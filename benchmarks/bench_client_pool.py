@@ -0,0 +1,93 @@
+"""Time 1,000 concurrent GETs with different client connection-pool settings.
+
+By default a minimal uvicorn server is started on a free local port. Point
+BENCH_BASE_URL at the nginx balancer (e.g. http://localhost:8080) to measure
+the real deployment; HTTP/2 is only tried for https:// URLs, because httpx
+negotiates HTTP/2 through TLS.
+
+    python benchmarks/bench_client_pool.py
+    BENCH_BASE_URL=http://localhost:8080 BENCH_PATH=/whoami python benchmarks/bench_client_pool.py
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from video_game_exchange_api_client import Client  # noqa: E402
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "1000"))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "3"))
+PATH = os.getenv("BENCH_PATH", "/whoami")
+
+
+async def whoami_app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b'{"container_name":"bench"}'})
+
+
+def start_local_server() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(whoami_app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_round(client: Client) -> list[float]:
+    http = client.get_async_httpx_client()
+
+    async def get() -> float:
+        start = time.perf_counter()
+        response = await http.get(PATH)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(get() for _ in range(REQUESTS)))
+
+
+async def bench(name: str, client: Client):
+    async with client:
+        await run_round(client)  # warm up the pool
+        for round_number in range(1, ROUNDS + 1):
+            start = time.perf_counter()
+            latencies = sorted(await run_round(client))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:44s} round {round_number}: {REQUESTS / elapsed:8.0f} req/s"
+                f"  p50 {statistics.median(latencies) * 1000:6.1f} ms"
+                f"  p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.1f} ms"
+            )
+
+
+async def main(base_url: str):
+    configs = [
+        ("httpx defaults (100 conns, 20 idle, 5s)", Client(
+            base_url=base_url, limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )),
+        ("client defaults (100 conns, 100 idle, 30s)", Client(base_url=base_url)),
+        ("wider pool (300 conns, 300 idle)", Client(
+            base_url=base_url, limits=httpx.Limits(max_connections=300, max_keepalive_connections=300)
+        )),
+    ]
+    if base_url.startswith("https://"):
+        configs.append(("http2", Client(base_url=base_url, http2=True)))
+    for name, client in configs:
+        await bench(name, client)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(os.getenv("BENCH_BASE_URL") or start_local_server()))
@@ -0,0 +1,104 @@
+"""Measure how email consumer throughput scales with the number of processes.
+
+Needs a running Kafka broker (``docker compose up kafka``). For each consumer
+count a fresh topic and consumer group are created, a fixed number of keyed
+notifications is produced, and the time for N processes in the same group to
+drain the topic is measured. Each message simulates a few milliseconds of
+delivery work so the numbers reflect consumer parallelism rather than broker
+speed.
+
+    KAFKA_BOOTSTRAP=localhost:9092 python benchmarks/bench_consumer_scaling.py
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+
+from kafka import KafkaProducer
+from kafka.admin import KafkaAdminClient, NewTopic
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import email_consumer  # noqa: E402
+
+KAFKA_BOOTSTRAP = os.getenv("KAFKA_BOOTSTRAP", "localhost:9092")
+PARTITIONS = int(os.getenv("BENCH_PARTITIONS", "8"))
+MESSAGES = int(os.getenv("BENCH_MESSAGES", "2000"))
+WORK_SECONDS = float(os.getenv("BENCH_WORK_MS", "5")) / 1000
+CONSUMER_COUNTS = [int(n) for n in os.getenv("BENCH_CONSUMERS", "1,2,4").split(",")]
+
+
+def create_topic(topic: str):
+    admin = KafkaAdminClient(bootstrap_servers=KAFKA_BOOTSTRAP)
+    admin.create_topics([NewTopic(topic, num_partitions=PARTITIONS, replication_factor=1)])
+    admin.close()
+
+
+def produce(topic: str):
+    producer = KafkaProducer(
+        bootstrap_servers=KAFKA_BOOTSTRAP,
+        key_serializer=lambda k: k.encode("utf-8"),
+        value_serializer=lambda v: json.dumps(v).encode("utf-8"),
+    )
+    for i in range(MESSAGES):
+        producer.send(topic, {
+            "type": "offer_accepted",
+            "offer_id": i,
+            "recipients": [f"user{i}@example.com"],
+            "subject": "Offer accepted",
+            "body": "benchmark",
+        }, key=f"offer:{i}")
+    producer.flush()
+    producer.close()
+
+
+def worker(topic: str, group_id: str, counter, done):
+    email_consumer.KAFKA_BOOTSTRAP = KAFKA_BOOTSTRAP
+    consumer = email_consumer.build_consumer(group_id=group_id, topic=topic)
+    while not done.is_set():
+        for records in consumer.poll(timeout_ms=200).values():
+            for _ in records:
+                time.sleep(WORK_SECONDS)
+                with counter.get_lock():
+                    counter.value += 1
+    consumer.close()
+
+
+def run(consumers: int) -> float:
+    topic = f"bench_email_{uuid.uuid4().hex[:8]}"
+    create_topic(topic)
+    produce(topic)
+
+    counter = multiprocessing.Value("i", 0)
+    done = multiprocessing.Event()
+    procs = [
+        multiprocessing.Process(target=worker, args=(topic, f"{topic}_group", counter, done))
+        for _ in range(consumers)
+    ]
+    for p in procs:
+        p.start()
+
+    # Start timing at the first consumed message so group rebalancing is not counted
+    while counter.value == 0:
+        time.sleep(0.01)
+    start = time.perf_counter()
+    while counter.value < MESSAGES:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    for p in procs:
+        p.join()
+    return MESSAGES / elapsed
+
+
+if __name__ == "__main__":
+    baseline = None
+    print(f"{MESSAGES} messages, {PARTITIONS} partitions, {WORK_SECONDS * 1000:.1f} ms work per message")
+    for n in CONSUMER_COUNTS:
+        rate = run(n)
+        baseline = baseline or rate
+        print(f"{n} consumer(s): {rate:8.1f} msg/s  speedup x{rate / baseline:.2f}  (ideal x{n / CONSUMER_COUNTS[0]:.2f})")
@@ -0,0 +1,64 @@
+"""Compare JSON codecs on large game lists.
+
+For each installed codec, reports decode throughput (bytes -> Python objects)
+and full parse throughput (bytes -> list[Game] via from_list) for a list of
+BENCH_ITEMS games, plus encode throughput for a list of request bodies.
+
+    python benchmarks/bench_json_codec.py
+    BENCH_ITEMS=100000 python benchmarks/bench_json_codec.py
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from video_game_exchange_api_client.codec import get_codec  # noqa: E402
+from video_game_exchange_api_client.models import Game  # noqa: E402
+
+ITEMS = int(os.getenv("BENCH_ITEMS", "10000"))
+REPEAT = int(os.getenv("BENCH_REPEAT", "5"))
+NUMBER = int(os.getenv("BENCH_NUMBER", "10"))
+
+
+def games() -> list[dict]:
+    return [
+        {
+            "id": i,
+            "name": f"Game {i}",
+            "publisher": "Nintendo",
+            "year": 1985 + i % 40,
+            "system": "NES",
+            "condition": "good",
+            "previousOwners": i % 4,
+        }
+        for i in range(ITEMS)
+    ]
+
+
+def best(stmt) -> float:
+    return min(timeit.repeat(stmt, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+def main() -> None:
+    items = games()
+    body = json.dumps(items).encode()
+    print(f"{ITEMS} games, {len(body) / 2**20:.1f} MiB of JSON")
+    print(f"{'codec':10s} {'decode MiB/s':>14s} {'parse games/s':>15s} {'encode MiB/s':>14s}")
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:10s} not installed")
+            continue
+        decode = best(lambda: codec.loads(body))
+        parse = best(lambda: Game.from_list(codec.loads(body)))
+        encode = best(lambda: codec.dumps(items))
+        mib = len(body) / 2**20
+        print(f"{name:10s} {mib / decode:14.1f} {ITEMS / parse:15,.0f} {mib / encode:14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure trade-cycle match latency on a large wants graph.
+
+Builds a TradeGraph of BENCH_OFFERS pending offers (a million by default) over
+BENCH_USERS users, skewed like generate_dataset.py: games, and so both ends of
+an offer, belong to Zipf-distributed owners, so a few power-sellers make and
+receive most offers. Then reports p50/p99/max for find_cycles (cycles of 2-4
+users) for random traders and for the busiest power-sellers, and for the
+incremental add/remove of one offer.
+
+    python benchmarks/bench_matching.py
+    BENCH_OFFERS=5000000 BENCH_USERS=1000000 python benchmarks/bench_matching.py
+"""
+
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generate_dataset import Zipf, scatter  # noqa: E402
+from matching import TradeGraph  # noqa: E402
+
+USERS = int(os.getenv("BENCH_USERS", "200000"))
+OFFERS = int(os.getenv("BENCH_OFFERS", "1000000"))
+SEARCHES = int(os.getenv("BENCH_SEARCHES", "2000"))
+SEED = int(os.getenv("BENCH_SEED", "42"))
+
+
+def report(label: str, samples_ns):
+    samples = sorted(samples_ns)
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    print(f"{label:<28} p50 {quantiles[49] / 1000:8.1f}us  p99 {quantiles[98] / 1000:8.1f}us  "
+          f"max {samples[-1] / 1000:8.1f}us")
+
+
+def main():
+    rng = random.Random(SEED)
+    multiplier = scatter(USERS)
+    zipf = Zipf(USERS, 1.1, rng)
+    owners = [rank * multiplier % USERS + 1 for rank in zipf.sample(OFFERS)]
+    requesters = [rank * multiplier % USERS + 1 for rank in zipf.sample(OFFERS)]
+
+    graph = TradeGraph()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    graph.add_offers(zip(range(1, OFFERS + 1), requesters, owners))
+    elapsed = time.perf_counter() - start
+    rss_grown = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    print(f"{len(graph):,} offers over {USERS:,} users loaded in {elapsed:.1f}s "
+          f"({len(graph) / elapsed:,.0f} offers/s, ~{rss_grown:,.0f} MB)")
+
+    def searches(users):
+        timings, found = [], 0
+        for user_id in users:
+            start = time.perf_counter_ns()
+            found += len(graph.find_cycles(user_id))
+            timings.append(time.perf_counter_ns() - start)
+        return timings, found
+
+    # Users who have made an offer, picked by offer so busier traders come up more often
+    timings, found = searches(rng.choice(requesters) for _ in range(SEARCHES))
+    report("find_cycles, random traders", timings)
+    print(f"  {found / SEARCHES:.1f} cycles per search")
+    hubs = [rank * multiplier % USERS + 1 for rank in range(20)]
+    timings, found = searches(hubs * (SEARCHES // len(hubs)))
+    report("find_cycles, top 20 sellers", timings)
+    print(f"  {found / (SEARCHES // len(hubs) * len(hubs)):.1f} cycles per search")
+
+    adds, removes = [], []
+    for offer_id in range(OFFERS + 1, OFFERS + 1 + SEARCHES):
+        requester, owner = rng.choice(requesters), rng.choice(owners)
+        start = time.perf_counter_ns()
+        graph.add_offer(offer_id, requester, owner)
+        adds.append(time.perf_counter_ns() - start)
+    for offer_id in rng.sample(range(1, OFFERS + 1), SEARCHES):
+        start = time.perf_counter_ns()
+        graph.remove_offer(offer_id)
+        removes.append(time.perf_counter_ns() - start)
+    report("add_offer", adds)
+    report("remove_offer", removes)
+
+
+if __name__ == "__main__":
+    main()
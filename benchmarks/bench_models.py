@@ -0,0 +1,65 @@
+"""Microbenchmarks for model encoding and decoding.
+
+Reports operations per second for to_dict, from_dict and from_list (over a
+BENCH_LIST_SIZE-item list) on Game, User and GameCreate, with and without an
+unknown key in the input.
+
+    python benchmarks/bench_models.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from video_game_exchange_api_client.models import Game, GameCreate, User  # noqa: E402
+
+LIST_SIZE = int(os.getenv("BENCH_LIST_SIZE", "1000"))
+REPEAT = int(os.getenv("BENCH_REPEAT", "5"))
+
+SAMPLES = {
+    Game: {
+        "id": 1,
+        "name": "Chrono Trigger",
+        "publisher": "Square",
+        "year": 1995,
+        "system": "SNES",
+        "condition": "good",
+        "previousOwners": 2,
+    },
+    User: {"id": 1, "username": "crono", "email": "crono@example.com", "address": "1000 AD"},
+    GameCreate: {
+        "name": "Chrono Trigger",
+        "publisher": "Square",
+        "year": 1995,
+        "system": "SNES",
+        "condition": "good",
+        "previousOwners": 2,
+    },
+}
+
+
+def ops_per_second(stmt, number: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=REPEAT))
+    return number / best
+
+
+def main() -> None:
+    print(f"{'model':12s} {'operation':28s} {'ops/s':>12s}")
+    for model, sample in SAMPLES.items():
+        extra = {**sample, "links": {"self": "/x"}}
+        instance = model.from_dict(sample)
+        items = [sample] * LIST_SIZE
+        cases = [
+            ("to_dict", instance.to_dict, 200_000),
+            ("from_dict", lambda: model.from_dict(sample), 200_000),
+            ("from_dict (unknown key)", lambda: model.from_dict(extra), 200_000),
+            (f"from_list ({LIST_SIZE} items)", lambda: model.from_list(items), 200),
+        ]
+        for name, stmt, number in cases:
+            print(f"{model.__name__:12s} {name:28s} {ops_per_second(stmt, number):12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
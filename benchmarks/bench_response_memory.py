@@ -0,0 +1,81 @@
+"""Measure the memory held by a list endpoint response in each parsing mode.
+
+Builds a JSON array of BENCH_ITEMS games (10,000 by default) and reports the
+bytes still allocated once a Response has been built and kept, for:
+
+* eager  - parsed immediately, content and headers kept (the old behavior)
+* lazy   - only status_code read, nothing parsed
+* parsed - lazily parsed, content and headers kept
+* lean   - lazily parsed with ``lean=True``, content and headers released
+
+    python benchmarks/bench_response_memory.py
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from video_game_exchange_api_client.models import Game  # noqa: E402
+from video_game_exchange_api_client.types import Response  # noqa: E402
+
+ITEMS = int(os.getenv("BENCH_ITEMS", "10000"))
+
+
+def payload() -> bytes:
+    return json.dumps(
+        [
+            {
+                "id": i,
+                "name": f"Game {i}",
+                "publisher": "Nintendo",
+                "year": 1985 + i % 40,
+                "system": "NES",
+                "condition": "good",
+                "owner_id": i % 500,
+            }
+            for i in range(ITEMS)
+        ]
+    ).encode()
+
+
+def build(body: bytes, mode: str) -> Response[list[Game]]:
+    raw = httpx.Response(200, headers={"Content-Type": "application/json"}, content=body)
+    raw.read()
+
+    def parse() -> list[Game]:
+        return [Game.from_dict(item) for item in raw.json()]
+
+    if mode == "eager":
+        return Response(raw.status_code, raw.content, raw.headers, parse())
+    response = Response(raw.status_code, raw.content, raw.headers, parse=parse, lean=mode == "lean")
+    if mode != "lazy":
+        response.parsed
+    return response
+
+
+def measure(mode: str) -> None:
+    # The body arrives from the network in the real client, so it is allocated inside the measurement
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = build(payload(), mode)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert response.status_code == 200
+    print(f"{mode:8s} held {held / 2**20:7.2f} MiB  peak {peak / 2**20:7.2f} MiB  {elapsed * 1000:7.1f} ms")
+    del response
+
+
+if __name__ == "__main__":
+    print(f"{ITEMS} items per response")
+    for mode in ("eager", "lazy", "parsed", "lean"):
+        measure(mode)
@@ -0,0 +1,82 @@
+"""Compare email delivery throughput: print path, one SMTP connection per email, pooled SMTP.
+
+Starts a local aiosmtpd sink server, so nothing besides ``pip install aiosmtpd`` is needed.
+Printed output goes to /dev/null so the print path measures formatting, not the terminal.
+
+    python benchmarks/bench_smtp_delivery.py
+"""
+
+import asyncio
+import contextlib
+import os
+import sys
+import time
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from email_consumer import handle_message  # noqa: E402
+from email_delivery import SMTPPool, build_email  # noqa: E402
+
+EMAILS = int(os.getenv("BENCH_EMAILS", "2000"))
+POOL_SIZE = int(os.getenv("BENCH_POOL_SIZE", "4"))
+
+
+class SinkHandler:
+    async def handle_DATA(self, server, session, envelope):
+        return "250 OK"
+
+
+def notifications():
+    return [{
+        "type": "offer_accepted",
+        "recipients": [f"user{i}@example.com", "owner@example.com"],
+        "subject": "Offer accepted",
+        "body": f"The trade offer for game {i} has been accepted.",
+    } for i in range(EMAILS)]
+
+
+def bench_print(data):
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for item in data:
+            handle_message(item)
+    return time.perf_counter() - start
+
+
+async def bench_connection_per_email(data, host, port):
+    semaphore = asyncio.Semaphore(POOL_SIZE)
+
+    async def send(item):
+        async with semaphore:
+            await aiosmtplib.send(build_email(item), hostname=host, port=port)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(item) for item in data))
+    return time.perf_counter() - start
+
+
+async def bench_pooled(data, host, port):
+    start = time.perf_counter()
+    async with SMTPPool(host, port, size=POOL_SIZE) as pool:
+        await asyncio.gather(*(pool.send(build_email(item)) for item in data))
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    controller = Controller(SinkHandler(), hostname="127.0.0.1", port=8025)
+    controller.start()
+    data = notifications()
+    try:
+        results = [
+            ("print", bench_print(data)),
+            ("SMTP, connection per email", asyncio.run(bench_connection_per_email(data, "127.0.0.1", 8025))),
+            (f"SMTP, pool of {POOL_SIZE}", asyncio.run(bench_pooled(data, "127.0.0.1", 8025))),
+        ]
+    finally:
+        controller.stop()
+
+    for name, elapsed in results:
+        print(f"{name:30s} {EMAILS / elapsed:10.1f} emails/s")
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Keep the API importable in tests without a Postgres server
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional
+
+# Serve GET /metrics on this port (unset disables the endpoint)
+METRICS_PORT = os.getenv("METRICS_PORT")
+# Print a JSON metrics line this often, in seconds (0 disables it)
+METRICS_LOG_INTERVAL = float(os.getenv("METRICS_LOG_INTERVAL", "60"))
+# How often partition lag is refreshed from the broker, in seconds
+METRICS_LAG_INTERVAL = float(os.getenv("METRICS_LAG_INTERVAL", "15"))
+# messages_per_second averages over this many trailing seconds
+METRICS_RATE_WINDOW = int(os.getenv("METRICS_RATE_WINDOW", "60"))
+
+# Upper bounds in milliseconds, from a fast local print up to a slow retried delivery
+LATENCY_BUCKETS_MS = [1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000]
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; cheap to update from the consumer loop."""
+
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (None when empty or past the last bucket)."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.buckets, self.counts)},
+                "le_inf": self.counts[-1],
+            },
+        }
+
+
+class ConsumerMetrics:
+    """Throughput, latency and lag numbers for one consumer process."""
+
+    def __init__(self, rate_window: int = METRICS_RATE_WINDOW):
+        self.started_at = time.time()
+        self.processed: Dict[str, int] = defaultdict(int)
+        self.failed: Dict[str, int] = defaultdict(int)
+        self.processing_ms = Histogram()
+        self.end_to_end_ms = Histogram()
+        self.lag: Dict[str, int] = {}
+        self.lag_updated_at: Optional[float] = None
+        # [second, messages] for the trailing rate_window seconds; reading doesn't change it,
+        # so the /metrics scrape and the log line see the same rate
+        self.rate_window = rate_window
+        self._per_second: Deque[List[int]] = deque()
+        self._lock = threading.Lock()
+
+    def observe(self, topic: str, started: float, finished: float, enqueued_at: Optional[float], ok: bool):
+        with self._lock:
+            (self.processed if ok else self.failed)[topic] += 1
+            second = int(finished)
+            if self._per_second and self._per_second[-1][0] == second:
+                self._per_second[-1][1] += 1
+            else:
+                self._per_second.append([second, 1])
+                while self._per_second[0][0] <= second - self.rate_window:
+                    self._per_second.popleft()
+            self.processing_ms.observe((finished - started) * 1000)
+            if ok and enqueued_at is not None:
+                self.end_to_end_ms.observe(max(0.0, time.time() - enqueued_at) * 1000)
+
+    def update_lag(self, consumer):
+        """Lag per assigned partition: messages between the consumer's position and the log end."""
+        assignment = list(consumer.assignment())
+        end_offsets = consumer.end_offsets(assignment) if assignment else {}
+        lag = {f"{tp.topic}[{tp.partition}]": max(0, end_offsets[tp] - consumer.position(tp)) for tp in assignment}
+        with self._lock:
+            self.lag = lag
+            self.lag_updated_at = time.time()
+
+    def lag_due(self) -> bool:
+        return self.lag_updated_at is None or time.time() - self.lag_updated_at >= METRICS_LAG_INTERVAL
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.time()
+            # Whole seconds only, so the current, partly counted second doesn't drag the rate down
+            current = int(now)
+            window = min(self.rate_window, max(1, current - int(self.started_at)))
+            recent = sum(count for second, count in self._per_second if current - window <= second < current)
+            return {
+                "timestamp": now,
+                "uptime_seconds": round(now - self.started_at, 1),
+                "messages_per_second": round(recent / window, 2),
+                "processed": dict(self.processed),
+                "failed": dict(self.failed),
+                "lag": dict(self.lag),
+                "total_lag": sum(self.lag.values()),
+                "processing_latency": self.processing_ms.snapshot(),
+                "end_to_end_latency": self.end_to_end_ms.snapshot(),
+            }
+
+
+class MetricsLogger:
+    """Prints a JSON metrics line every ``interval`` seconds when ``maybe_log`` is called."""
+
+    def __init__(self, metrics: ConsumerMetrics, interval: float = METRICS_LOG_INTERVAL):
+        self.metrics = metrics
+        self.interval = interval
+        self.last = time.time()
+
+    def maybe_log(self):
+        if self.interval <= 0 or time.time() - self.last < self.interval:
+            return
+        self.last = time.time()
+        print(json.dumps({"metrics": self.metrics.snapshot()}), flush=True)
+
+
+def serve_metrics(metrics: ConsumerMetrics, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` as JSON from a daemon thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = json.dumps(metrics.snapshot()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
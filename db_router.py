@@ -0,0 +1,136 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, Float, MetaData, String, Table, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlmodel import create_engine
+
+# Comma-separated read replicas; empty sends every query to the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# After a write, the writer's reads go to the primary for this many seconds, covering replication lag
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+# Set on write responses so the writer's next requests read from the primary, whichever worker serves them
+READ_PRIMARY_COOKIE = "read_primary"
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+metadata = MetaData()
+
+recent_writers = Table(
+    "recent_writer",
+    metadata,
+    Column("user_id", String, primary_key=True),
+    # Epoch seconds until which the user's reads go to the primary
+    Column("until", Float, nullable=False, index=True),
+)
+
+
+class ReadRouter:
+    """Picks the engine a request's reads go to.
+
+    Read-only handlers ask engine_for(request): a random replica, unless the
+    caller wrote recently, in which case the primary. A caller counts as a
+    recent writer when it sends the read_primary cookie set on its write
+    responses, or when its X-User-ID wrote within the window (for clients that
+    drop cookies). Writes by X-User-ID are recorded in the recent_writer table on
+    the primary, so every worker of every replica sees them; a read with an
+    X-User-ID and no cookie therefore costs one primary lookup, unless this
+    process already knows the user is within its window. Writes always use the
+    primary.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], window: float = READ_YOUR_WRITES_SECONDS):
+        self.primary = primary
+        self.replicas = replicas
+        self.window = window
+        # user id -> epoch seconds its window ends, for the writers this process has seen
+        self._recent_writers: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def create_table(self):
+        metadata.create_all(self.primary)
+
+    def engine_for(self, request) -> Engine:
+        if not self.replicas or self.wrote_recently(request):
+            return self.primary
+        return random.choice(self.replicas)
+
+    def wrote_recently(self, request) -> bool:
+        if request.cookies.get(READ_PRIMARY_COOKIE):
+            return True
+        user_id = request.headers.get("x-user-id")
+        if user_id is None:
+            return False
+        now = time.time()
+        with self._lock:
+            if self._recent_writers.get(user_id, 0.0) > now:
+                return True
+        # The write may have gone through another worker or replica
+        with self.primary.connect() as connection:
+            until = connection.execute(
+                select(recent_writers.c.until).where(recent_writers.c.user_id == user_id)
+            ).scalar_one_or_none()
+        if until is None or until <= now:
+            return False
+        self._remember(user_id, until, now)
+        return True
+
+    def record_write(self, user_id: Optional[str]):
+        if user_id is None:
+            return
+        now = time.time()
+        until = now + self.window
+        dialect = postgresql if self.primary.dialect.name == "postgresql" else sqlite
+        insert = dialect.insert(recent_writers).values(user_id=user_id, until=until)
+        with self.primary.begin() as connection:
+            if random.random() < 0.01:
+                connection.execute(delete(recent_writers).where(recent_writers.c.until < now))
+            connection.execute(insert.on_conflict_do_update(index_elements=["user_id"], set_={"until": until}))
+        self._remember(user_id, until, now)
+
+    def _remember(self, user_id: str, until: float, now: float):
+        with self._lock:
+            if len(self._recent_writers) > 10000:
+                self._recent_writers = {uid: end for uid, end in self._recent_writers.items() if end > now}
+            self._recent_writers[user_id] = until
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware marking successful writes for the ReadRouter.
+
+    Adds the read_primary cookie (expiring after the window) to every 2xx/3xx
+    response to a write and records the caller's X-User-ID in the shared table.
+    """
+
+    def __init__(self, app, router: ReadRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not self.router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        cookie = f"{READ_PRIMARY_COOKIE}=1; Max-Age={max(1, round(self.router.window))}; Path=/; HttpOnly; SameSite=Lax"
+
+        async def mark_send(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = dict(scope["headers"])
+                user_id = headers.get(b"x-user-id")
+                if user_id is not None:
+                    await asyncio.to_thread(self.router.record_write, user_id.decode("latin-1"))
+                headers = [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, mark_send)
+
+
+def router_from_env(primary: Engine, **engine_kwargs) -> ReadRouter:
+    """A ReadRouter over the replicas in DATABASE_REPLICA_URLS (none if unset)."""
+    return ReadRouter(primary, [create_engine(url, **engine_kwargs) for url in DATABASE_REPLICA_URLS])
@@ -1,23 +1,394 @@
-from kafka import KafkaConsumer
+from kafka import ConsumerRebalanceListener, KafkaConsumer, KafkaProducer, TopicPartition
+from kafka.errors import CommitFailedError
+from collections import defaultdict
+import asyncio
 import json
 import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from consumer_metrics import METRICS_PORT, ConsumerMetrics, MetricsLogger, serve_metrics
+from email_delivery import SMTPPool, build_email, pool_from_env
 
 KAFKA_BOOTSTRAP = os.getenv("KAFKA_BOOTSTRAP", "kafka:9092")
+EMAIL_TOPIC = os.getenv("EMAIL_TOPIC", "email_notifications")
+# Every process started with the same group id shares the topic's partitions,
+# so scaling out adds throughput instead of duplicating emails.
+KAFKA_GROUP_ID = os.getenv("KAFKA_GROUP_ID", "email_consumer")
+
+# Failed notifications move through one retry topic per delay (in seconds) and end
+# up on the dead-letter topic once every tier has been tried.
+RETRY_DELAYS = [float(d) for d in os.getenv("EMAIL_RETRY_DELAYS", "10,60,600").split(",")]
+RETRY_TOPICS = [f"{EMAIL_TOPIC}.retry.{tier}" for tier in range(1, len(RETRY_DELAYS) + 1)]
+DEAD_LETTER_TOPIC = os.getenv("EMAIL_DEAD_LETTER_TOPIC", f"{EMAIL_TOPIC}.dlq")
+
+REQUIRED_FIELDS = ("type", "recipients", "subject", "body")
+
+
+class PoisonMessage(Exception):
+    """A notification that can never be delivered, so it skips the retry tiers."""
+
+
+def consumer_topics(topic: str = EMAIL_TOPIC) -> List[str]:
+    return [topic, *(RETRY_TOPICS if topic == EMAIL_TOPIC else [])]
+
 
-consumer = KafkaConsumer(
-    "email_notifications",
-    bootstrap_servers=KAFKA_BOOTSTRAP,
-    auto_offset_reset='earliest',
-    value_deserializer=lambda m: json.loads(m.decode('utf-8'))
-)
+def build_consumer(group_id: str = KAFKA_GROUP_ID, topic: str = EMAIL_TOPIC) -> KafkaConsumer:
+    # Keys and values stay raw bytes: a payload that fails to decode is sent to the
+    # dead-letter topic by the handler instead of crashing inside poll().
+    # Offsets are committed only after a batch is delivered or forwarded, so a
+    # restart resumes where it stopped rather than replaying the topic.
+    return KafkaConsumer(
+        *consumer_topics(topic),
+        bootstrap_servers=KAFKA_BOOTSTRAP,
+        group_id=group_id,
+        client_id=f"{group_id}-{os.getpid()}",
+        auto_offset_reset='earliest',
+        enable_auto_commit=False,
+    )
 
-print("Email consumer started. Listening for notifications...")
 
-for message in consumer:
-    data = message.value
+def build_producer() -> KafkaProducer:
+    return KafkaProducer(bootstrap_servers=KAFKA_BOOTSTRAP)
+
+
+def parse_notification(raw: bytes) -> dict:
+    try:
+        data = json.loads(raw.decode('utf-8'))
+    except (AttributeError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise PoisonMessage(f"Notification is not valid JSON: {exc}") from exc
+    if not isinstance(data, dict):
+        raise PoisonMessage("Notification is not a JSON object")
+    missing = [name for name in REQUIRED_FIELDS if name not in data]
+    if missing:
+        raise PoisonMessage(f"Notification is missing {', '.join(missing)}")
+    if not isinstance(data["recipients"], list) or not data["recipients"]:
+        raise PoisonMessage("Notification has no recipients")
+    return data
+
+
+def handle_message(data: dict):
     # Simulate sending email
     print(f"[Email] Type: {data['type']}")
     print(f"Recipients: {', '.join(data['recipients'])}")
     print(f"Subject: {data['subject']}")
     print(f"Body: {data['body']}")
     print("-" * 50)
+
+
+async def deliver(data: dict, pool: Optional[SMTPPool] = None):
+    if pool is None:
+        handle_message(data)
+    else:
+        await pool.send(build_email(data))
+
+
+# -------------------- Retries --------------------
+def record_header(record, name: str) -> Optional[str]:
+    for key, value in record.headers or []:
+        if key == name:
+            return value.decode('utf-8')
+    return None
+
+
+def forward_failure(producer: KafkaProducer, record, error: Exception) -> str:
+    """Send a failed record to its next retry tier, or to the dead-letter topic. Returns the topic used."""
+    attempt = int(record_header(record, "attempt") or 0) + 1
+    headers = [
+        ("attempt", str(attempt).encode('utf-8')),
+        ("original_topic", (record_header(record, "original_topic") or record.topic).encode('utf-8')),
+        ("error", repr(error)[:1000].encode('utf-8')),
+    ]
+    if isinstance(error, PoisonMessage) or attempt > len(RETRY_TOPICS):
+        topic = DEAD_LETTER_TOPIC
+    else:
+        topic = RETRY_TOPICS[attempt - 1]
+        not_before = time.time() + RETRY_DELAYS[attempt - 1]
+        headers.append(("not_before", str(not_before).encode('utf-8')))
+    producer.send(topic, value=record.value, key=record.key, headers=headers)
+    return topic
+
+
+def park(producer: KafkaProducer, record, topic: str):
+    """Send a record, unattempted, to the retry topic where an earlier message with its key is waiting."""
+    tier = RETRY_TOPICS.index(topic) + 1
+    headers = [
+        # A failure there moves it on to the next tier, like the message it follows
+        ("attempt", str(tier).encode('utf-8')),
+        ("original_topic", (record_header(record, "original_topic") or record.topic).encode('utf-8')),
+        ("error", b"parked behind an earlier message with the same key"),
+        ("not_before", str(time.time() + RETRY_DELAYS[tier - 1]).encode('utf-8')),
+    ]
+    producer.send(topic, value=record.value, key=record.key, headers=headers)
+
+
+class ParkedKeys:
+    """Keys with messages waiting on a retry topic, so later ones don't overtake them.
+
+    Once a keyed message fails onto a retry tier, later messages with that key
+    are parked behind it on the same tier instead of being delivered. A key is
+    released once every message sent to the retry topics for it has come back
+    off them. Only the head's current tier delivers; stragglers on an older tier
+    are parked on again behind it. The state is per process: keys read from a
+    partition this consumer loses are forgotten, and the partition's new owner
+    starts without them.
+    """
+
+    def __init__(self):
+        # (original_topic, key) -> (retry topic the key's messages wait on, how many are waiting)
+        self.waiting: Dict[tuple, Tuple[str, int]] = {}
+        # (original_topic, key) -> partitions its messages were read from
+        self.sources: Dict[tuple, Set[TopicPartition]] = {}
+
+    def add(self, key: tuple, topic: str, source: TopicPartition):
+        _, count = self.waiting.get(key, (topic, 0))
+        self.waiting[key] = (topic, count + 1)
+        self.sources.setdefault(key, set()).add(source)
+
+    def forget(self, partitions):
+        """Drop the keys read from any of partitions, e.g. once they are revoked."""
+        partitions = set(partitions)
+        for key, sources in list(self.sources.items()):
+            if sources & partitions:
+                del self.sources[key]
+                self.waiting.pop(key, None)
+
+    def snapshot(self) -> tuple:
+        return dict(self.waiting), {key: set(sources) for key, sources in self.sources.items()}
+
+    def restore(self, snapshot: tuple):
+        self.waiting, self.sources = snapshot
+
+    def arrived(self, key: tuple, topic: str) -> Optional[str]:
+        """Account for a message with key read off topic; returns the retry topic to park it on, if any."""
+        waiting = self.waiting.get(key)
+        if waiting is None:
+            return None
+        waiting_topic, count = waiting
+        if topic in RETRY_TOPICS:
+            if count > 1:
+                self.waiting[key] = (waiting_topic, count - 1)
+            else:
+                del self.waiting[key]
+                self.sources.pop(key, None)
+            if topic == waiting_topic:
+                return None
+        return waiting_topic
+
+
+class SendTracker:
+    """Wraps a producer, keeping the futures of the sends made while one batch is processed."""
+
+    def __init__(self, producer: KafkaProducer):
+        self.producer = producer
+        self.futures = []
+
+    def send(self, *args, **kwargs):
+        future = self.producer.send(*args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def failed(self) -> list:
+        """The sends that failed; call after the producer is flushed."""
+        return [future for future in self.futures if future is not None and future.failed()]
+
+
+class RetryGate:
+    """Holds back retry-topic records until their backoff has elapsed.
+
+    Every record in a retry topic waits the same delay, so records are due in
+    offset order: when one is early its partition is paused and rewound to it,
+    and resumed once it is due. The main topic and the other tiers keep flowing.
+    """
+
+    def __init__(self, consumer: KafkaConsumer):
+        self.consumer = consumer
+        self.paused: Dict[TopicPartition, float] = {}
+
+    def resume_due(self, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        due = [tp for tp, resume_at in self.paused.items() if resume_at <= now]
+        if due:
+            for tp in due:
+                del self.paused[tp]
+            # Resuming a partition this consumer no longer owns raises
+            assigned = self.consumer.assignment()
+            due = [tp for tp in due if tp in assigned]
+            if due:
+                self.consumer.resume(*due)
+
+    def forget(self, partitions):
+        """Stop tracking partitions, e.g. once they are revoked."""
+        for tp in partitions:
+            self.paused.pop(tp, None)
+
+    def hold_back(self, batch: dict, now: Optional[float] = None) -> dict:
+        now = time.time() if now is None else now
+        ready = {}
+        for tp, records in batch.items():
+            for index, record in enumerate(records):
+                not_before = record_header(record, "not_before")
+                if not_before is not None and float(not_before) > now:
+                    self.consumer.pause(tp)
+                    self.consumer.seek(tp, record.offset)
+                    self.paused[tp] = float(not_before)
+                    records = records[:index]
+                    break
+            if records:
+                ready[tp] = records
+        return ready
+
+
+class RevokedPartitions(ConsumerRebalanceListener):
+    """Forgets the paused partitions and parked keys a rebalance takes away from this consumer."""
+
+    def __init__(self, gate: RetryGate, parked: ParkedKeys):
+        self.gate = gate
+        self.parked = parked
+
+    def on_partitions_revoked(self, revoked):
+        self.gate.forget(revoked)
+        self.parked.forget(revoked)
+
+    def on_partitions_assigned(self, assigned):
+        pass
+
+
+# -------------------- Consumer Loop --------------------
+def ordering_key(record) -> Optional[tuple]:
+    # Retried messages keep their place in line with the topic they came from
+    if record.key is None:
+        return None
+    return (record_header(record, "original_topic") or record.topic, record.key)
+
+
+async def process_record(
+    record,
+    pool: Optional[SMTPPool],
+    producer: KafkaProducer,
+    metrics: Optional[ConsumerMetrics] = None,
+    parked: Optional[ParkedKeys] = None,
+):
+    key = ordering_key(record)
+    if parked is not None and key is not None:
+        topic = parked.arrived(key, record.topic)
+        if topic is not None:
+            park(producer, record, topic)
+            parked.add(key, topic, TopicPartition(record.topic, record.partition))
+            print(f"[Email] {record.topic}[{record.partition}]@{record.offset} parked on {topic}")
+            return
+    started = time.perf_counter()
+    data = None
+    try:
+        data = parse_notification(record.value)
+        await deliver(data, pool)
+        ok = True
+    except Exception as exc:
+        ok = False
+        topic = forward_failure(producer, record, exc)
+        if parked is not None and key is not None and topic != DEAD_LETTER_TOPIC:
+            parked.add(key, topic, TopicPartition(record.topic, record.partition))
+        print(f"[Email] {record.topic}[{record.partition}]@{record.offset} failed ({exc!r}), sent to {topic}")
+    if metrics is not None:
+        enqueued_at = data.get("enqueued_at") if data else None
+        metrics.observe(record.topic, started, time.perf_counter(), enqueued_at, ok)
+
+
+async def process_in_order(
+    records,
+    pool: Optional[SMTPPool],
+    producer: KafkaProducer,
+    metrics: Optional[ConsumerMetrics] = None,
+    parked: Optional[ParkedKeys] = None,
+):
+    for record in records:
+        await process_record(record, pool, producer, metrics, parked)
+
+
+async def process_batch(
+    batch: dict,
+    pool: Optional[SMTPPool],
+    producer: KafkaProducer,
+    metrics: Optional[ConsumerMetrics] = None,
+    parked: Optional[ParkedKeys] = None,
+):
+    # Different keys are delivered concurrently (bounded by the SMTP pool);
+    # messages sharing a key keep their partition order, and once one of them
+    # fails the rest are parked behind it (see ParkedKeys).
+    if parked is None:
+        parked = ParkedKeys()
+    by_key: Dict[tuple, List] = defaultdict(list)
+    for records in batch.values():
+        for record in records:
+            by_key[ordering_key(record) or (record.topic, record.partition, None)].append(record)
+    await asyncio.gather(*(
+        process_in_order(records, pool, producer, metrics, parked) for records in by_key.values()
+    ))
+
+
+async def run(
+    consumer: KafkaConsumer,
+    producer: KafkaProducer,
+    pool: Optional[SMTPPool] = None,
+    metrics: Optional[ConsumerMetrics] = None,
+    topics: Optional[List[str]] = None,
+):
+    """Consume until cancelled. Given topics, subscribes to them so rebalances reach the retry state."""
+    gate = RetryGate(consumer)
+    parked = ParkedKeys()
+    if topics is not None:
+        consumer.subscribe(topics, listener=RevokedPartitions(gate, parked))
+    logger = MetricsLogger(metrics) if metrics is not None else None
+    while True:
+        gate.resume_due()
+        # kafka-python is blocking, so poll from a worker thread to keep the event loop free
+        batch = await asyncio.to_thread(consumer.poll, timeout_ms=1000)
+        batch = gate.hold_back(batch)
+        if batch:
+            sends = SendTracker(producer)
+            before = parked.snapshot()
+            await process_batch(batch, pool, sends, metrics, parked)
+            # Failures must be durable on their retry topic before the offsets move past them
+            await asyncio.to_thread(producer.flush)
+            failed = sends.failed()
+            if failed:
+                # Read the batch again rather than commit past messages that never reached a retry topic
+                print(f"[Email] {len(failed)} forwards failed ({failed[0].exception!r}), rereading the batch")
+                parked.restore(before)
+                assigned = consumer.assignment()
+                for tp, records in batch.items():
+                    if tp in assigned:
+                        consumer.seek(tp, records[0].offset)
+            else:
+                try:
+                    await asyncio.to_thread(consumer.commit)
+                except CommitFailedError as exc:
+                    # The group rebalanced mid-batch; the partitions' new owners pick up from the last commit
+                    print(f"[Email] Commit failed after a rebalance ({exc!r}), polling again")
+        if metrics is not None:
+            if metrics.lag_due():
+                await asyncio.to_thread(metrics.update_lag, consumer)
+            logger.maybe_log()
+
+
+async def main():
+    consumer = build_consumer()
+    producer = build_producer()
+    pool = pool_from_env()
+    metrics = ConsumerMetrics()
+    if METRICS_PORT:
+        serve_metrics(metrics, int(METRICS_PORT))
+    mode = f"SMTP {pool.hostname}:{pool.port}" if pool else "print"
+    print(f"Email consumer started in group '{KAFKA_GROUP_ID}' ({mode}). Listening for notifications...")
+
+    try:
+        await run(consumer, producer, pool, metrics, topics=consumer_topics())
+    finally:
+        if pool is not None:
+            await pool.close()
+        producer.close()
+        consumer.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+import asyncio
+import os
+from email.message import EmailMessage
+from typing import List, Optional
+
+import aiosmtplib
+
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_START_TLS = os.getenv("SMTP_START_TLS", "false").lower() == "true"
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+EMAIL_SENDER = os.getenv("EMAIL_SENDER", "no-reply@videogameexchange.local")
+
+# Errors after which the connection is thrown away and the message is retried once
+# on a fresh one (server restarted, idle connection timed out, ...)
+RECONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError)
+
+
+def build_email(data: dict, sender: str = EMAIL_SENDER) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = ", ".join(data["recipients"])
+    message["Subject"] = data["subject"]
+    message["X-Notification-Type"] = data["type"]
+    message.set_content(data["body"])
+    return message
+
+
+class PooledConnection:
+    """One persistent SMTP connection, recycled after ``max_messages`` sends."""
+
+    def __init__(self, pool: "SMTPPool"):
+        self.pool = pool
+        self.smtp: Optional[aiosmtplib.SMTP] = None
+        self.messages_sent = 0
+
+    async def connect(self):
+        await self.close()
+        self.smtp = aiosmtplib.SMTP(
+            hostname=self.pool.hostname,
+            port=self.pool.port,
+            username=self.pool.username,
+            password=self.pool.password,
+            start_tls=self.pool.start_tls,
+            timeout=self.pool.timeout,
+        )
+        await self.smtp.connect()
+        self.messages_sent = 0
+        self.pool.connections_opened += 1
+
+    async def close(self):
+        if self.smtp is None:
+            return
+        smtp, self.smtp = self.smtp, None
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    async def send(self, message: EmailMessage):
+        if self.smtp is None or not self.smtp.is_connected or self.messages_sent >= self.pool.max_messages:
+            await self.connect()
+        try:
+            await self.smtp.send_message(message)
+        except RECONNECT_ERRORS:
+            self.pool.reconnects += 1
+            await self.connect()
+            await self.smtp.send_message(message)
+        self.messages_sent += 1
+
+
+class SMTPPool:
+    """A fixed-size pool of persistent SMTP connections shared by concurrent senders.
+
+    Connections are opened lazily, reused across messages, replaced after
+    ``max_messages`` sends, and re-established once if the server dropped them.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int = 25,
+        *,
+        size: int = SMTP_POOL_SIZE,
+        max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = False,
+        timeout: float = 30,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.max_messages = max_messages
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self.connections: List[PooledConnection] = [PooledConnection(self) for _ in range(size)]
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for connection in self.connections:
+            self._idle.put_nowait(connection)
+        self.connections_opened = 0
+        self.reconnects = 0
+        self.messages_sent = 0
+
+    async def send(self, message: EmailMessage):
+        connection = await self._idle.get()
+        try:
+            await connection.send(message)
+            self.messages_sent += 1
+        finally:
+            self._idle.put_nowait(connection)
+
+    async def close(self):
+        for connection in self.connections:
+            await connection.close()
+
+    async def __aenter__(self) -> "SMTPPool":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+def pool_from_env() -> Optional[SMTPPool]:
+    """The delivery pool configured through ``SMTP_*`` variables, or None to keep printing emails."""
+    if not SMTP_HOST:
+        return None
+    return SMTPPool(
+        SMTP_HOST,
+        SMTP_PORT,
+        username=SMTP_USERNAME,
+        password=SMTP_PASSWORD,
+        start_tls=SMTP_START_TLS,
+    )
@@ -0,0 +1,263 @@
+"""Fill the database with a synthetic, realistically skewed dataset for scale testing.
+
+Writes straight into the User, Game and TradeOffer tables of the database in
+DATABASE_URL (or --database-url), using COPY on PostgreSQL and batched
+executemany on SQLite, all in one transaction: a run that fails partway leaves
+nothing behind, so it can simply be run again. The same --seed always
+produces the same rows.
+
+Distributions:
+- game ownership is Zipf-distributed over users, so a few power-sellers own
+  thousands of games while most users own one or two
+- platforms follow a fixed popularity table, titles a long-tailed Zipf
+- offers target popular games (Zipf again) and come from the offered game's owner
+
+Around 10M rows (1M users, 4M games, 5M offers) load in a few minutes:
+
+    python generate_dataset.py --users 1000000 --games 4000000 --offers 5000000
+    python generate_dataset.py --database-url sqlite:///scale.db --users 10000 --games 50000 --offers 100000
+"""
+
+import argparse
+import io
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from array import array
+from typing import Iterator, List, Sequence, Tuple
+
+PLATFORMS = [
+    ("Switch", 22), ("PS5", 18), ("PS4", 14), ("Xbox Series X", 10), ("PC", 9), ("Xbox One", 7), ("3DS", 5),
+    ("SNES", 4), ("NES", 3), ("N64", 3), ("PS2", 2), ("GameCube", 1.5), ("Genesis", 1), ("Game Boy", 1),
+    ("Dreamcast", 0.5),
+]
+ADJECTIVES = [
+    "Super", "Final", "Dark", "Legendary", "Eternal", "Crimson", "Hidden", "Mega", "Shadow", "Royal", "Cosmic",
+    "Lost", "Iron", "Neon", "Wild", "Silent", "Golden", "Frozen", "Infinite", "Ancient",
+]
+NOUNS = [
+    "Quest", "Fantasy", "Kart", "Souls", "Odyssey", "Legends", "Tactics", "Racer", "Kingdom", "Saga", "Arena",
+    "Frontier", "Chronicles", "Drift", "Dungeon", "Empire", "Galaxy", "Hunter", "Island", "Knights",
+]
+OFFER_STATUSES = [("pending", 70), ("rejected", 20), ("accepted", 10)]
+
+
+class Zipf:
+    """Draws ranks 0..n-1 with probability proportional to 1 / (rank + 1) ** s."""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self.n = n
+        self.rng = rng
+        self.cum_weights = list(itertools.accumulate(1.0 / (rank + 1) ** s for rank in range(n)))
+
+    def sample(self, k: int) -> List[int]:
+        return self.rng.choices(range(self.n), cum_weights=self.cum_weights, k=k)
+
+
+def scatter(n: int) -> int:
+    """A multiplier coprime with n, so rank * m % n maps ranks onto ids in a shuffled order without a table."""
+    m = 2654435761 % n if n > 1 else 1
+    while m > 1 and math.gcd(m, n) != 1:
+        m += 1
+    return max(m, 1)
+
+
+def titles(count: int, rng: random.Random) -> List[str]:
+    names = [f"{a} {n}" for a in ADJECTIVES for n in NOUNS]
+    rng.shuffle(names)
+    return [name if i < len(names) else f"{name} {i // len(names) + 1}"
+            for i, name in enumerate(itertools.islice(itertools.cycle(names), count))]
+
+
+def user_rows(first_id: int, count: int) -> Iterator[Tuple]:
+    for user_id in range(first_id, first_id + count):
+        yield user_id, f"user{user_id}", f"user{user_id}@example.com", "synthetic", f"{user_id} Main Street"
+
+
+def game_rows(first_id: int, count: int, first_user: int, users: int, owners: array, seed: int,
+              batch_size: int) -> Iterator[Tuple]:
+    rng = random.Random(seed)
+    owner_rank = Zipf(users, 1.1, rng)
+    owner_scatter = scatter(users)
+    title_pool = titles(min(50000, max(count // 20, 100)), rng)
+    title_rank = Zipf(len(title_pool), 1.0, rng)
+    platform_names = [name for name, _ in PLATFORMS]
+    platform_weights = list(itertools.accumulate(weight for _, weight in PLATFORMS))
+    game_id = first_id
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        ranks = owner_rank.sample(size)
+        title_ranks = title_rank.sample(size)
+        platforms = rng.choices(platform_names, cum_weights=platform_weights, k=size)
+        for rank, title, platform in zip(ranks, title_ranks, platforms):
+            owner_id = first_user + rank * owner_scatter % users
+            owners.append(owner_id)
+            yield game_id, title_pool[title], platform, owner_id
+            game_id += 1
+
+
+def offer_rows(first_id: int, count: int, first_game: int, owners: Sequence[int], seed: int,
+               batch_size: int) -> Iterator[Tuple]:
+    # Checked here rather than inside the generator, so it fails before any offer is loaded
+    if count and len(set(owners)) < 2:
+        raise ValueError("offers need games owned by at least two different users")
+    return _offer_rows(first_id, count, first_game, owners, seed, batch_size)
+
+
+def _offer_rows(first_id: int, count: int, first_game: int, owners: Sequence[int], seed: int,
+                batch_size: int) -> Iterator[Tuple]:
+    rng = random.Random(seed)
+    games = len(owners)
+    wanted_rank = Zipf(games, 0.9, rng)
+    wanted_scatter = scatter(games)
+    status_names = [name for name, _ in OFFER_STATUSES]
+    status_weights = list(itertools.accumulate(weight for _, weight in OFFER_STATUSES))
+    offer_id = first_id
+    produced = 0
+    while produced < count:
+        size = min(batch_size, count - produced)
+        wanted = wanted_rank.sample(size)
+        statuses = rng.choices(status_names, cum_weights=status_weights, k=size)
+        for rank, status in zip(wanted, statuses):
+            requested = rank * wanted_scatter % games
+            offered = rng.randrange(games)
+            if owners[offered] == owners[requested]:
+                continue  # nobody trades with themselves; the shortfall is made up in the next batch
+            yield offer_id, first_game + offered, first_game + requested, owners[offered], status
+            offer_id += 1
+            produced += 1
+
+
+# -------------------- Loaders --------------------
+def batches(rows: Iterator[Tuple], size: int) -> Iterator[List[Tuple]]:
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def copy_text(batch: List[Tuple]) -> io.StringIO:
+    # Our generated values never contain tabs, newlines or backslashes, so no escaping is needed
+    return io.StringIO("".join("\t".join(map(str, row)) + "\n" for row in batch))
+
+
+class Loader:
+    """Writes batches through one raw connection; the caller commits or rolls back the whole load."""
+
+    def __init__(self, connection, dialect: str, batch_size: int):
+        self.connection = connection
+        self.dialect = dialect
+        self.batch_size = batch_size
+
+    def load(self, table: str, columns: Sequence[str], rows: Iterator[Tuple]) -> int:
+        loaded = 0
+        cursor = self.connection.cursor()
+        quoted = f'"{table}"'
+        column_list = ", ".join(columns)
+        for batch in batches(rows, self.batch_size):
+            if self.dialect == "postgresql":
+                sql = f"COPY {quoted} ({column_list}) FROM STDIN"
+                if hasattr(cursor, "copy"):  # psycopg 3
+                    with cursor.copy(sql) as copy:
+                        copy.write(copy_text(batch).getvalue())
+                else:  # psycopg2
+                    cursor.copy_expert(sql, copy_text(batch))
+            else:
+                placeholders = ", ".join("?" for _ in columns)
+                cursor.executemany(f"INSERT INTO {quoted} ({column_list}) VALUES ({placeholders})", batch)
+            loaded += len(batch)
+            print(f"\r{table}: {loaded:,} rows", end="", file=sys.stderr, flush=True)
+        print(file=sys.stderr)
+        return loaded
+
+    def next_id(self, table: str) -> int:
+        cursor = self.connection.cursor()
+        cursor.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM "{table}"')
+        return cursor.fetchone()[0]
+
+    def reset_sequence(self, table: str):
+        if self.dialect == "postgresql":
+            cursor = self.connection.cursor()
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                           f'(SELECT COALESCE(MAX(id), 1) FROM "{table}"))')
+
+
+def generate(engine, users: int, games: int, offers: int, seed: int = 42, batch_size: int = 50000) -> dict:
+    """Append the generated rows to engine's database and return how many rows went into each table."""
+    from main import Game, SQLModel, TradeOffer, User
+
+    if offers and (users < 2 or games < 2):
+        raise ValueError("offers need at least two users and two games")
+
+    SQLModel.metadata.create_all(engine)
+    raw = engine.raw_connection()
+    try:
+        dialect = engine.dialect.name
+        if dialect == "sqlite":
+            raw.execute("PRAGMA journal_mode=WAL")
+            raw.execute("PRAGMA synchronous=OFF")
+        loader = Loader(raw, dialect, batch_size)
+        user_table, game_table, offer_table = User.__tablename__, Game.__tablename__, TradeOffer.__tablename__
+
+        first_user = loader.next_id(user_table)
+        counts = {user_table: loader.load(
+            user_table, ["id", "name", "email", "password", "address"], user_rows(first_user, users))}
+
+        owners = array("q")
+        first_game = loader.next_id(game_table)
+        counts[game_table] = loader.load(
+            game_table, ["id", "title", "platform", "owner_id"],
+            game_rows(first_game, games, first_user, users, owners, seed, batch_size) if users else iter(()),
+        )
+
+        first_offer = loader.next_id(offer_table)
+        counts[offer_table] = loader.load(
+            offer_table, ["id", "offered_game_id", "requested_game_id", "requester_id", "status"],
+            offer_rows(first_offer, offers, first_game, owners, seed + 1, batch_size),
+        )
+
+        for table in (user_table, game_table, offer_table):
+            loader.reset_sequence(table)
+        raw.commit()
+        return counts
+    except BaseException:
+        # Users and games loaded before a failure (e.g. the owner check in offer_rows) go too
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="Target database (defaults to DATABASE_URL)")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--games", type=int, default=50000)
+    parser.add_argument("--offers", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        # main reads DATABASE_URL when it is imported
+        os.environ["DATABASE_URL"] = args.database_url
+    import main as api
+
+    start = time.perf_counter()
+    try:
+        counts = generate(api.engine, args.users, args.games, args.offers, seed=args.seed, batch_size=args.batch_size)
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(f"Loaded {total:,} rows ({', '.join(f'{t}: {n:,}' for t, n in counts.items())}) "
+          f"in {elapsed:.1f}s, {total / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""gunicorn settings for running the API with one uvicorn worker per CPU.
+
+    gunicorn main:app -c gunicorn.conf.py
+
+Every worker has its own SQLAlchemy pool, so the replica's share of Postgres
+connections (DB_CONNECTION_BUDGET) is split between the workers. With three
+replicas, keep 3 * DB_CONNECTION_BUDGET under the server's max_connections
+minus whatever the consumers and admin sessions need.
+
+Each worker's pool also serves its background users (the rate-limit lease
+threads, the idempotency store and the match rebuild, which holds a connection
+for its whole load), so every worker needs room for those plus at least one
+request. Without an explicit WEB_CONCURRENCY the worker count is lowered to
+fit; with one that doesn't fit, startup fails rather than exceed the budget.
+"""
+
+import math
+import os
+import subprocess
+import sys
+
+
+def available_cpus() -> int:
+    """CPUs this container may actually use: the cgroup quota (docker --cpus) if set, else the CPU affinity mask."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    for path in ("/sys/fs/cgroup/cpu.max", "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"):
+        try:
+            with open(path) as f:
+                fields = f.read().split()
+            if path.endswith("cpu.max"):
+                quota, period = fields
+            else:
+                with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                    quota, period = fields[0], f.read().strip()
+            if quota not in ("max", "-1"):
+                return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+        except (OSError, ValueError):
+            continue
+    return cpus
+
+
+# Postgres connections this replica may hold across all of its workers
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", "30"))
+# Connections a worker's background users may hold at once: the rate-limit lease
+# threads, plus one each for the idempotency store and the match rebuild
+DB_RESERVED_CONNECTIONS = int(os.getenv("RATE_LIMIT_LEASE_THREADS", "2")) + 2
+# The reserve plus at least one connection for requests
+DB_MIN_WORKER_CONNECTIONS = DB_RESERVED_CONNECTIONS + 1
+
+# Async workers: one per CPU is enough, each serves many requests at once
+workers = int(os.getenv("WEB_CONCURRENCY", "0"))
+# Logged in on_starting, once the server's logger exists
+budget_warning = None
+if "DB_POOL_SIZE" in os.environ:
+    # An explicit pool size is the operator's budget to keep
+    workers = workers or available_cpus()
+elif workers:
+    if DB_CONNECTION_BUDGET // workers < DB_MIN_WORKER_CONNECTIONS:
+        raise RuntimeError(
+            f"DB_CONNECTION_BUDGET={DB_CONNECTION_BUDGET} leaves fewer than {DB_MIN_WORKER_CONNECTIONS} "
+            f"connections for each of {workers} workers; raise the budget or lower WEB_CONCURRENCY")
+elif DB_CONNECTION_BUDGET < DB_MIN_WORKER_CONNECTIONS:
+    raise RuntimeError(
+        f"DB_CONNECTION_BUDGET={DB_CONNECTION_BUDGET} is below the {DB_MIN_WORKER_CONNECTIONS} "
+        f"connections one worker needs")
+else:
+    cpus = available_cpus()
+    workers = min(cpus, DB_CONNECTION_BUDGET // DB_MIN_WORKER_CONNECTIONS)
+    if workers < cpus:
+        budget_warning = (f"Running {workers} workers instead of {cpus}: DB_CONNECTION_BUDGET={DB_CONNECTION_BUDGET} "
+                          f"allows {DB_MIN_WORKER_CONNECTIONS} connections for each of at most {workers}")
+worker_class = "uvicorn_worker.UvicornWorker"
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# Matches nginx's upstream keepalive_timeout so nginx, not the worker, closes idle connections
+keepalive = int(os.getenv("KEEPALIVE", "75"))
+graceful_timeout = 30
+timeout = 60
+
+# An explicit DB_POOL_SIZE / DB_MAX_OVERFLOW still wins. The default caps every
+# worker at its share of the budget with no overflow, so the total can't be exceeded.
+os.environ.setdefault("DB_POOL_SIZE", str(DB_CONNECTION_BUDGET // workers))
+os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+# Tables are created once, in on_starting, rather than by every worker at startup
+os.environ["DB_CREATE_TABLES"] = "0"
+
+
+def on_starting(server):
+    # Runs in a separate process so the master never imports the app (and its engine,
+    # Kafka producer and capture writer) before forking the workers
+    if budget_warning:
+        server.log.warning(budget_warning)
+    server.log.info("Creating tables; %d workers with a pool of %s (+%s overflow) each",
+                    workers, os.environ["DB_POOL_SIZE"], os.environ["DB_MAX_OVERFLOW"])
+    subprocess.run([sys.executable, "-c", "import main; main.create_tables()"], check=True)
@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import os
+import random
+import time
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import Column, Float, Integer, LargeBinary, MetaData, String, Table, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+# How long a stored response is replayed for retries with the same key
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+# An attempt still marked in progress after this long is presumed dead and may be taken over
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "30"))
+# How long a duplicate waits for the first attempt to finish before getting a 409
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+
+# Responses that say "not now" rather than answering the request: the key is released so a retry runs again
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429})
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+metadata = MetaData()
+
+keys = Table(
+    "idempotency_key",
+    metadata,
+    # "<method> <path> <X-User-ID>:<Idempotency-Key>", so keys never collide across users or endpoints
+    Column("key", String, primary_key=True),
+    # sha256 of the request body; the same key with a different body is a client bug
+    Column("fingerprint", String, nullable=False),
+    # Random per claim, so an attempt that was taken over can't complete or release the new owner's row
+    Column("token", String, nullable=False),
+    Column("state", String, nullable=False),
+    Column("status_code", Integer),
+    Column("content_type", String),
+    Column("body", LargeBinary),
+    Column("locked_until", Float, nullable=False),
+    Column("expires_at", Float, nullable=False, index=True),
+)
+
+
+class IdempotencyStore:
+    """Records the first response to each Idempotency-Key in the idempotency_key table.
+
+    begin() claims a key by inserting an in_progress row; whoever inserts it runs
+    the request, everyone else finds the row and either replays the completed
+    response or waits for it. The table is shared, so this holds across replicas.
+    """
+
+    def __init__(self, engine: Engine, ttl: float = IDEMPOTENCY_TTL_SECONDS,
+                 lock_seconds: float = IDEMPOTENCY_LOCK_SECONDS):
+        self.engine = engine
+        self.ttl = ttl
+        self.lock_seconds = lock_seconds
+
+    def create_table(self):
+        metadata.create_all(self.engine)
+
+    def begin(self, key: str, fingerprint: str, token: str):
+        """Claim key under token. Returns None if the caller should run the request, else the existing row."""
+        dialect = postgresql if self.engine.dialect.name == "postgresql" else sqlite
+        now = time.time()
+        with self.engine.begin() as connection:
+            if random.random() < 0.01:
+                connection.execute(delete(keys).where(keys.c.expires_at < now))
+            claimed = connection.execute(
+                dialect.insert(keys)
+                .values(key=key, fingerprint=fingerprint, token=token, state=IN_PROGRESS,
+                        locked_until=now + self.lock_seconds, expires_at=now + self.ttl)
+                .on_conflict_do_nothing()
+            ).rowcount
+            if claimed:
+                return None
+            # Expired entries, and attempts whose server died mid-request, can be claimed again
+            taken_over = connection.execute(
+                update(keys)
+                .where(keys.c.key == key)
+                .where((keys.c.expires_at < now) | ((keys.c.state == IN_PROGRESS) & (keys.c.locked_until < now)))
+                .values(fingerprint=fingerprint, token=token, state=IN_PROGRESS,
+                        status_code=None, content_type=None, body=None,
+                        locked_until=now + self.lock_seconds, expires_at=now + self.ttl)
+            ).rowcount
+            if taken_over:
+                return None
+            return connection.execute(select(keys).where(keys.c.key == key)).one()
+
+    def get(self, key: str):
+        with self.engine.connect() as connection:
+            return connection.execute(select(keys).where(keys.c.key == key)).one_or_none()
+
+    def complete(self, key: str, token: str, status_code: int, content_type: Optional[str], body: bytes):
+        """Store the response, unless another attempt has taken the key over since it was claimed with token."""
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(keys).where(keys.c.key == key).where(keys.c.token == token)
+                .values(state=COMPLETED, status_code=status_code, content_type=content_type, body=body)
+            )
+
+    def release(self, key: str, token: str):
+        """Forget an attempt that failed, so a retry runs the request again. A no-op once taken over."""
+        with self.engine.begin() as connection:
+            connection.execute(
+                delete(keys).where(keys.c.key == key).where(keys.c.token == token).where(keys.c.state == IN_PROGRESS)
+            )
+
+
+def _json_response(status: int, body: bytes, content_type: Optional[str], replayed: bool = False):
+    headers = [(b"content-type", (content_type or "application/json").encode("latin-1")),
+               (b"content-length", str(len(body)).encode("latin-1"))]
+    if replayed:
+        headers.append((b"idempotent-replayed", b"true"))
+    return [{"type": "http.response.start", "status": status, "headers": headers},
+            {"type": "http.response.body", "body": body}]
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware honouring the Idempotency-Key header on selected POST routes.
+
+    The first request with a key runs normally and its response (status and
+    body) is stored; retries with the same key and body get the stored response,
+    marked with Idempotent-Replayed: true, without running the handler again.
+    A duplicate arriving while the first attempt is still running waits for it.
+    Reusing a key with a different body is rejected with 422. 5xx responses,
+    retryable statuses such as 429 and 409, and exceptions are not stored, so
+    those can be retried.
+    """
+
+    def __init__(self, app, store: IdempotencyStore, paths: Iterable[str],
+                 wait_seconds: float = IDEMPOTENCY_WAIT_SECONDS):
+        self.app = app
+        self.store = store
+        self.paths = frozenset(paths)
+        self.wait_seconds = wait_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(b"idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        body = bytearray()
+        while True:
+            message = await receive()
+            body.extend(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        user = headers.get(b"x-user-id", b"").decode("latin-1")
+        key = f"POST {scope['path']} {user}:{idempotency_key.decode('latin-1')}"
+        fingerprint = hashlib.sha256(body).hexdigest()
+        token = uuid.uuid4().hex
+
+        existing = await asyncio.to_thread(self.store.begin, key, fingerprint, token)
+        if existing is not None:
+            await self._reply_with_existing(key, fingerprint, existing, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": bytes(body), "more_body": False}
+
+        response = {"status": 500, "content_type": None, "body": bytearray()}
+
+        async def record_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["content_type"] = dict(message.get("headers", [])).get(b"content-type", b"").decode("latin-1")
+            elif message["type"] == "http.response.body":
+                response["body"].extend(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, record_send)
+        except BaseException:
+            await asyncio.to_thread(self.store.release, key, token)
+            raise
+        if response["status"] >= 500 or response["status"] in RETRYABLE_STATUSES:
+            await asyncio.to_thread(self.store.release, key, token)
+        else:
+            await asyncio.to_thread(
+                self.store.complete, key, token, response["status"], response["content_type"], bytes(response["body"])
+            )
+
+    async def _reply_with_existing(self, key: str, fingerprint: str, row, send):
+        deadline = time.monotonic() + self.wait_seconds
+        delay = 0.01
+        while row is not None and row.state == IN_PROGRESS and row.fingerprint == fingerprint:
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+            row = await asyncio.to_thread(self.store.get, key)
+
+        if row is None:
+            # The first attempt failed and released the key; let the client retry it
+            messages = _json_response(409, b'{"detail":"The original request failed, retry it"}', None)
+        elif row.fingerprint != fingerprint:
+            messages = _json_response(
+                422, b'{"detail":"Idempotency-Key was already used with a different request body"}', None
+            )
+        elif row.state == IN_PROGRESS:
+            messages = _json_response(
+                409, b'{"detail":"A request with this Idempotency-Key is still in progress"}', None
+            )
+        else:
+            messages = _json_response(row.status_code, row.body or b"", row.content_type, replayed=True)
+        for message in messages:
+            await send(message)
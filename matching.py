@@ -0,0 +1,265 @@
+import os
+import threading
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Reads through GET /matches pick up offers created since the last look at most this often
+MATCH_SYNC_SECONDS = float(os.getenv("MATCH_SYNC_SECONDS", "2"))
+# The graph is rebuilt from the database this often, dropping offers other replicas withdrew
+MATCH_RESYNC_SECONDS = float(os.getenv("MATCH_RESYNC_SECONDS", "300"))
+# Neighbours expanded per user during a search, so one power-seller can't make a search unbounded
+MATCH_MAX_FANOUT = int(os.getenv("MATCH_MAX_FANOUT", "1000"))
+# Adjacency entries one search may examine before it returns what it has found so far
+MATCH_SEARCH_BUDGET = int(os.getenv("MATCH_SEARCH_BUDGET", "50000"))
+
+# (offer_id, requester_id, owner_id): requester wants a game owned by owner
+OfferEdge = Tuple[int, int, int]
+
+
+class TradeCycle:
+    """A closed chain of pending offers: users[i] wants a game from users[i + 1] (wrapping around) via offer_ids[i]."""
+
+    def __init__(self, users: List[int], offer_ids: List[int]):
+        self.users = users
+        self.offer_ids = offer_ids
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+
+class TradeGraph:
+    """The "wants" graph of pending offers, between users.
+
+    An offer from R for a game owned by W is an edge R -> W. A cycle
+    A -> B -> C -> A means every user in it can receive a game they asked for
+    while giving one away, even though no two of them want each other's games.
+
+    The graph is updated one offer at a time (add_offer / remove_offer), and
+    find_cycles searches only around the asking user: 2- and 3-cycles by
+    intersecting its out- and in-neighbours, 4-cycles by meeting in the middle,
+    expanding two hops forward and two hops backward (whichever side is smaller
+    is built, the other probes it). Searches cost a few neighbourhoods, not the
+    whole graph, and a power-seller's neighbourhood is capped by max_fanout and
+    the whole search by budget, so latency stays bounded however many offers
+    there are.
+    """
+
+    def __init__(self):
+        # out_edges[requester][owner] = offer ids; in_edges[owner] = requesters
+        self.out_edges: Dict[int, Dict[int, Set[int]]] = {}
+        self.in_edges: Dict[int, Set[int]] = {}
+        self.offers: Dict[int, Tuple[int, int]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.offers)
+
+    def add_offer(self, offer_id: int, requester_id: int, owner_id: int):
+        if requester_id == owner_id:
+            return
+        with self._lock:
+            if offer_id in self.offers:
+                return
+            self.offers[offer_id] = (requester_id, owner_id)
+            self.out_edges.setdefault(requester_id, {}).setdefault(owner_id, set()).add(offer_id)
+            self.in_edges.setdefault(owner_id, set()).add(requester_id)
+
+    def add_offers(self, edges: Iterable[OfferEdge]) -> int:
+        """Add every edge; returns the highest offer id seen (0 if none)."""
+        last_offer_id = 0
+        with self._lock:
+            for offer_id, requester_id, owner_id in edges:
+                self.add_offer(offer_id, requester_id, owner_id)
+                last_offer_id = max(last_offer_id, offer_id)
+        return last_offer_id
+
+    def remove_offer(self, offer_id: int):
+        with self._lock:
+            edge = self.offers.pop(offer_id, None)
+            if edge is None:
+                return
+            requester_id, owner_id = edge
+            targets = self.out_edges[requester_id]
+            offer_ids = targets[owner_id]
+            offer_ids.discard(offer_id)
+            if offer_ids:
+                return
+            del targets[owner_id]
+            if not targets:
+                del self.out_edges[requester_id]
+            requesters = self.in_edges[owner_id]
+            requesters.discard(requester_id)
+            if not requesters:
+                del self.in_edges[owner_id]
+
+    def find_cycles(self, user_id: int, max_length: int = 4, limit: int = 20, max_fanout: int = MATCH_MAX_FANOUT,
+                    budget: int = MATCH_SEARCH_BUDGET) -> List[TradeCycle]:
+        """Up to limit cycles of 2..max_length users through user_id, shortest first.
+
+        Stops early once about budget adjacency entries have been examined,
+        returning what it found by then.
+        """
+        with self._lock:
+            out_u = self._out(user_id, max_fanout)
+            in_u = self._in(user_id, max_fanout)
+            if not out_u or not in_u:
+                return []
+            # u -> a -> u
+            found = [[user_id, a] for a in _intersect(out_u, in_u)]
+            work = min(len(out_u), len(in_u))
+            if max_length >= 3:
+                # u -> a -> b -> u
+                for a in out_u:
+                    if len(found) >= limit or work >= budget:
+                        break
+                    out_a = self._out(a, max_fanout)
+                    work += min(len(out_a), len(in_u))
+                    found.extend([user_id, a, b] for b in _intersect(out_a, in_u) if b != user_id)
+            if max_length >= 4 and len(found) < limit and work < budget:
+                found.extend(self._four_cycles(user_id, out_u, in_u, limit - len(found), max_fanout, budget - work))
+            return [self._cycle(users) for users in found[:limit]]
+
+    def _four_cycles(self, user_id: int, out_u, in_u, limit: int, max_fanout: int, budget: int) -> List[List[int]]:
+        # u -> a -> b -> c -> u: meet at b, two hops forward (through a) and two back (through c).
+        # The cheaper side is indexed by b, the other side probes it.
+        forward_cost = sum(min(len(self.out_edges.get(a, ())), max_fanout) for a in out_u)
+        backward_cost = sum(min(len(self.in_edges.get(c, ())), max_fanout) for c in in_u)
+        forward = forward_cost <= backward_cost
+        index_side, probe_side = (out_u, in_u) if forward else (in_u, out_u)
+        index_step, probe_step = (self._out, self._in) if forward else (self._in, self._out)
+
+        middle: Dict[int, List[int]] = {}
+        work = len(out_u) + len(in_u)
+        for x in index_side:
+            if work >= budget:
+                break
+            neighbours = index_step(x, max_fanout)
+            work += len(neighbours)
+            for b in neighbours:
+                middle.setdefault(b, []).append(x)
+        found = []
+        for y in probe_side:
+            if work >= budget:
+                break
+            neighbours = probe_step(y, max_fanout)
+            work += len(neighbours)
+            for b in neighbours:
+                for x in middle.get(b, ()):
+                    cycle = [user_id, x, b, y] if forward else [user_id, y, b, x]
+                    if len(set(cycle)) == 4:
+                        found.append(cycle)
+                        if len(found) >= limit:
+                            return found
+        return found
+
+    def _out(self, user_id: int, max_fanout: int):
+        targets = self.out_edges.get(user_id, {})
+        return targets.keys() if len(targets) <= max_fanout else set(islice(targets, max_fanout))
+
+    def _in(self, user_id: int, max_fanout: int):
+        requesters = self.in_edges.get(user_id, set())
+        return requesters if len(requesters) <= max_fanout else set(islice(requesters, max_fanout))
+
+    def _cycle(self, users: List[int]) -> TradeCycle:
+        # The oldest offer on each hop stands for it
+        hops = zip(users, users[1:] + users[:1])
+        return TradeCycle(users, [min(self.out_edges[a][b]) for a, b in hops])
+
+
+def _intersect(a, b) -> Iterable[int]:
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    return [x for x in small if x in large]
+
+
+class MatchEngine:
+    """Keeps a TradeGraph in step with the database.
+
+    Offers created or withdrawn through this process are applied as they
+    happen (add_offer / remove_offer). Offers created through other replicas are
+    picked up by catch_up, a keyset query for ids past the newest one loaded from
+    the database (offers applied locally don't move that mark, so other
+    replicas' offers with lower ids are still found). Withdrawals through other replicas,
+    and offers whose ids committed out of order, are caught by the full rebuild
+    every resync_every seconds, and sooner by the caller dropping offers that
+    turn out not to be pending when a match is served.
+    """
+
+    def __init__(self, load: Callable[[int], Iterable[OfferEdge]], sync_every: float = MATCH_SYNC_SECONDS,
+                 resync_every: float = MATCH_RESYNC_SECONDS):
+        # load(after_id) yields the pending offers with an id above after_id, in id order
+        self.load = load
+        self.sync_every = sync_every
+        self.resync_every = resync_every
+        self.graph = TradeGraph()
+        # Highest offer id loaded by catch_up or rebuild; only they advance it
+        self.watermark = 0
+        self._synced_at: Optional[float] = None
+        self._sync_lock = threading.Lock()
+        # Changes made while a rebuild is loading, replayed onto the new graph before it is swapped in
+        self._pending_changes: Optional[List[Tuple[bool, tuple]]] = None
+        self._changes_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_offer(self, offer_id: int, requester_id: int, owner_id: int):
+        self._apply(True, (offer_id, requester_id, owner_id))
+
+    def remove_offer(self, offer_id: int):
+        self._apply(False, (offer_id,))
+
+    def _apply(self, add: bool, args: tuple):
+        with self._changes_lock:
+            if self._pending_changes is not None:
+                self._pending_changes.append((add, args))
+            graph = self.graph
+        (graph.add_offer if add else graph.remove_offer)(*args)
+
+    def catch_up(self, force: bool = False):
+        if not force and self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_every:
+            return
+        with self._sync_lock:
+            if not force and self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_every:
+                return  # another request synced while this one waited
+            self.watermark = max(self.watermark, self.graph.add_offers(self.load(self.watermark)))
+            self._synced_at = time.monotonic()
+
+    def rebuild(self):
+        with self._changes_lock:
+            self._pending_changes = []
+        try:
+            graph = TradeGraph()
+            watermark = graph.add_offers(self.load(0))
+        except BaseException:
+            with self._changes_lock:
+                self._pending_changes = None
+            raise
+        # Under the sync lock, so a concurrent catch_up lands wholly in the old graph (and is
+        # loaded again from the lower watermark) or wholly in the new one
+        with self._sync_lock, self._changes_lock:
+            for add, args in self._pending_changes:
+                (graph.add_offer if add else graph.remove_offer)(*args)
+            self._pending_changes = None
+            # Swapped in whole, so searches never see a half-built graph
+            self.graph = graph
+            self.watermark = watermark
+            self._synced_at = time.monotonic()
+
+    def start(self):
+        """Rebuild the graph every resync_every seconds on a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trade-match-resync", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.resync_every):
+            try:
+                self.rebuild()
+            except Exception:
+                pass  # the database may be briefly unavailable; the next round tries again
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
@@ -0,0 +1,178 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Column, Float, MetaData, String, Table, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+# Per-route limits as "METHOD /path=rate:burst", comma-separated: each user may make
+# `burst` requests at once, refilled at `rate` per second. Empty disables limiting.
+RATE_LIMITS = os.getenv("RATE_LIMITS", "POST /offers=2:20,GET /offers=20:100")
+# Share of a bucket's burst a process leases from the shared table at once. Bigger
+# leases mean fewer database round trips but more tokens stranded in idle processes.
+RATE_LIMIT_LEASE = float(os.getenv("RATE_LIMIT_LEASE", "0.1"))
+# Local buckets a process keeps; the least recently used are dropped beyond this, since
+# X-User-ID is client-controlled and would otherwise grow the table without bound
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "100000"))
+# Background threads leasing tokens, each holding a database connection while it does
+RATE_LIMIT_LEASE_THREADS = int(os.getenv("RATE_LIMIT_LEASE_THREADS", "2"))
+
+metadata = MetaData()
+
+# One row per (user, route) bucket, shared by every replica. UNLOGGED on Postgres:
+# losing it in a crash only resets the limits, and it skips the WAL on every lease.
+buckets = Table(
+    "rate_limit_bucket",
+    metadata,
+    Column("key", String, primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column("updated_at", Float, nullable=False),
+)
+
+
+class Limit:
+    def __init__(self, rate: float, burst: int, lease_fraction: float = RATE_LIMIT_LEASE):
+        self.rate = rate
+        self.burst = burst
+        self.lease = max(1, int(burst * lease_fraction))
+
+
+def parse_limits(spec: str) -> Dict[str, Limit]:
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, values = entry.rpartition("=")
+        rate, burst = values.split(":")
+        limits[route.strip()] = Limit(float(rate), int(burst))
+    return limits
+
+
+class _LocalBucket:
+    __slots__ = ("tokens", "leasing", "retry_at")
+
+    def __init__(self):
+        # Negative while requests admitted on credit haven't been paid for by a lease yet
+        self.tokens = 0
+        self.leasing = False
+        # After the shared bucket came back empty, no credit until then instead of asking again
+        self.retry_at = 0.0
+
+
+class TokenBucketLimiter:
+    """Per-user, per-route token buckets enforced across every replica.
+
+    The buckets live in the shared rate_limit_bucket table, but requests don't
+    wait for it: each process leases a batch of tokens from a bucket and hands
+    them out from memory, leasing the next batch in the background when the
+    current one runs low. A request finding no local tokens (a user's first in
+    this process, or one outrunning the lease in flight) is admitted on credit
+    of up to one lease, which the next lease pays back. So a process may run
+    ahead of the shared bucket by at most one lease per bucket, and over time
+    all replicas together admit no more than the limit. Only a request arriving
+    after a 429's retry time with its credit used up waits for the database.
+    The price is that a user sending more than a lease's worth of requests to
+    one process within a single lease round trip gets 429s for the excess.
+    """
+
+    def __init__(self, engine: Engine, limits: Dict[str, Limit], max_buckets: int = RATE_LIMIT_MAX_BUCKETS):
+        self.engine = engine
+        self.limits = limits
+        self.max_buckets = max_buckets
+        self._local: "OrderedDict[str, _LocalBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._leaser = ThreadPoolExecutor(max_workers=RATE_LIMIT_LEASE_THREADS, thread_name_prefix="rate-limit-lease")
+
+    def create_table(self):
+        if self.engine.dialect.name == "postgresql":
+            with self.engine.begin() as connection:
+                connection.execute(text(
+                    "CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_bucket "
+                    "(key VARCHAR PRIMARY KEY, tokens DOUBLE PRECISION NOT NULL, updated_at DOUBLE PRECISION NOT NULL)"
+                ))
+        else:
+            metadata.create_all(self.engine)
+
+    def acquire(self, user_id: int, route: str) -> Optional[float]:
+        """Take a token for user_id on route. Returns None if allowed, else the seconds until one is available."""
+        limit = self.limits.get(route)
+        if limit is None:
+            return None
+        key = f"{user_id}:{route}"
+        with self._lock:
+            bucket = self._bucket(key)
+            now = time.time()
+            if bucket.tokens >= 1 or (bucket.tokens > -limit.lease and now >= bucket.retry_at):
+                bucket.tokens -= 1
+                if bucket.tokens < limit.lease / 2 and not bucket.leasing:
+                    bucket.leasing = True
+                    self._leaser.submit(self._refill, key, limit, bucket)
+                return None
+            if now < bucket.retry_at or bucket.leasing:
+                return max(bucket.retry_at - now, 1 / limit.rate)
+            # Credit used up and the retry time has passed: pay it back before admitting more
+            bucket.leasing = True
+
+        try:
+            granted, retry_after = self._lease(key, limit, limit.lease - bucket.tokens)
+        except Exception:
+            granted, retry_after = 0, 1 / limit.rate
+        with self._lock:
+            bucket.leasing = False
+            bucket.tokens += granted
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return None
+            bucket.retry_at = time.time() + retry_after
+            return retry_after
+
+    def _bucket(self, key: str) -> _LocalBucket:
+        bucket = self._local.get(key)
+        if bucket is None:
+            bucket = self._local[key] = _LocalBucket()
+            if len(self._local) > self.max_buckets:
+                # A dropped bucket's unspent tokens or credit are simply forgotten
+                self._local.popitem(last=False)
+        else:
+            self._local.move_to_end(key)
+        return bucket
+
+    def _refill(self, key: str, limit: Limit, bucket: _LocalBucket):
+        try:
+            granted, retry_after = self._lease(key, limit, limit.lease - min(0, bucket.tokens))
+        except Exception:
+            granted, retry_after = 0, 1 / limit.rate  # the next request to run low will try again
+        with self._lock:
+            bucket.tokens += granted
+            if bucket.tokens < 1:
+                bucket.retry_at = time.time() + retry_after
+            bucket.leasing = False
+
+    def _lease(self, key: str, limit: Limit, wanted: int) -> Tuple[int, float]:
+        """Move up to wanted tokens out of the shared bucket.
+
+        Returns (granted, seconds until the bucket holds wanted tokens again).
+        """
+        wanted = min(wanted, limit.burst)
+        now = time.time()
+        dialect = postgresql if self.engine.dialect.name == "postgresql" else sqlite
+        with self.engine.begin() as connection:
+            connection.execute(
+                dialect.insert(buckets).values(key=key, tokens=limit.burst, updated_at=now).on_conflict_do_nothing()
+            )
+            # Row lock on Postgres; SQLite serializes writers on its own
+            row = connection.execute(select(buckets).where(buckets.c.key == key).with_for_update()).one()
+            tokens = min(limit.burst, row.tokens + max(0.0, now - row.updated_at) * limit.rate)
+            granted = min(wanted, int(tokens))
+            connection.execute(
+                update(buckets).where(buckets.c.key == key).values(tokens=tokens - granted, updated_at=now)
+            )
+        retry_after = max(0.0, wanted - (tokens - granted)) / limit.rate
+        return granted, retry_after
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
@@ -0,0 +1,157 @@
+"""Replay captured traffic against a target and compare latencies.
+
+Reads JSONL captures written by traffic_capture.CaptureMiddleware (rotated
+files included, in timestamp order) and sends every request to --target,
+keeping the original gaps between requests divided by --speed (0 sends as fast
+as --concurrency allows). Prints original vs replayed latency percentiles per
+endpoint, plus any requests whose status changed. Requests whose body was cut
+off at CAPTURE_MAX_BODY are skipped, since replaying part of a body sends a
+different, usually malformed, request.
+
+    python replay.py captures/requests-*.jsonl* --target http://localhost:8080 --speed 2 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from traffic_capture import decode_body
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class ReplayResult:
+    def __init__(self, record: dict, status: Optional[int], duration_ms: float, error: Optional[str] = None):
+        self.record = record
+        self.status = status
+        self.duration_ms = duration_ms
+        self.error = error
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.record['method']} {_ID_SEGMENT.sub('/{id}', self.record['path'])}"
+
+
+def load_records(paths: Iterable[str]) -> List[dict]:
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+def complete_records(records: List[dict]) -> List[dict]:
+    """The records whose whole body was captured."""
+    return [record for record in records if not record.get("body_truncated")]
+
+
+async def replay(records: List[dict], client: httpx.AsyncClient, speed: float = 1.0,
+                 concurrency: int = 50) -> List[ReplayResult]:
+    """Send each record through client, on the original schedule scaled by speed.
+
+    concurrency workers take the records in order, so only that many requests
+    exist at a time however large the capture is.
+    """
+    if not records:
+        return []
+    first_ts = records[0]["ts"]
+    started = time.perf_counter()
+    results: List[Optional[ReplayResult]] = [None] * len(records)
+    pending = iter(enumerate(records))
+
+    async def send(record: dict) -> ReplayResult:
+        if speed > 0:
+            delay = (record["ts"] - first_ts) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        url = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+        start = time.perf_counter()
+        try:
+            response = await client.request(
+                record["method"], url, headers=record.get("headers", {}), content=decode_body(record)
+            )
+            return ReplayResult(record, response.status_code, (time.perf_counter() - start) * 1000)
+        except httpx.HTTPError as error:
+            return ReplayResult(record, None, (time.perf_counter() - start) * 1000, repr(error))
+
+    async def worker():
+        # Workers share one iterator, and nothing awaits between next() and the assignment
+        for index, record in pending:
+            results[index] = await send(record)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(records))))))
+    return results
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q * 100) - 1]
+
+
+def summarize(results: List[ReplayResult]) -> str:
+    by_endpoint: Dict[str, List[ReplayResult]] = defaultdict(list)
+    for result in results:
+        by_endpoint[result.endpoint].append(result)
+
+    lines = [
+        f"{'endpoint':32s} {'count':>6s} {'orig p50':>9s} {'new p50':>9s} {'orig p99':>9s} {'new p99':>9s} {'Δ p50':>8s}"
+    ]
+    for endpoint, group in sorted(by_endpoint.items(), key=lambda item: -len(item[1])):
+        original = [r.record["duration_ms"] for r in group if r.record.get("duration_ms") is not None]
+        replayed = [r.duration_ms for r in group if r.error is None]
+        if not original or not replayed:
+            lines.append(f"{endpoint:32s} {len(group):6d}  (no latencies to compare)")
+            continue
+        orig_p50, new_p50 = _percentile(original, 0.5), _percentile(replayed, 0.5)
+        lines.append(
+            f"{endpoint:32s} {len(group):6d} {orig_p50:8.1f}ms {new_p50:8.1f}ms"
+            f" {_percentile(original, 0.99):8.1f}ms {_percentile(replayed, 0.99):8.1f}ms {new_p50 - orig_p50:+7.1f}ms"
+        )
+
+    changed = [r for r in results if r.status != r.record.get("status")]
+    errors = [r for r in results if r.error is not None]
+    lines.append(f"{len(results)} requests replayed, {len(changed)} with a different status, {len(errors)} errors")
+    for result in changed[:20]:
+        lines.append(
+            f"  {result.record['method']} {result.record['path']}: {result.record.get('status')} -> "
+            f"{result.status if result.error is None else result.error}"
+        )
+    return "\n".join(lines)
+
+
+async def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("captures", nargs="+", help="JSONL capture files")
+    parser.add_argument("--target", required=True, help="Base URL to replay against")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed multiplier; 1 keeps the original timing, 0 replays as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=50, help="Maximum requests in flight")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    args = parser.parse_args(argv)
+
+    loaded = load_records(args.captures)[:args.limit]
+    records = complete_records(loaded)
+    if len(records) < len(loaded):
+        print(f"Skipping {len(loaded) - len(records)} requests whose body was truncated in the capture")
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.target, timeout=args.timeout, limits=limits) as client:
+        results = await replay(records, client, speed=args.speed, concurrency=args.concurrency)
+    print(summarize(results))
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
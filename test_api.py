@@ -0,0 +1,160 @@
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_get_user_supports_conditional_requests():
+    with TestClient(main.app) as client:
+        user_id = client.post("/users", json={
+            "name": "Abbey", "email": "abbey@example.com", "password": "pass123", "address": "123 Street"
+        }).json()["id"]
+
+        first = client.get(f"/users/{user_id}")
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "private, no-cache"
+
+        not_modified = client.get(f"/users/{user_id}", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+        client.delete(f"/users/{user_id}")
+        assert client.get(f"/users/{user_id}", headers={"If-None-Match": etag}).status_code == 404
+
+
+def create_user(client, name):
+    return client.post("/users", json={
+        "name": name, "email": f"{name.lower()}@example.com", "password": "pass123", "address": "123 Street"
+    }).json()["id"]
+
+
+def test_list_endpoints_use_keyset_pagination():
+    with TestClient(main.app) as client:
+        owner_id = create_user(client, "Pager")
+        ids = [
+            client.post("/games", json={"title": f"Paged {i}", "platform": "NES", "owner_id": owner_id}).json()["id"]
+            for i in range(5)
+        ]
+
+        first = client.get("/games/search", params={"owner_id": owner_id, "limit": 2}).json()
+        second = client.get("/games/search", params={"owner_id": owner_id, "limit": 2, "after_id": first[-1]["id"]}).json()
+        assert [game["id"] for game in first + second] == ids[:4]
+
+        assert client.get("/games", params={"after_id": ids[2], "limit": 1000}).json()[0]["id"] == ids[3]
+        assert client.get("/games", params={"limit": 0}).status_code == 422
+        assert client.get("/games", params={"limit": main.PAGE_SIZE_MAX + 1}).status_code == 422
+
+
+def test_offers_can_be_filtered_by_status(monkeypatch):
+    with TestClient(main.app) as client:
+        owner_id = create_user(client, "Owner")
+        requester_id = create_user(client, "Requester")
+        wanted = client.post("/games", json={"title": "Wanted", "platform": "SNES", "owner_id": owner_id}).json()["id"]
+        offered = [
+            client.post("/games", json={"title": f"Offered {i}", "platform": "SNES", "owner_id": requester_id}).json()["id"]
+            for i in range(2)
+        ]
+        offer_ids = [
+            client.post(
+                "/offers",
+                json={"offered_game_id": game_id, "requested_game_id": wanted},
+                headers={"X-User-ID": str(requester_id)},
+            ).json()["id"]
+            for game_id in offered
+        ]
+        monkeypatch.setattr(main, "send_email_notification", lambda message: None)
+        client.put(f"/offers/{offer_ids[0]}", params={"status": "accepted"}, headers={"X-User-ID": str(owner_id)})
+
+        pending = client.get("/offers", params={"status": "pending"}, headers={"X-User-ID": str(owner_id)}).json()
+        assert [offer["id"] for offer in pending] == offer_ids[1:]
+
+
+def test_game_writes_refresh_the_edge_cache(monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(main, "NGINX_CACHE_URL", "http://nginx:81")
+    monkeypatch.setattr(main, "refresh_edge_cache", lambda paths: refreshed.append(paths))
+
+    with TestClient(main.app) as client:
+        owner_id = create_user(client, "Edge")
+        game_id = client.post("/games", json={"title": "Metroid", "platform": "NES", "owner_id": owner_id}).json()["id"]
+        assert refreshed.pop() == [f"/games/{game_id}", "/games", "/games/browse"]
+
+        client.put(f"/games/{game_id}", json={"title": "Super Metroid", "platform": "SNES", "owner_id": owner_id})
+        assert refreshed.pop() == [f"/games/{game_id}", "/games", "/games/browse"]
+
+        client.delete(f"/games/{game_id}")
+        assert refreshed.pop() == [f"/games/{game_id}", "/games", "/games/browse"]
+
+        monkeypatch.setattr(main, "NGINX_CACHE_URL", "")
+        client.post("/games", json={"title": "Zelda", "platform": "NES", "owner_id": owner_id})
+        assert refreshed == []
+
+
+def test_games_filter_by_platform_and_owner_with_facets():
+    with TestClient(main.app) as client:
+        seller = create_user(client, "Facets")
+        other = create_user(client, "Elsewhere")
+        library = [("Zelda", "NES"), ("Metroid", "NES"), ("F-Zero", "SNES"), ("Mario 64", "N64")]
+        ids = [
+            client.post("/games", json={"title": title, "platform": platform, "owner_id": seller}).json()["id"]
+            for title, platform in library
+        ]
+        client.post("/games", json={"title": "Zelda II", "platform": "NES", "owner_id": other})
+
+        snes_or_n64 = client.get("/games", params={"owner_id": seller, "platform": ["SNES", "N64"]}).json()
+        assert [game["id"] for game in snes_or_n64] == ids[2:]
+
+        browse = client.get("/games/browse", params={"owner_id": seller, "platform": "NES", "limit": 1})
+        page = browse.json()
+        assert [game["id"] for game in page["items"]] == ids[:1]
+        assert page["platform_counts"] == {"NES": 2, "SNES": 1, "N64": 1}
+        assert page["total"] == 2
+
+        zelda = client.get("/games/browse", params={"owner_id": seller, "title": "zelda"}).json()
+        assert zelda["platform_counts"] == {"NES": 1} and zelda["total"] == 1
+        assert client.get("/games/search", params={"title": "Zelda", "platform": "NES", "owner_id": other}).json()[0][
+            "title"
+        ] == "Zelda II"
+
+
+def test_game_platform_title_index_exists():
+    from sqlalchemy import inspect
+
+    with TestClient(main.app):
+        indexes = {index["name"]: index["column_names"] for index in inspect(main.engine).get_indexes("game")}
+    assert indexes["ix_game_platform_title"] == ["platform", "title"]
+
+
+def test_matches_find_trade_cycles_and_drop_withdrawn_offers(monkeypatch):
+    monkeypatch.setattr(main, "send_email_notification", lambda message: None)
+    with TestClient(main.app) as client:
+        users = [create_user(client, name) for name in ("Ann", "Bob", "Cat")]
+        games = [
+            client.post("/games", json={"title": f"Game {i}", "platform": "NES", "owner_id": user_id}).json()["id"]
+            for i, user_id in enumerate(users)
+        ]
+        # Ann wants Bob's game, Bob wants Cat's, Cat wants Ann's
+        offers = [
+            client.post(
+                "/offers",
+                json={"offered_game_id": games[i], "requested_game_id": games[(i + 1) % 3]},
+                headers={"X-User-ID": str(users[i])},
+            ).json()["id"]
+            for i in range(3)
+        ]
+
+        matches = client.get("/matches", headers={"X-User-ID": str(users[0])}).json()
+        assert matches == [{"users": users, "offer_ids": offers}]
+        assert client.get("/matches", params={"max_length": 2}, headers={"X-User-ID": str(users[0])}).json() == []
+        assert client.get("/matches").status_code == 401
+
+        client.put(f"/offers/{offers[2]}", params={"status": "rejected"}, headers={"X-User-ID": str(users[2])})
+        assert client.get("/matches", headers={"X-User-ID": str(users[1])}).json() == []
+
+        # Withdrawn behind this process's back, as through another replica
+        client.put(f"/offers/{offers[2]}", params={"status": "pending"}, headers={"X-User-ID": str(users[2])})
+        assert len(client.get("/matches", headers={"X-User-ID": str(users[1])}).json()) == 1
+        with main.Session(main.engine) as session:
+            session.get(main.TradeOffer, offers[0]).status = "rejected"
+            session.commit()
+        assert client.get("/matches", headers={"X-User-ID": str(users[1])}).json() == []
+        assert offers[0] not in main.match_engine.graph.offers
@@ -0,0 +1,167 @@
+import asyncio
+import collections
+import threading
+
+import httpx
+import pytest
+
+from app.video_game_exchange_api_client import Client
+from app.video_game_exchange_api_client.api.default import get_games_game_id
+from app.video_game_exchange_api_client.balancer import Balancer
+from app.video_game_exchange_api_client.resilience import RetryPolicy
+
+REPLICAS = ["http://api1:8000", "http://api2:8000", "http://api3:8000"]
+
+
+def game(request):
+    return httpx.Response(200, json={"id": 1, "name": request.url.host})
+
+
+def test_requests_are_spread_over_every_replica():
+    hosts = collections.Counter()
+
+    def handler(request):
+        assert request.headers["Host"] == f"{request.url.host}:8000"
+        hosts[request.url.host] += 1
+        return game(request)
+
+    balancer = Balancer(REPLICAS, health_interval=None)
+    client = Client(base_url="http://api", balancer=balancer, httpx_args={"transport": httpx.MockTransport(handler)})
+
+    for _ in range(300):
+        assert get_games_game_id.sync(1, client=client).name.startswith("api")
+
+    assert set(hosts) == {"api1", "api2", "api3"}
+    assert min(hosts.values()) > 50
+    assert all(stats["outstanding"] == 0 for stats in balancer.stats().values())
+
+
+@pytest.mark.parametrize("strategy", ["least_outstanding", "p2c"])
+def test_in_flight_requests_stay_even(strategy):
+    in_flight = collections.Counter()
+    peak = collections.Counter()
+
+    async def handler(request):
+        in_flight[request.url.host] += 1
+        peak[request.url.host] = max(peak[request.url.host], in_flight[request.url.host])
+        await asyncio.sleep(0.02)
+        in_flight[request.url.host] -= 1
+        return game(request)
+
+    async def fan_out():
+        balancer = Balancer(REPLICAS, strategy=strategy, health_interval=None)
+        client = Client(base_url="http://api", balancer=balancer, httpx_args={"transport": httpx.MockTransport(handler)})
+        async with client:
+            await asyncio.gather(*(get_games_game_id.asyncio(1, client=client) for _ in range(30)))
+
+    asyncio.run(fan_out())
+
+    if strategy == "least_outstanding":
+        assert dict(peak) == {"api1": 10, "api2": 10, "api3": 10}
+    else:
+        assert max(peak.values()) <= 14
+
+
+def test_failing_replicas_are_ejected_and_retried_elsewhere(monkeypatch):
+    monkeypatch.setattr("app.video_game_exchange_api_client.resilience.time.sleep", lambda seconds: None)
+    hosts = collections.Counter()
+
+    def handler(request):
+        hosts[request.url.host] += 1
+        if request.url.host == "api2":
+            raise httpx.ConnectError("connection refused", request=request)
+        return game(request)
+
+    balancer = Balancer(REPLICAS, strategy="least_outstanding", eject_after=2, health_interval=None)
+    client = Client(
+        base_url="http://api",
+        balancer=balancer,
+        retry=RetryPolicy(max_attempts=3),
+        httpx_args={"transport": httpx.MockTransport(handler)},
+    )
+
+    names = [get_games_game_id.sync(1, client=client).name for _ in range(60)]
+
+    assert "api2" not in names
+    assert hosts["api2"] == 2
+    assert balancer.stats()["http://api2:8000"]["ejected"]
+
+
+def test_health_checks_take_replicas_out_of_rotation_until_they_recover():
+    down = {"api3"}
+
+    def health(request):
+        assert request.url.path == "/whoami"
+        return httpx.Response(503 if request.url.host in down else 200, json={"container_name": request.url.host})
+
+    balancer = Balancer(REPLICAS, health_interval=None, health_transport=httpx.MockTransport(health))
+
+    balancer.check_health()
+    chosen = set()
+    for _ in range(100):
+        endpoint = balancer.choose()
+        chosen.add(endpoint.url.host)
+        balancer.release(endpoint)
+    assert chosen == {"api1", "api2"}
+
+    down.clear()
+    balancer.check_health()
+    assert all(stats["healthy"] for stats in balancer.stats().values())
+
+
+def test_background_health_checks_run_on_first_use():
+    probed = threading.Event()
+
+    def health(request):
+        probed.set()
+        return httpx.Response(503)
+
+    balancer = Balancer(REPLICAS, health_interval=0.01, health_transport=httpx.MockTransport(health))
+    client = Client(base_url="http://api", balancer=balancer, httpx_args={"transport": httpx.MockTransport(game)})
+    try:
+        get_games_game_id.sync(1, client=client)
+        assert probed.wait(2)
+    finally:
+        balancer.close()
+
+
+def test_every_replica_down_still_sends_requests():
+    balancer = Balancer(REPLICAS, health_interval=None, health_transport=httpx.MockTransport(lambda r: httpx.Response(503)))
+    balancer.check_health()
+
+    endpoint = balancer.choose()
+
+    assert endpoint.url.host in {"api1", "api2", "api3"}
+
+
+class ClosableTransport(httpx.MockTransport):
+    def __init__(self, handler):
+        super().__init__(handler)
+        self.closed = False
+
+    def handle_request(self, request):
+        assert not self.closed, "request sent on a closed transport"
+        return super().handle_request(request)
+
+    def close(self):
+        self.closed = True
+
+
+def test_health_checks_leave_a_caller_transport_open_and_stop_with_the_client():
+    rounds = threading.Semaphore(0)
+
+    def health(request):
+        rounds.release()
+        return httpx.Response(200)
+
+    health_transport = ClosableTransport(health)
+    balancer = Balancer(REPLICAS, health_interval=0.01, health_transport=health_transport)
+    client = Client(base_url="http://api", balancer=balancer, httpx_args={"transport": httpx.MockTransport(game)})
+    with client:
+        get_games_game_id.sync(1, client=client)
+        # Several rounds, all on the same still-open transport
+        for _ in range(3 * len(REPLICAS)):
+            assert rounds.acquire(timeout=2)
+
+    assert not any(thread.name == "video-game-exchange-health" for thread in threading.enumerate())
+    assert not health_transport.closed
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import httpx
+
+from app.video_game_exchange_api_client import Client
+from app.video_game_exchange_api_client.api.default import get_games_game_id, post_games
+from app.video_game_exchange_api_client.batch import create_many, get_many, sync_create_many, sync_get_many
+from app.video_game_exchange_api_client.models import GameCreate, GameCreateCondition
+
+
+class ConcurrencyProbe:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def exit(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+def game_response(request: httpx.Request) -> httpx.Response:
+    game_id = int(request.url.path.rsplit("/", 1)[1])
+    if game_id == 13:
+        raise httpx.ConnectError("connection refused", request=request)
+    if game_id == 404:
+        return httpx.Response(404)
+    return httpx.Response(200, json={"id": game_id, "name": f"Game {game_id}"})
+
+
+def test_get_many_preserves_order_bounds_concurrency_and_collects_errors():
+    probe = ConcurrencyProbe()
+
+    async def handler(request):
+        probe.enter()
+        await asyncio.sleep(0.01)
+        probe.exit()
+        return game_response(request)
+
+    async def fetch():
+        client = Client(base_url="http://test")
+        client.set_async_httpx_client(httpx.AsyncClient(base_url="http://test", transport=httpx.MockTransport(handler)))
+        async with client:
+            return await get_many([5, 13, 3, 404, *range(100, 120)], client=client, endpoint=get_games_game_id, concurrency=4)
+
+    results = asyncio.run(fetch())
+
+    assert [result.item for result in results[:4]] == [5, 13, 3, 404]
+    assert results[0].ok and results[0].parsed.id == 5
+    assert isinstance(results[1].error, httpx.ConnectError)
+    assert results[2].parsed.name == "Game 3"
+    assert not results[3].ok and results[3].response.status_code == 404
+    assert probe.peak == 4
+
+
+def test_sync_get_many_uses_a_thread_pool():
+    probe = ConcurrencyProbe()
+
+    def handler(request):
+        probe.enter()
+        threading.Event().wait(0.01)
+        probe.exit()
+        return game_response(request)
+
+    client = Client(base_url="http://test")
+    client.set_httpx_client(httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler)))
+
+    results = sync_get_many(range(20, 40), client=client, endpoint=get_games_game_id, concurrency=3)
+
+    assert [result.parsed.id for result in results] == list(range(20, 40))
+    assert probe.peak == 3
+
+
+def test_create_many_sends_each_body():
+    bodies = [
+        GameCreate(name=f"Game {i}", publisher="Nintendo", year=1990, system="NES", condition=GameCreateCondition.GOOD)
+        for i in range(5)
+    ]
+
+    def handler(request):
+        return httpx.Response(201, content=request.content)
+
+    client = Client(base_url="http://test")
+    client.set_httpx_client(httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler)))
+    sync_results = sync_create_many(bodies, client=client, endpoint=post_games, concurrency=2)
+
+    async def create():
+        client.set_async_httpx_client(httpx.AsyncClient(base_url="http://test", transport=httpx.MockTransport(handler)))
+        return await create_many(bodies, client=client, endpoint=post_games, concurrency=2)
+
+    async_results = asyncio.run(create())
+
+    for results in (sync_results, async_results):
+        assert [result.parsed.name for result in results] == [f"Game {i}" for i in range(5)]
+
+
+def test_unexpected_status_is_collected_as_the_error():
+    from app.video_game_exchange_api_client import errors
+
+    def handler(request):
+        return httpx.Response(500, text="boom") if request.url.path.endswith("/2") else game_response(request)
+
+    async def fetch():
+        client = Client(base_url="http://test", raise_on_unexpected_status=True)
+        client.set_async_httpx_client(httpx.AsyncClient(base_url="http://test", transport=httpx.MockTransport(handler)))
+        async with client:
+            return await get_many([1, 2], client=client, endpoint=get_games_game_id)
+
+    sync_client = Client(base_url="http://test", raise_on_unexpected_status=True)
+    sync_client.set_httpx_client(httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler)))
+    with sync_client:
+        sync_results = sync_get_many([1, 2], client=sync_client, endpoint=get_games_game_id)
+
+    for results in (asyncio.run(fetch()), sync_results):
+        assert results[0].ok and results[0].parsed.id == 1
+        assert isinstance(results[1].error, errors.UnexpectedStatus) and results[1].error.status_code == 500
+        assert not results[1].ok and results[1].parsed is None
@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+
+from app.video_game_exchange_api_client import Client
+from app.video_game_exchange_api_client.api.default import get_users_user_id, put_users_user_id
+from app.video_game_exchange_api_client.cache import ResponseCache
+from app.video_game_exchange_api_client.models import UserUpdate
+
+
+class UserServer:
+    """Serves /users/{id} with an ETag, counting full downloads and 304s"""
+
+    def __init__(self, cache_control="private, no-cache"):
+        self.cache_control = cache_control
+        self.version = 1
+        self.bodies = 0
+        self.not_modified = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "PUT":
+            self.version += 1
+            return httpx.Response(200)
+        etag = f'"v{self.version}"'
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return httpx.Response(304, headers=headers)
+        self.bodies += 1
+        return httpx.Response(200, headers=headers, json={"id": 1, "username": f"abbey-v{self.version}"})
+
+
+def make_client(server, cache):
+    return Client(base_url="http://test", cache=cache, httpx_args={"transport": httpx.MockTransport(server)})
+
+
+def test_revalidates_with_etag_and_reuses_the_parsed_user():
+    server = UserServer()
+    cache = ResponseCache()
+    client = make_client(server, cache)
+
+    first = get_users_user_id.sync(1, client=client)
+    second = get_users_user_id.sync(1, client=client)
+
+    assert server.bodies == 1 and server.not_modified == 1
+    assert second is first
+    assert cache.stats.revalidations == 1
+    assert cache.stats.parse_hits == 1
+
+
+def test_fresh_entries_skip_the_network():
+    server = UserServer(cache_control="private, max-age=60")
+    cache = ResponseCache()
+    client = make_client(server, cache)
+
+    async def read_twice():
+        async with client:
+            return [await get_users_user_id.asyncio(1, client=client) for _ in range(2)]
+
+    first, second = asyncio.run(read_twice())
+
+    assert server.bodies == 1 and server.not_modified == 0
+    assert second is first
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_writes_invalidate_the_cached_url():
+    server = UserServer(cache_control="private, max-age=60")
+    client = make_client(server, ResponseCache())
+
+    assert get_users_user_id.sync(1, client=client).username == "abbey-v1"
+    put_users_user_id.sync_detailed(1, client=client, body=UserUpdate(username="x", email="x@example.com", address="y"))
+
+    assert get_users_user_id.sync(1, client=client).username == "abbey-v2"
+
+
+def test_disk_store_survives_a_new_cache(tmp_path):
+    server = UserServer()
+    get_users_user_id.sync(1, client=make_client(server, ResponseCache(directory=tmp_path)))
+
+    reopened = ResponseCache(directory=tmp_path)
+    user = get_users_user_id.sync(1, client=make_client(server, reopened))
+
+    assert user.username == "abbey-v1"
+    assert server.bodies == 1
+    assert reopened.stats.revalidations == 1
+
+
+def test_lru_evicts_the_oldest_entry():
+    server = UserServer(cache_control="max-age=60")
+    cache = ResponseCache(max_entries=2)
+    client = make_client(server, cache)
+
+    for path in ("/users/1", "/users/2", "/users/1", "/users/3"):
+        client.get_httpx_client().get(path)
+
+    assert cache.get("http://test/users/1") is not None
+    assert cache.get("http://test/users/2") is None
+    assert cache.stats.evictions == 1
+
+
+def test_a_304_without_cache_control_keeps_the_stored_lifetime():
+    cache = ResponseCache()
+    request = httpx.Request("GET", "http://test/users/1")
+    fetched = httpx.Response(200, headers={"ETag": '"v1"', "Cache-Control": "max-age=60"}, json={"id": 1})
+    fetched.read()
+    cache.complete(request, None, fetched)
+    entry = cache.get(str(request.url))
+    entry.stored_at -= 120
+
+    stale, served = cache.lookup(request)
+    assert stale is entry and served is None
+    cache.complete(request, stale, httpx.Response(304, headers={"ETag": '"v1"'}))
+
+    assert entry.max_age == 60 and entry.is_fresh(entry.stored_at + 1)
+    assert (cache.stats.stores, cache.stats.revalidations) == (1, 1)
@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.video_game_exchange_api_client import Client
+from app.video_game_exchange_api_client.api.default import get_games_game_id, get_offers, post_games
+from app.video_game_exchange_api_client.coalesce import RequestCoalescer
+from app.video_game_exchange_api_client.models import GameCreate, GameCreateCondition
+
+
+class SlowServer:
+    def __init__(self, status=200):
+        self.status = status
+        self.calls = []
+
+    async def __call__(self, request):
+        self.calls.append(request)
+        await asyncio.sleep(0.02)
+        if request.method == "POST":
+            return httpx.Response(201, content=request.content)
+        if request.url.path == "/offers":
+            return httpx.Response(200, json=[{"id": int(request.headers["X-User-ID"])}])
+        return httpx.Response(self.status, json={"id": int(request.url.path.rsplit("/", 1)[1]), "name": "Game"})
+
+
+def run(server, coroutine_factory, coalescer=None):
+    async def go():
+        client = Client(
+            base_url="http://test", coalescer=coalescer, httpx_args={"transport": httpx.MockTransport(server)}
+        )
+        async with client:
+            return await coroutine_factory(client)
+
+    return asyncio.run(go())
+
+
+def test_identical_concurrent_gets_share_one_request_and_one_parsed_model():
+    server = SlowServer()
+    coalescer = RequestCoalescer()
+
+    games = run(
+        server,
+        lambda client: asyncio.gather(
+            *(get_games_game_id.asyncio(1, client=client) for _ in range(10)),
+            get_games_game_id.asyncio(2, client=client),
+        ),
+        coalescer,
+    )
+
+    assert len(server.calls) == 2
+    assert all(game is games[0] for game in games[:10])
+    assert games[10].id == 2
+    assert (coalescer.stats.requests, coalescer.stats.sent, coalescer.stats.suppressed) == (11, 2, 9)
+    assert coalescer.stats.parse_hits == 9
+
+
+def test_requests_with_different_headers_are_not_merged():
+    server = SlowServer()
+
+    offers = run(
+        server,
+        lambda client: asyncio.gather(*(get_offers.asyncio(client=client, x_user_id=user) for user in (1, 2, 1))),
+        RequestCoalescer(),
+    )
+
+    assert len(server.calls) == 2
+    assert [page[0].id for page in offers] == [1, 2, 1]
+
+
+def test_writes_and_sequential_requests_are_never_merged():
+    server = SlowServer()
+    coalescer = RequestCoalescer()
+    body = GameCreate(name="Game", publisher="Sega", year=1991, system="Genesis", condition=GameCreateCondition.GOOD)
+
+    async def calls(client):
+        await asyncio.gather(*(post_games.asyncio(client=client, body=body) for _ in range(3)))
+        await get_games_game_id.asyncio(1, client=client)
+        await get_games_game_id.asyncio(1, client=client)
+
+    run(server, calls, coalescer)
+
+    assert len(server.calls) == 5
+    assert coalescer.stats.suppressed == 0
+
+
+def test_errors_reach_every_waiter():
+    async def failing(request):
+        await asyncio.sleep(0.01)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def calls(client):
+        return await asyncio.gather(
+            *(get_games_game_id.asyncio(1, client=client) for _ in range(3)), return_exceptions=True
+        )
+
+    results = run(failing, calls, RequestCoalescer())
+
+    assert all(isinstance(result, httpx.ConnectError) for result in results)
+
+
+def test_a_cancelled_waiter_does_not_cancel_the_others():
+    server = SlowServer()
+
+    async def calls(client):
+        first = asyncio.ensure_future(get_games_game_id.asyncio(1, client=client))
+        second = asyncio.ensure_future(get_games_game_id.asyncio(1, client=client))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    game = run(server, calls, RequestCoalescer())
+
+    assert game.id == 1
+    assert len(server.calls) == 1
+
+
+def test_without_a_coalescer_every_request_is_sent():
+    server = SlowServer()
+
+    run(server, lambda client: asyncio.gather(*(get_games_game_id.asyncio(1, client=client) for _ in range(3))))
+
+    assert len(server.calls) == 3
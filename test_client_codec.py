@@ -0,0 +1,66 @@
+import json
+
+import httpx
+import pytest
+
+from app.video_game_exchange_api_client import Client
+from app.video_game_exchange_api_client.api.default import get_games, post_games
+from app.video_game_exchange_api_client.codec import OrjsonCodec, StdlibCodec, get_codec
+from app.video_game_exchange_api_client.models import GameCreate, GameCreateCondition
+
+
+class RecordingCodec(StdlibCodec):
+    name = "recording"
+
+    def __init__(self):
+        self.calls = []
+
+    def dumps(self, obj):
+        self.calls.append("dumps")
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.calls.append("loads")
+        return super().loads(data)
+
+
+def test_auto_prefers_an_installed_fast_codec():
+    pytest.importorskip("orjson")
+
+    assert get_codec().name == "orjson"
+    assert Client(base_url="http://test").codec.name == "orjson"
+    assert Client(base_url="http://test", codec="json").codec.name == "json"
+
+
+def test_unknown_codec_names_are_rejected():
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+def test_codecs_agree_with_the_stdlib():
+    pytest.importorskip("orjson")
+    payload = {"name": "Pokémon Red", "year": 1996, "tags": ["rpg", None], "score": 9.5}
+
+    for codec in (StdlibCodec(), OrjsonCodec()):
+        assert json.loads(codec.dumps(payload)) == payload
+        assert codec.loads(json.dumps(payload).encode()) == payload
+
+
+def test_client_codec_encodes_bodies_and_decodes_responses():
+    codec = RecordingCodec()
+
+    def handler(request):
+        if request.method == "POST":
+            assert request.headers["Content-Type"] == "application/json"
+            return httpx.Response(201, content=request.content)
+        return httpx.Response(200, json=[{"id": 1, "name": "Chrono Trigger"}])
+
+    client = Client(base_url="http://test", codec=codec, httpx_args={"transport": httpx.MockTransport(handler)})
+    body = GameCreate(name="Chrono Trigger", publisher="Square", year=1995, system="SNES", condition=GameCreateCondition.MINT)
+
+    created = post_games.sync(client=client, body=body)
+    games = get_games.sync(client=client)
+
+    assert created.condition == "mint"
+    assert games[0].name == "Chrono Trigger"
+    assert codec.calls == ["dumps", "loads", "loads"]
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app")
+PACKAGE = "video_game_exchange_api_client"
+
+# Budgets for the client's own modules, in milliseconds. Third-party imports (httpx, attrs) are excluded so the
+# test measures what this package controls; raise the budgets on very slow CI machines.
+PACKAGE_BUDGET_MS = float(os.getenv("CLIENT_IMPORT_BUDGET_MS", "25"))
+ENDPOINT_BUDGET_MS = float(os.getenv("CLIENT_ENDPOINT_IMPORT_BUDGET_MS", "60"))
+
+
+def run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR,
+        env={**os.environ, "PYTHONPATH": APP_DIR},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def own_import_ms(stderr: str) -> float:
+    """The summed self time of this package's modules in ``python -X importtime`` output"""
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if name.split(".")[0] == PACKAGE and self_us.isdigit():
+            total_us += int(self_us)
+    return total_us / 1000
+
+
+def best_of(code: str, runs: int = 3) -> float:
+    return min(own_import_ms(run(code).stderr) for _ in range(runs))
+
+
+def test_importing_the_package_loads_nothing_else():
+    loaded = run(
+        f"import sys, {PACKAGE}; print(sorted(m for m in sys.modules if m.startswith(('{PACKAGE}.', 'httpx', 'attr'))))"
+    ).stdout
+
+    assert loaded.strip() == "[]"
+
+
+def test_an_endpoint_module_loads_only_the_models_it_uses():
+    loaded = run(
+        f"import sys, {PACKAGE}.api.default.get_games_game_id; "
+        f"print(sorted(m for m in sys.modules if m.startswith('{PACKAGE}.models.')))"
+    ).stdout
+
+    assert loaded.strip() == f"['{PACKAGE}.models.game']"
+
+
+def test_lazy_attributes_still_resolve():
+    code = (
+        f"from {PACKAGE} import Client; from {PACKAGE}.models import TradeOfferStatus; "
+        f"from {PACKAGE}.api import default; print(Client.__name__, TradeOfferStatus.PENDING, default.get_games.__name__)"
+    )
+    assert run(code).stdout.split() == ["Client", "pending", f"{PACKAGE}.api.default.get_games"]
+
+
+@pytest.mark.parametrize(
+    "module, budget_ms",
+    [(PACKAGE, PACKAGE_BUDGET_MS), (f"{PACKAGE}.api.default.get_games_game_id", ENDPOINT_BUDGET_MS)],
+)
+def test_import_time_budget(module, budget_ms):
+    assert best_of(f"import {module}") <= budget_ms
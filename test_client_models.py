@@ -0,0 +1,46 @@
+import attrs
+import pytest
+
+from app.video_game_exchange_api_client.models import Game, GameCreate, GameCreateCondition, TradeMatch, User
+
+
+def test_from_dict_leaves_the_input_alone_and_keeps_unknown_keys():
+    src = {"id": 1, "name": "Chrono Trigger", "previousOwners": 2, "links": {"self": "/games/1"}}
+
+    game = Game.from_dict(src)
+
+    assert game.previous_owners == 2
+    assert game.additional_properties == {"links": {"self": "/games/1"}}
+    assert src == {"id": 1, "name": "Chrono Trigger", "previousOwners": 2, "links": {"self": "/games/1"}}
+    assert game.to_dict() == src
+
+
+def test_from_dict_without_unknown_keys_has_no_additional_properties():
+    user = User.from_dict({"id": 3, "username": "crono"})
+
+    assert user.additional_properties == {}
+    user["nickname"] = "Crono"
+    assert User.from_dict({"id": 4}).additional_properties == {}
+
+
+def test_from_list_decodes_every_item():
+    games = GameCreate.from_list(
+        [
+            {"name": f"Game {i}", "publisher": "Square", "year": 1995, "system": "SNES", "condition": "good"}
+            for i in range(3)
+        ]
+    )
+
+    assert [game.name for game in games] == ["Game 0", "Game 1", "Game 2"]
+    assert games[0].condition is GameCreateCondition.GOOD
+
+
+def test_required_keys_are_still_required():
+    with pytest.raises(KeyError):
+        GameCreate.from_dict({"name": "Chrono Trigger"})
+
+
+@pytest.mark.parametrize("model", [Game, GameCreate, TradeMatch, User])
+def test_models_are_slotted(model):
+    assert attrs.has(model)
+    assert "__slots__" in vars(model)
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.video_game_exchange_api_client import Client, errors
+from app.video_game_exchange_api_client.api.default import get_users
+from app.video_game_exchange_api_client.models import TradeOfferStatus
+from app.video_game_exchange_api_client.pagination import aiter_offers, iter_game_search, iter_games, iter_pages
+
+GAMES = [{"id": i, "name": f"Game {i}"} for i in range(1, 251)]
+
+
+class PagedServer:
+    """Serves GAMES with the server's keyset pagination and records every request"""
+
+    def __init__(self, items=GAMES):
+        self.items = items
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def page(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.requests.append(request)
+        params = request.url.params
+        after_id = int(params.get("after_id", 0))
+        limit = int(params["limit"])
+        return httpx.Response(200, json=[item for item in self.items if item["id"] > after_id][:limit])
+
+
+def test_iter_games_follows_the_cursor_until_a_short_page():
+    server = PagedServer()
+    client = Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(server.page)})
+
+    games = list(iter_games(client=client, page_size=100))
+
+    assert [game.id for game in games] == list(range(1, 251))
+    assert [request.url.params.get("after_id") for request in server.requests] == [None, "100", "200"]
+
+
+def test_the_next_page_is_requested_before_the_current_one_is_consumed():
+    server = PagedServer()
+    client = Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(server.page)})
+
+    pages = iter_pages(get_users, client=client, page_size=100)
+    first = next(pages)
+    for _ in range(100):
+        if len(server.requests) == 2:
+            break
+        threading.Event().wait(0.01)
+
+    assert len(first) == 100
+    assert len(server.requests) == 2
+    pages.close()
+
+
+def test_search_passes_its_filters_and_stops_on_an_exact_multiple():
+    server = PagedServer(GAMES[:200])
+    client = Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(server.page)})
+
+    games = list(iter_game_search(client=client, title="Game", page_size=100, prefetch=False))
+
+    assert len(games) == 200
+    assert len(server.requests) == 3
+    assert all(request.url.path == "/games/search" for request in server.requests)
+    assert server.requests[0].url.params["title"] == "Game"
+
+
+def test_a_failed_page_raises():
+    client = Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(lambda r: httpx.Response(503))})
+
+    with pytest.raises(errors.UnexpectedStatus):
+        list(iter_games(client=client))
+
+
+def test_aiter_offers_sends_the_status_filter_and_user_header():
+    seen = []
+
+    async def handler(request):
+        seen.append(request)
+        after_id = int(request.url.params.get("after_id", 0))
+        offers = [{"id": i, "status": "pending"} for i in range(1, 6) if i > after_id]
+        return httpx.Response(200, json=offers[:2])
+
+    async def collect():
+        client = Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(handler)})
+        async with client:
+            return [offer async for offer in aiter_offers(client=client, x_user_id=7, status=TradeOfferStatus.PENDING, page_size=2)]
+
+    offers = asyncio.run(collect())
+
+    assert [offer.id for offer in offers] == [1, 2, 3, 4, 5]
+    assert offers[0].status is TradeOfferStatus.PENDING
+    assert {request.url.params["status"] for request in seen} == {"pending"}
+    assert {request.headers["X-User-ID"] for request in seen} == {"7"}
+
+
+def test_game_filters_repeat_the_platform_parameter():
+    server = PagedServer()
+    client = Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(server.page)})
+
+    list(iter_games(client=client, platform=["NES", "SNES"], owner_id=7, page_size=1000))
+
+    params = server.requests[0].url.params
+    assert params.get_list("platform") == ["NES", "SNES"]
+    assert params["owner_id"] == "7"
+
+
+def test_browse_returns_items_and_platform_counts():
+    from app.video_game_exchange_api_client.api.default import get_games_browse
+
+    def browse(request):
+        assert request.url.path == "/games/browse"
+        return httpx.Response(200, json={"items": GAMES[:2], "platform_counts": {"NES": 2, "SNES": 5}, "total": 2})
+
+    client = Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(browse)})
+    page = get_games_browse.sync(client=client, platform=["NES"])
+
+    assert [game.id for game in page.items] == [1, 2]
+    assert page.platform_counts["SNES"] == 5
+    assert page.platform_counts.to_dict() == {"NES": 2, "SNES": 5}
+    assert page.total == 2
@@ -0,0 +1,53 @@
+import asyncio
+
+import httpx
+
+from app.video_game_exchange_api_client import AuthenticatedClient, Client
+
+
+def pool_of(httpx_client):
+    return httpx_client._transport._entry.transport._pool
+
+
+def test_derived_clients_share_one_connection_pool():
+    client = Client(base_url="http://test")
+    derived = client.with_headers({"X-User-ID": "1"}).with_timeout(httpx.Timeout(3))
+
+    assert pool_of(derived.get_httpx_client()) is pool_of(client.get_httpx_client())
+    assert derived.get_httpx_client().headers["X-User-ID"] == "1"
+
+
+def test_pool_outlives_all_but_the_last_client():
+    client = Client(base_url="http://test")
+    derived = client.with_headers({"X-User-ID": "1"})
+    with client:
+        pool = pool_of(client.get_httpx_client())
+        with derived:
+            pass
+        assert pool_of(client.get_httpx_client()) is pool
+    # Both handles released: the next client gets a fresh pool
+    assert pool_of(client.with_headers({}).get_httpx_client()) is not pool
+
+
+def test_limits_keepalive_and_http2_reach_the_async_transport():
+    client = AuthenticatedClient(
+        base_url="http://test",
+        token="secret",
+        limits=httpx.Limits(max_connections=250, max_keepalive_connections=50),
+        keepalive_expiry=60,
+        http2=True,
+    )
+
+    pool = client.get_async_httpx_client()._transport._entry.transport._pool
+    assert pool._max_connections == 250
+    assert pool._max_keepalive_connections == 50
+    assert pool._keepalive_expiry == 60
+    assert pool._http2 is True
+    asyncio.run(client.get_async_httpx_client().aclose())
+
+
+def test_transport_in_httpx_args_bypasses_the_shared_pool():
+    transport = httpx.MockTransport(lambda request: httpx.Response(204))
+    client = Client(base_url="http://test", httpx_args={"transport": transport})
+
+    assert client.get_httpx_client()._transport is transport
@@ -0,0 +1,142 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.video_game_exchange_api_client import Client, errors
+from app.video_game_exchange_api_client.api.default import get_users_user_id, post_users
+from app.video_game_exchange_api_client.models import UserCreate
+from app.video_game_exchange_api_client.resilience import CircuitBreakers, RetryBudget, RetryPolicy
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+
+    async def fake_async_sleep(seconds):
+        recorded.append(seconds)
+
+    monkeypatch.setattr("app.video_game_exchange_api_client.resilience.time.sleep", recorded.append)
+    monkeypatch.setattr("app.video_game_exchange_api_client.resilience.asyncio.sleep", fake_async_sleep)
+    return recorded
+
+
+class FlakyServer:
+    """Returns the queued statuses in order, then 200"""
+
+    def __init__(self, *statuses, headers=None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        if self.statuses:
+            status = self.statuses.pop(0)
+            if status == "connect-error":
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(status, headers=self.headers)
+        return httpx.Response(200, json={"id": 1, "username": "abbey"})
+
+
+def make_client(server, **kwargs):
+    return Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(server)}, **kwargs)
+
+
+def test_retries_idempotent_requests_with_jittered_backoff(sleeps):
+    server = FlakyServer(502, 503)
+    client = make_client(server, retry=RetryPolicy(max_attempts=3, backoff_base=0.5))
+
+    user = get_users_user_id.sync(1, client=client)
+
+    assert user.username == "abbey"
+    assert server.calls == 3
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+
+
+def test_honors_retry_after(sleeps):
+    server = FlakyServer(503, headers={"Retry-After": "2"})
+    client = make_client(server, retry=RetryPolicy())
+
+    async def fetch():
+        return await get_users_user_id.asyncio(1, client=client)
+
+    assert asyncio.run(fetch()).id == 1
+    assert sleeps == [2.0]
+
+
+def test_post_is_only_retried_when_the_connection_failed(sleeps):
+    body = UserCreate(username="abbey", email="a@example.com", password="pw", address="x")
+
+    refused = FlakyServer("connect-error")
+    post_users.sync_detailed(client=make_client(refused, retry=RetryPolicy()), body=body)
+    assert refused.calls == 2
+
+    unavailable = FlakyServer(503)
+    response = post_users.sync_detailed(client=make_client(unavailable, retry=RetryPolicy()), body=body)
+    assert unavailable.calls == 1
+    assert response.status_code == 503
+
+
+def test_retry_budget_limits_retries(sleeps):
+    server = FlakyServer(*[503] * 10)
+    client = make_client(server, retry=RetryPolicy(max_attempts=5, budget=RetryBudget(ratio=0, min_tokens=2)))
+
+    response = get_users_user_id.sync_detailed(1, client=client)
+
+    assert response.status_code == 503
+    assert server.calls == 3
+
+
+def test_circuit_opens_after_repeated_failures_and_fails_fast(sleeps):
+    server = FlakyServer(*[502] * 3)
+    breakers = CircuitBreakers(failure_threshold=3, reset_timeout=30)
+    client = make_client(server, circuit_breakers=breakers)
+
+    for _ in range(3):
+        get_users_user_id.sync_detailed(1, client=client)
+    with pytest.raises(errors.CircuitOpenError):
+        get_users_user_id.sync_detailed(1, client=client)
+    assert server.calls == 3
+    assert breakers.states() == {"http://test": "open"}
+
+    # After the reset timeout one probe goes through and closes the circuit
+    breaker = breakers.for_url(httpx.URL("http://test/"))
+    breaker.opened_at -= 31
+    assert get_users_user_id.sync(1, client=client).id == 1
+    assert breakers.states() == {"http://test": "closed"}
+
+
+def test_cancelled_probe_does_not_wedge_a_half_open_circuit(sleeps):
+    calls = []
+
+    async def server(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise asyncio.CancelledError
+        return httpx.Response(200, json={"id": 1, "username": "abbey"})
+
+    breakers = CircuitBreakers(failure_threshold=1, reset_timeout=30)
+    client = make_client(server, circuit_breakers=breakers)
+    breaker = breakers.for_url(httpx.URL("http://test/"))
+    breaker.record_failure()
+    breaker.opened_at -= 31
+
+    async def probe_twice():
+        with pytest.raises(asyncio.CancelledError):
+            await get_users_user_id.asyncio_detailed(1, client=client)
+        return await get_users_user_id.asyncio(1, client=client)
+
+    assert asyncio.run(probe_twice()).id == 1
+    assert breakers.states() == {"http://test": "closed"}
+
+
+def test_post_with_idempotency_key_is_retried(sleeps):
+    body = UserCreate(username="abbey", email="a@example.com", password="pw", address="x")
+    server = FlakyServer(503)
+    client = make_client(server, retry=RetryPolicy()).with_headers({"Idempotency-Key": "signup-abbey"})
+
+    response = post_users.sync_detailed(client=client, body=body)
+
+    assert server.calls == 2
+    assert response.status_code == 200
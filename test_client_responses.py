@@ -0,0 +1,44 @@
+import httpx
+import pytest
+
+from app.video_game_exchange_api_client import Client, errors
+from app.video_game_exchange_api_client.api.default import get_games_game_id
+from app.video_game_exchange_api_client.types import ResponseReleased
+
+
+def make_client(status=200, **kwargs):
+    def handler(request):
+        return httpx.Response(status, json={"id": 7, "name": "Chrono Trigger"})
+
+    return Client(base_url="http://test", httpx_args={"transport": httpx.MockTransport(handler)}, **kwargs)
+
+
+def test_parsed_is_computed_on_first_access():
+    response = get_games_game_id.sync_detailed(7, client=make_client())
+
+    assert response.status_code == 200
+    assert not response.is_parsed
+    assert response.parsed.name == "Chrono Trigger"
+    assert response.parsed is response.parsed
+    assert response.content
+
+
+def test_lean_responses_release_content_once_parsed():
+    response = get_games_game_id.sync_detailed(7, client=make_client(lean_responses=True))
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.parsed.id == 7
+    with pytest.raises(ResponseReleased):
+        response.content
+    with pytest.raises(ResponseReleased):
+        response.headers
+
+
+def test_unexpected_status_is_raised_when_parsed_is_read():
+    response = get_games_game_id.sync_detailed(7, client=make_client(status=500, raise_on_unexpected_status=True))
+
+    assert response.status_code == 500
+    for _ in range(2):
+        with pytest.raises(errors.UnexpectedStatus):
+            response.parsed
+    assert not response.is_parsed
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import time
+import urllib.request
+
+from kafka import TopicPartition
+
+from consumer_metrics import ConsumerMetrics, Histogram, serve_metrics
+from email_consumer import process_batch
+from test_email_consumer import FakeProducer, notification, record
+
+
+class LaggingConsumer:
+    def assignment(self):
+        return {TopicPartition("email_notifications", 0), TopicPartition("email_notifications", 1)}
+
+    def end_offsets(self, partitions):
+        return {tp: 100 for tp in partitions}
+
+    def position(self, tp):
+        return 40 if tp.partition == 0 else 100
+
+
+def test_histogram_quantiles_use_bucket_upper_bounds():
+    histogram = Histogram([1, 10, 100])
+    for value in [0.5] * 90 + [50] * 10:
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 1
+    assert histogram.quantile(0.95) == 100
+    assert histogram.snapshot()["count"] == 100
+
+
+def test_lag_is_reported_per_partition():
+    metrics = ConsumerMetrics()
+    metrics.update_lag(LaggingConsumer())
+
+    snapshot = metrics.snapshot()
+    assert snapshot["lag"] == {"email_notifications[0]": 60, "email_notifications[1]": 0}
+    assert snapshot["total_lag"] == 60
+
+
+def test_batch_records_processing_and_end_to_end_latency(capsys):
+    metrics = ConsumerMetrics()
+    batch = {TopicPartition("email_notifications", 0): [
+        record(notification(enqueued_at=time.time() - 2), offset=0),
+        record(b"not json", offset=1, key=b"offer:2"),
+    ]}
+
+    asyncio.run(process_batch(batch, None, FakeProducer(), metrics))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["processed"] == {"email_notifications": 1}
+    assert snapshot["failed"] == {"email_notifications": 1}
+    assert snapshot["processing_latency"]["count"] == 2
+    assert snapshot["end_to_end_latency"]["count"] == 1
+    assert snapshot["end_to_end_latency"]["p50_ms"] >= 2000
+
+
+def test_metrics_endpoint_serves_json():
+    metrics = ConsumerMetrics()
+    server = serve_metrics(metrics, 0, host="127.0.0.1")
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            body = json.loads(response.read())
+    finally:
+        server.shutdown()
+
+    assert body["processed"] == {}
+    assert "processing_latency" in body
+
+
+def test_readers_do_not_reset_each_others_rate():
+    metrics = ConsumerMetrics(rate_window=10)
+    metrics.started_at -= 10
+    now = time.time()
+    for _ in range(50):
+        metrics.observe("email_notifications", now - 2, now - 2, None, True)
+
+    first = metrics.snapshot()["messages_per_second"]
+    # The log line and the /metrics scrape read the same window
+    assert first == metrics.snapshot()["messages_per_second"] == 5.0
@@ -0,0 +1,94 @@
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, create_engine
+
+import db_router
+import main
+
+
+def make_replica(monkeypatch, tmp_path, window=5.0):
+    # A second SQLite file standing in for a replica that hasn't caught up
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    SQLModel.metadata.create_all(replica)
+    monkeypatch.setattr(main.read_router, "replicas", [replica])
+    monkeypatch.setattr(main.read_router, "window", window)
+    monkeypatch.setattr(main.read_router, "_recent_writers", {})
+    return replica
+
+
+def test_reads_go_to_replica_unless_caller_just_wrote(monkeypatch, tmp_path):
+    make_replica(monkeypatch, tmp_path)
+    with TestClient(main.app) as writer, TestClient(main.app) as anonymous:
+        created = writer.post("/users", json={
+            "name": "Replica", "email": "replica@example.com", "password": "pass123", "address": "123 Street"
+        })
+        assert "read_primary=1" in created.headers["set-cookie"]
+        user_id = created.json()["id"]
+
+        # The writer's cookie pins its reads to the primary; others read the (lagging) replica
+        assert writer.get(f"/users/{user_id}").status_code == 200
+        assert anonymous.get(f"/users/{user_id}").status_code == 404
+        assert anonymous.get("/users").json() == []
+
+
+def test_user_id_sticks_to_primary_without_cookies(monkeypatch, tmp_path):
+    make_replica(monkeypatch, tmp_path)
+    with TestClient(main.app) as client:
+        owner_id = client.post("/users", json={
+            "name": "Sticky", "email": "sticky@example.com", "password": "pass123", "address": "123 Street"
+        }).json()["id"]
+        game_id = client.post("/games", json={"title": "Tetris", "platform": "Game Boy", "owner_id": owner_id}).json()["id"]
+        client.cookies.clear()
+
+        other = client.post("/games", json={"title": "Dr. Mario", "platform": "NES", "owner_id": owner_id}).json()["id"]
+        client.cookies.clear()
+        offer = client.post(
+            "/offers", json={"offered_game_id": game_id, "requested_game_id": other}, headers={"X-User-ID": str(owner_id)}
+        )
+        assert offer.status_code == 200
+        client.cookies.clear()
+
+        mine = client.get("/offers", headers={"X-User-ID": str(owner_id)})
+        assert [o["id"] for o in mine.json()] == [offer.json()["id"]]
+        assert client.get("/offers", headers={"X-User-ID": "999999"}).json() == []
+
+
+def test_writer_window_expires(monkeypatch, tmp_path):
+    replica = make_replica(monkeypatch, tmp_path, window=0.0)
+    router = main.read_router
+    router.create_table()
+    router.record_write("7")
+
+    class FakeRequest:
+        cookies = {}
+        headers = {"x-user-id": "7"}
+
+    assert router.engine_for(FakeRequest()) is replica
+    router.window = 60
+    router.record_write("7")
+    assert router.engine_for(FakeRequest()) is main.engine
+    FakeRequest.headers = {}
+    FakeRequest.cookies = {db_router.READ_PRIMARY_COOKIE: "1"}
+    assert router.engine_for(FakeRequest()) is main.engine
+
+
+def test_writes_through_one_process_pin_reads_in_another(tmp_path):
+    # Two workers (or replicas) with their own routers, sharing the primary
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    writer, reader = (db_router.ReadRouter(primary, [replica], window=60) for _ in range(2))
+    writer.create_table()
+
+    class FakeRequest:
+        cookies = {}
+        headers = {"x-user-id": "8"}
+
+    assert reader.engine_for(FakeRequest()) is replica
+    writer.record_write("8")
+    assert reader.engine_for(FakeRequest()) is primary
+    FakeRequest.headers = {"x-user-id": "9"}
+    assert reader.engine_for(FakeRequest()) is replica
+
+
+def test_without_replicas_everything_uses_primary():
+    router = db_router.ReadRouter(main.engine, [])
+    assert router.engine_for(object()) is main.engine
@@ -0,0 +1,232 @@
+import asyncio
+import json
+from collections import namedtuple
+
+import pytest
+from kafka import TopicPartition
+from kafka.errors import CommitFailedError
+
+import email_consumer
+from email_consumer import (
+    DEAD_LETTER_TOPIC,
+    RETRY_TOPICS,
+    ParkedKeys,
+    RetryGate,
+    RevokedPartitions,
+    forward_failure,
+    process_batch,
+)
+
+Record = namedtuple("Record", "topic partition offset key value headers")
+
+
+class FakeFuture:
+    def __init__(self, exception=None):
+        self.exception = exception
+
+    def failed(self):
+        return self.exception is not None
+
+
+class FakeProducer:
+    def __init__(self, error=None):
+        self.sent = []
+        self.error = error
+
+    def send(self, topic, value=None, key=None, headers=None):
+        self.sent.append((topic, key, value, dict(headers or [])))
+        return FakeFuture(self.error)
+
+    def flush(self):
+        pass
+
+
+class FakeConsumer:
+    def __init__(self, assigned=()):
+        self.assigned = set(assigned)
+        self.paused = set()
+        self.seeks = {}
+
+    def assignment(self):
+        return self.assigned
+
+    def pause(self, *partitions):
+        self.paused.update(partitions)
+
+    def resume(self, *partitions):
+        # Like kafka-python, which raises KeyError for a partition it isn't assigned
+        assert self.assigned.issuperset(partitions)
+        self.paused.difference_update(partitions)
+
+    def seek(self, partition, offset):
+        self.seeks[partition] = offset
+
+
+class Stop(Exception):
+    pass
+
+
+class OneBatchConsumer(FakeConsumer):
+    def __init__(self, batch, commit_error=None):
+        super().__init__(assigned=batch)
+        self.batches = [batch]
+        self.commits = 0
+        self.commit_error = commit_error
+
+    def poll(self, timeout_ms):
+        if not self.batches:
+            raise Stop
+        return self.batches.pop()
+
+    def commit(self):
+        if self.commit_error:
+            raise self.commit_error
+        self.commits += 1
+
+
+def notification(**overrides):
+    data = {"type": "offer_accepted", "recipients": ["a@example.com"], "subject": "Offer", "body": "..."}
+    data.update(overrides)
+    return json.dumps(data).encode("utf-8")
+
+
+def record(value, topic="email_notifications", offset=0, key=b"offer:1", headers=None):
+    return Record(topic, 0, offset, key, value, headers or [])
+
+
+def test_poison_message_goes_to_dead_letter_topic_and_batch_continues(capsys):
+    producer = FakeProducer()
+    bad = record(json.dumps({"type": "offer_accepted"}).encode("utf-8"), offset=0, key=b"offer:1")
+    good = record(notification(), offset=1, key=b"offer:2")
+
+    asyncio.run(process_batch({TopicPartition("email_notifications", 0): [bad, good]}, None, producer))
+
+    assert [topic for topic, *_ in producer.sent] == [DEAD_LETTER_TOPIC]
+    assert "Recipients: a@example.com" in capsys.readouterr().out
+
+
+def test_delivery_failures_move_through_retry_tiers(monkeypatch):
+    async def failing_deliver(data, pool=None):
+        raise ConnectionError("smtp down")
+
+    monkeypatch.setattr(email_consumer, "deliver", failing_deliver)
+    producer = FakeProducer()
+    current = record(notification())
+
+    topics = []
+    for _ in range(len(RETRY_TOPICS) + 1):
+        asyncio.run(process_batch({TopicPartition(current.topic, 0): [current]}, None, producer))
+        topic, key, value, headers = producer.sent[-1]
+        topics.append(topic)
+        current = record(value, topic=topic, key=key, headers=list(headers.items()))
+
+    assert topics == RETRY_TOPICS + [DEAD_LETTER_TOPIC]
+    assert producer.sent[0][3]["original_topic"] == b"email_notifications"
+    assert producer.sent[-1][3]["attempt"] == str(len(RETRY_TOPICS) + 1).encode("utf-8")
+
+
+def test_retry_gate_pauses_only_the_partition_that_is_not_due():
+    producer = FakeProducer()
+    forward_failure(producer, record(notification(), offset=5), ConnectionError())
+    topic, key, value, headers = producer.sent[0]
+    retry_tp = TopicPartition(topic, 0)
+    main_tp = TopicPartition("email_notifications", 0)
+    consumer = FakeConsumer(assigned=[retry_tp, main_tp])
+    gate = RetryGate(consumer)
+    not_before = float(headers["not_before"])
+
+    ready = gate.hold_back({
+        retry_tp: [record(value, topic=topic, offset=3, key=key, headers=list(headers.items()))],
+        main_tp: [record(notification(), offset=9)],
+    }, now=not_before - 1)
+
+    assert list(ready) == [main_tp]
+    assert consumer.paused == {retry_tp}
+    assert consumer.seeks == {retry_tp: 3}
+
+    gate.resume_due(now=not_before)
+    assert consumer.paused == set()
+
+
+def failing_first(monkeypatch):
+    """Delivery of the message with subject "first" fails until failing is emptied."""
+    delivered, failing = [], {"first"}
+
+    async def deliver(data, pool=None):
+        if data["subject"] in failing:
+            raise ConnectionError("smtp down")
+        delivered.append(data["subject"])
+
+    monkeypatch.setattr(email_consumer, "deliver", deliver)
+    return delivered, failing
+
+
+def retried(sent):
+    topic, key, value, headers = sent
+    return record(value, topic=topic, key=key, headers=list(headers.items()))
+
+
+def test_later_messages_with_a_failed_key_are_parked_behind_it(monkeypatch):
+    delivered, failing = failing_first(monkeypatch)
+    producer = FakeProducer()
+    parked = ParkedKeys()
+    tp = TopicPartition("email_notifications", 0)
+
+    asyncio.run(process_batch({tp: [
+        record(notification(subject="first"), offset=0),
+        record(notification(subject="second"), offset=1),
+        record(notification(subject="other key"), offset=2, key=b"offer:2"),
+    ]}, None, producer, parked=parked))
+
+    assert delivered == ["other key"]
+    assert [topic for topic, *_ in producer.sent] == [RETRY_TOPICS[0], RETRY_TOPICS[0]]
+    # A new message for the key waits too, until both come back off the retry topic
+    asyncio.run(process_batch({tp: [record(notification(subject="third"), offset=3)]}, None, producer, parked=parked))
+    assert delivered == ["other key"] and len(producer.sent) == 3
+
+    failing.clear()
+    retry_tp = TopicPartition(RETRY_TOPICS[0], 0)
+    asyncio.run(process_batch({retry_tp: [retried(sent) for sent in producer.sent]}, None, producer, parked=parked))
+    assert delivered == ["other key", "first", "second", "third"]
+    assert parked.waiting == {}
+
+
+def test_failed_forwards_are_not_committed(monkeypatch):
+    failing_first(monkeypatch)
+    tp = TopicPartition("email_notifications", 0)
+    consumer = OneBatchConsumer({tp: [record(notification(subject="first"), offset=7)]})
+
+    with pytest.raises(Stop):
+        asyncio.run(email_consumer.run(consumer, FakeProducer(error=TimeoutError())))
+
+    assert consumer.commits == 0
+    assert consumer.seeks == {tp: 7}
+
+
+def test_partitions_revoked_while_paused_are_not_resumed(monkeypatch):
+    failing_first(monkeypatch)
+    retry_tp = TopicPartition(RETRY_TOPICS[0], 0)
+    main_tp = TopicPartition("email_notifications", 0)
+    consumer = FakeConsumer(assigned=[retry_tp, main_tp])
+    gate, parked = RetryGate(consumer), ParkedKeys()
+    producer = FakeProducer()
+    asyncio.run(process_batch({main_tp: [record(notification(subject="first"))]}, None, producer, parked=parked))
+    not_before = float(producer.sent[0][3]["not_before"])
+    gate.hold_back({retry_tp: [retried(producer.sent[0])]}, now=not_before - 1)
+    assert consumer.paused == {retry_tp} and parked.waiting
+
+    # A rebalance moves both partitions to another consumer before the retry is due
+    RevokedPartitions(gate, parked).on_partitions_revoked([retry_tp, main_tp])
+    consumer.assigned = set()
+    gate.resume_due(now=not_before)
+
+    assert gate.paused == {} and parked.waiting == {}
+
+
+def test_a_commit_failed_by_a_rebalance_polls_again():
+    tp = TopicPartition("email_notifications", 0)
+    consumer = OneBatchConsumer({tp: [record(notification(), offset=7)]}, commit_error=CommitFailedError())
+
+    # Stop comes from the next poll, so the loop survived the failed commit
+    with pytest.raises(Stop):
+        asyncio.run(email_consumer.run(consumer, FakeProducer()))
@@ -0,0 +1,100 @@
+import asyncio
+import socket
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller  # noqa: E402
+
+from email_delivery import SMTPPool, build_email  # noqa: E402
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.peers = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.peers.add(session.peer)
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def notification(i):
+    return build_email({
+        "type": "offer_accepted",
+        "recipients": [f"user{i}@example.com"],
+        "subject": "Offer accepted",
+        "body": f"message {i}",
+    })
+
+
+def test_pool_reuses_connections(smtp_server):
+    controller, handler = smtp_server
+
+    async def send_all():
+        async with SMTPPool(controller.hostname, controller.port, size=2) as pool:
+            await asyncio.gather(*(pool.send(notification(i)) for i in range(20)))
+            return pool
+
+    pool = asyncio.run(send_all())
+
+    assert len(handler.messages) == 20
+    assert pool.connections_opened == 2
+    assert len(handler.peers) == 2
+
+
+def test_pool_recycles_connection_after_message_limit(smtp_server):
+    controller, handler = smtp_server
+
+    async def send_all():
+        async with SMTPPool(controller.hostname, controller.port, size=1, max_messages=5) as pool:
+            for i in range(12):
+                await pool.send(notification(i))
+            return pool
+
+    pool = asyncio.run(send_all())
+
+    assert len(handler.messages) == 12
+    assert pool.connections_opened == 3
+
+
+def test_pool_reconnects_after_server_restart():
+    handler = RecordingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    async def send_all():
+        nonlocal controller
+        async with SMTPPool("127.0.0.1", port, size=1) as pool:
+            await pool.send(notification(0))
+            controller.stop()
+            controller = Controller(handler, hostname="127.0.0.1", port=port)
+            controller.start()
+            await pool.send(notification(1))
+            return pool
+
+    try:
+        pool = asyncio.run(send_all())
+    finally:
+        controller.stop()
+
+    assert len(handler.messages) == 2
+    assert pool.connections_opened == 2
+    assert pool.reconnects == 1
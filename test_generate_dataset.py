@@ -0,0 +1,77 @@
+import sqlite3
+from collections import Counter
+
+import pytest
+from sqlmodel import create_engine
+
+import generate_dataset
+
+
+def dump(path):
+    with sqlite3.connect(path) as db:
+        return {
+            table: db.execute(f'SELECT * FROM "{table}" ORDER BY id').fetchall()
+            for table in ("user", "game", "tradeoffer")
+        }
+
+
+def test_same_seed_generates_same_rows(tmp_path):
+    paths = [str(tmp_path / "a.db"), str(tmp_path / "b.db")]
+    for path in paths:
+        counts = generate_dataset.generate(create_engine(f"sqlite:///{path}"), 200, 2000, 3000, seed=7, batch_size=500)
+        assert counts == {"user": 200, "game": 2000, "tradeoffer": 3000}
+    assert dump(paths[0]) == dump(paths[1])
+
+
+def test_rows_are_skewed_and_consistent(tmp_path):
+    path = str(tmp_path / "scale.db")
+    generate_dataset.generate(create_engine(f"sqlite:///{path}"), 500, 5000, 5000, seed=1, batch_size=1000)
+    rows = dump(path)
+    owners = {game_id: owner_id for game_id, _, _, owner_id in rows["game"]}
+    user_ids = {row[0] for row in rows["user"]}
+
+    assert set(owners.values()) <= user_ids
+    for _, offered, requested, requester, status in rows["tradeoffer"]:
+        assert owners[offered] == requester
+        assert owners[requested] != requester
+        assert status in ("pending", "rejected", "accepted")
+
+    # A few power-sellers own a large share of the games, and Switch beats Dreamcast
+    top_sellers = Counter(owners.values()).most_common(5)
+    assert sum(count for _, count in top_sellers) > 5000 * 0.2
+    platforms = Counter(platform for _, _, platform, _ in rows["game"])
+    assert platforms["Switch"] > platforms["Dreamcast"] * 10
+
+
+def test_appends_after_existing_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scale.db'}")
+    generate_dataset.generate(engine, 10, 50, 20, seed=3)
+    generate_dataset.generate(engine, 10, 50, 20, seed=3)
+    rows = dump(str(tmp_path / "scale.db"))
+    assert [len(rows[table]) for table in ("user", "game", "tradeoffer")] == [20, 100, 40]
+    assert all(row[3] > 10 for row in rows["game"][50:])
+
+
+def test_offers_need_two_distinct_owners(tmp_path):
+    with pytest.raises(ValueError):
+        generate_dataset.offer_rows(1, 5, 1, [1, 1, 1], seed=0, batch_size=10)
+    with pytest.raises(ValueError):
+        generate_dataset.generate(create_engine(f"sqlite:///{tmp_path / 'scale.db'}"), 1, 10, 5)
+    assert list(generate_dataset.offer_rows(1, 0, 1, [1], seed=0, batch_size=10)) == []
+
+
+def test_a_failed_run_leaves_nothing_behind(tmp_path, monkeypatch):
+    path = str(tmp_path / "scale.db")
+    engine = create_engine(f"sqlite:///{path}")
+
+    def failing_offer_rows(*args, **kwargs):
+        raise ValueError("offers need games owned by at least two different users")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(generate_dataset, "offer_rows", failing_offer_rows)
+        with pytest.raises(ValueError):
+            generate_dataset.generate(engine, 10, 50, 20, seed=3)
+    assert dump(path) == {"user": [], "game": [], "tradeoffer": []}
+
+    # So the next run starts from scratch instead of failing on duplicates
+    assert generate_dataset.generate(engine, 10, 50, 20, seed=3) == {"user": 10, "game": 50, "tradeoffer": 20}
@@ -0,0 +1,74 @@
+import os
+import runpy
+import subprocess
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def load_config(monkeypatch):
+    for name in ("WEB_CONCURRENCY", "DB_CONNECTION_BUDGET", "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_CREATE_TABLES",
+                 "RATE_LIMIT_LEASE_THREADS"):
+        # setenv first so the original value (or its absence) is restored after the test,
+        # including the variables gunicorn.conf.py sets itself
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+
+    def load(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return runpy.run_path(os.path.join(os.path.dirname(__file__), "gunicorn.conf.py"))
+
+    return load
+
+
+def test_connection_budget_is_split_between_workers(load_config):
+    config = load_config(WEB_CONCURRENCY="4", DB_CONNECTION_BUDGET="30")
+    assert config["workers"] == 4
+    assert os.environ["DB_POOL_SIZE"] == "7"
+    assert os.environ["DB_MAX_OVERFLOW"] == "0"
+    assert os.environ["DB_CREATE_TABLES"] == "0"
+
+
+def test_budget_below_the_workers_needs_fails(load_config):
+    # Each worker needs the two lease threads, the idempotency store, the match rebuild and a request
+    with pytest.raises(RuntimeError, match="lower WEB_CONCURRENCY"):
+        load_config(WEB_CONCURRENCY="8", DB_CONNECTION_BUDGET="30")
+    with pytest.raises(RuntimeError, match="one worker needs"):
+        load_config(WEB_CONCURRENCY="0", DB_CONNECTION_BUDGET="4")
+
+
+def test_default_workers_fit_the_budget(load_config, monkeypatch):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(16)), raising=False)
+    config = load_config(DB_CONNECTION_BUDGET="30")
+    assert config["workers"] * int(os.environ["DB_POOL_SIZE"]) <= 30
+    assert int(os.environ["DB_POOL_SIZE"]) >= config["DB_MIN_WORKER_CONNECTIONS"] == 5
+    assert config["budget_warning"]
+
+
+def test_workers_default_to_available_cpus(load_config):
+    config = load_config(DB_POOL_SIZE="3")
+    assert config["workers"] == config["available_cpus"]() >= 1
+    assert os.environ["DB_POOL_SIZE"] == "3"
+
+
+def test_tables_are_created_once_before_forking(load_config, monkeypatch):
+    config = load_config(WEB_CONCURRENCY="2")
+    commands = []
+    monkeypatch.setattr(subprocess, "run", lambda command, check: commands.append(command))
+    log = type("Log", (), {"info": lambda *args: None, "warning": lambda *args: None})()
+    config["on_starting"](type("Server", (), {"log": log})())
+    assert len(commands) == 1 and commands[0][-1] == "import main; main.create_tables()"
+
+
+def test_workers_skip_create_all(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    calls = []
+    monkeypatch.setattr(main, "DB_CREATE_TABLES", False)
+    monkeypatch.setattr(main, "create_tables", lambda: calls.append(True))
+    with TestClient(main.app):
+        pass
+    assert calls == []
@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlmodel import create_engine
+
+import idempotency
+import main
+
+
+def new_user(name):
+    return {"name": name, "email": f"{name.lower()}@example.com", "password": "pass123", "address": "123 Street"}
+
+
+def test_retry_gets_stored_response_without_running_again():
+    with TestClient(main.app) as client:
+        headers = {"Idempotency-Key": "create-user-retry"}
+        first = client.post("/users", json=new_user("Retry"), headers=headers)
+        second = client.post("/users", json=new_user("Retry"), headers=headers)
+
+        assert first.status_code == second.status_code == 201
+        assert second.json() == first.json()
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+        # Without a key every POST creates a new user
+        assert client.post("/users", json=new_user("Retry")).json()["id"] != first.json()["id"]
+
+
+def test_key_reused_with_different_body_is_rejected():
+    with TestClient(main.app) as client:
+        headers = {"Idempotency-Key": "create-user-mismatch"}
+        assert client.post("/users", json=new_user("Original"), headers=headers).status_code == 201
+        mismatch = client.post("/users", json=new_user("Changed"), headers=headers)
+        assert mismatch.status_code == 422
+
+
+def test_keys_are_scoped_per_user_and_route():
+    with TestClient(main.app) as client:
+        owner_id = client.post("/users", json=new_user("Scoped")).json()["id"]
+        game = {"title": "Kirby", "platform": "Game Boy", "owner_id": owner_id}
+        headers = {"Idempotency-Key": "same-key"}
+        first = client.post("/games", json=game, headers={**headers, "X-User-ID": "1"})
+        other_user = client.post("/games", json=game, headers={**headers, "X-User-ID": "2"})
+        assert first.json()["id"] != other_user.json()["id"]
+
+
+def make_app(tmp_path, fail_first_with=None):
+    store = idempotency.IdempotencyStore(create_engine(f"sqlite:///{tmp_path / 'keys.db'}"))
+    store.create_table()
+    app = FastAPI()
+    calls = []
+
+    @app.post("/offers")
+    async def create_offer(offer: dict):
+        calls.append(offer)
+        await asyncio.sleep(0.1)
+        if fail_first_with and len(calls) == 1:
+            raise HTTPException(fail_first_with, "Try again")
+        return {"id": len(calls), **offer}
+
+    return idempotency.IdempotencyMiddleware(app, store, ["/offers"], wait_seconds=5), calls
+
+
+def test_concurrent_duplicates_wait_for_the_first_attempt(tmp_path):
+    app, calls = make_app(tmp_path)
+
+    async def race():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/offers", json={"offered_game_id": 1}, headers={"Idempotency-Key": "k"})
+                for _ in range(5)
+            ))
+
+    responses = asyncio.run(race())
+    assert len(calls) == 1
+    assert {response.json()["id"] for response in responses} == {1}
+    assert sum(response.headers.get("Idempotent-Replayed") == "true" for response in responses) == 4
+
+
+@pytest.mark.parametrize("status_code", [503, 429, 409])
+def test_server_errors_and_retryable_statuses_are_not_stored(tmp_path, status_code):
+    app, calls = make_app(tmp_path, fail_first_with=status_code)
+
+    async def retry():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = {"Idempotency-Key": "k"}
+            failed = await client.post("/offers", json={"offered_game_id": 1}, headers=headers)
+            retried = await client.post("/offers", json={"offered_game_id": 1}, headers=headers)
+            return failed, retried
+
+    failed, retried = asyncio.run(retry())
+    assert failed.status_code == status_code
+    assert retried.status_code == 200 and len(calls) == 2
+    assert "Idempotent-Replayed" not in retried.headers
+
+
+def test_an_attempt_taken_over_cannot_complete_or_release_the_new_claim(tmp_path):
+    store = idempotency.IdempotencyStore(create_engine(f"sqlite:///{tmp_path / 'keys.db'}"), lock_seconds=-1)
+    store.create_table()
+    assert store.begin("k", "f", "slow") is None
+    # The slow attempt's lock has lapsed, so a duplicate takes the key over
+    assert store.begin("k", "f", "duplicate") is None
+
+    store.complete("k", "slow", 200, "application/json", b"{}")
+    store.release("k", "slow")
+    row = store.get("k")
+    assert row.token == "duplicate" and row.state == idempotency.IN_PROGRESS
+
+    store.complete("k", "duplicate", 201, "application/json", b"{}")
+    assert store.get("k").status_code == 201
@@ -0,0 +1,126 @@
+import threading
+
+from matching import MatchEngine, TradeGraph
+
+
+def cycle_users(graph, user_id, **kwargs):
+    return [cycle.users for cycle in graph.find_cycles(user_id, **kwargs)]
+
+
+def test_finds_cycles_of_two_to_four_users_shortest_first():
+    graph = TradeGraph()
+    # 1 <-> 2, 1 -> 3 -> 4 -> 1, 1 -> 5 -> 6 -> 7 -> 1
+    edges = [(1, 2), (2, 1), (1, 3), (3, 4), (4, 1), (1, 5), (5, 6), (6, 7), (7, 1)]
+    for offer_id, (requester, owner) in enumerate(edges, start=1):
+        graph.add_offer(offer_id, requester, owner)
+
+    assert cycle_users(graph, 1) == [[1, 2], [1, 3, 4], [1, 5, 6, 7]]
+    assert cycle_users(graph, 1, max_length=3) == [[1, 2], [1, 3, 4]]
+    assert cycle_users(graph, 1, limit=2) == [[1, 2], [1, 3, 4]]
+    assert cycle_users(graph, 6) == [[6, 7, 1, 5]]
+    assert [cycle.offer_ids for cycle in graph.find_cycles(3)] == [[4, 5, 3]]
+
+
+def test_cycles_never_revisit_a_user():
+    graph = TradeGraph()
+    # 1 -> 2 -> 1 and 2 -> 3 -> 1, but 1 -> 2 -> 1 -> ... is not a 4-cycle
+    for offer_id, (requester, owner) in enumerate([(1, 2), (2, 1), (2, 3), (3, 1)], start=1):
+        graph.add_offer(offer_id, requester, owner)
+    assert cycle_users(graph, 1) == [[1, 2], [1, 2, 3]]
+
+
+def test_updates_incrementally_per_offer():
+    graph = TradeGraph()
+    graph.add_offer(1, 1, 2)
+    graph.add_offer(2, 2, 1)
+    graph.add_offer(3, 2, 1)  # a second offer on the same hop
+    graph.add_offer(4, 5, 5)  # asking for your own game is not an edge
+    assert len(graph) == 3
+    assert graph.find_cycles(1)[0].offer_ids == [1, 2]
+
+    graph.remove_offer(2)
+    assert graph.find_cycles(1)[0].offer_ids == [1, 3]
+    graph.remove_offer(3)
+    graph.remove_offer(3)
+    assert graph.find_cycles(1) == []
+    assert 2 not in graph.out_edges and 1 not in graph.in_edges
+
+
+def test_fanout_bounds_the_search_around_a_hub():
+    graph = TradeGraph()
+    for requester in range(2, 102):
+        graph.add_offer(requester, requester, 1)
+        graph.add_offer(1000 + requester, 1, requester)
+    assert len(graph.find_cycles(1, limit=1000)) == 100
+    assert 0 < len(graph.find_cycles(1, limit=1000, max_fanout=10)) <= 10
+
+
+def test_budget_bounds_the_whole_search():
+    graph = TradeGraph()
+    # 100 three-user cycles 1 -> a -> b -> 1
+    for i in range(100):
+        a, b = 2 + 2 * i, 3 + 2 * i
+        graph.add_offer(3 * i + 1, 1, a)
+        graph.add_offer(3 * i + 2, a, b)
+        graph.add_offer(3 * i + 3, b, 1)
+    assert len(graph.find_cycles(1, limit=1000)) == 100
+    assert 0 < len(graph.find_cycles(1, limit=1000, budget=150)) < 100
+
+
+def test_engine_catches_up_and_rebuilds_from_the_database():
+    pending = {1: (1, 2), 2: (2, 1)}
+    loads = []
+
+    def load(after_id):
+        loads.append(after_id)
+        return [(offer_id, *edge) for offer_id, edge in sorted(pending.items()) if offer_id > after_id]
+
+    engine = MatchEngine(load, sync_every=3600)
+    engine.catch_up()
+    assert len(engine.graph.find_cycles(1)) == 1
+
+    pending[3] = (1, 3)
+    pending[4] = (3, 1)
+    engine.catch_up()
+    assert loads == [0]  # throttled
+    engine.catch_up(force=True)
+    assert loads == [0, 2] and len(engine.graph.find_cycles(1)) == 2
+
+    # Withdrawn elsewhere: only a rebuild notices
+    del pending[1]
+    engine.rebuild()
+    assert [cycle.users for cycle in engine.graph.find_cycles(1)] == [[1, 3]]
+
+
+def test_local_offers_do_not_hide_lower_ids_from_other_replicas():
+    pending = {offer_id: (offer_id, offer_id + 100) for offer_id in range(1, 11)}
+
+    def load(after_id):
+        return [(offer_id, *edge) for offer_id, edge in sorted(pending.items()) if offer_id > after_id]
+
+    engine = MatchEngine(load)
+    # A fresh worker creates offer 11 before its first read
+    pending[11] = (11, 111)
+    engine.add_offer(11, 11, 111)
+    engine.catch_up()
+    assert len(engine.graph) == 11 and engine.watermark == 11
+
+
+def test_changes_during_a_rebuild_reach_the_new_graph():
+    loading = threading.Event()
+    release = threading.Event()
+
+    def load(after_id):
+        loading.set()
+        release.wait(5)
+        return [(1, 1, 2), (2, 2, 1)]
+
+    engine = MatchEngine(load)
+    rebuild = threading.Thread(target=engine.rebuild)
+    rebuild.start()
+    loading.wait(5)
+    engine.remove_offer(2)
+    engine.add_offer(3, 2, 1)
+    release.set()
+    rebuild.join()
+    assert sorted(engine.graph.offers) == [1, 3]
@@ -0,0 +1,35 @@
+import main
+
+
+class FakeProducer:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, topic, value, key=None):
+        self.sent.append((topic, key, value))
+
+    def flush(self):
+        pass
+
+
+def test_offer_notifications_are_keyed_by_offer(monkeypatch):
+    producer = FakeProducer()
+    monkeypatch.setattr(main, "_producer", producer)
+
+    main.send_email_notification({
+        "type": "offer_accepted",
+        "offer_id": 7,
+        "recipients": ["a@example.com", "b@example.com"],
+        "subject": "Offer accepted",
+        "body": "...",
+    })
+
+    topic, key, value = producer.sent[0]
+    assert topic == main.EMAIL_TOPIC
+    assert key == "offer:7"
+    assert isinstance(value["enqueued_at"], float)
+
+
+def test_notifications_without_offer_are_keyed_by_recipient():
+    assert main.notification_key({"recipients": ["a@example.com"]}) == "recipient:a@example.com"
+    assert main.notification_key({"recipients": []}) is None
@@ -0,0 +1,100 @@
+import time
+from collections import OrderedDict
+
+from fastapi.testclient import TestClient
+from sqlmodel import create_engine
+
+import main
+import rate_limit
+
+
+def settle(limiter):
+    """Wait for background leases to land."""
+    while any(bucket.leasing for bucket in list(limiter._local.values())):
+        time.sleep(0.001)
+
+
+def test_parse_limits():
+    limits = rate_limit.parse_limits("POST /offers=2:20, GET /offers/{offer_id}=0.5:4")
+    assert set(limits) == {"POST /offers", "GET /offers/{offer_id}"}
+    assert (limits["POST /offers"].rate, limits["POST /offers"].burst) == (2.0, 20)
+    assert limits["GET /offers/{offer_id}"].lease == 1
+
+
+def test_replicas_share_one_bucket(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'limits.db'}")
+    limits = {"POST /offers": rate_limit.Limit(rate=0.001, burst=10, lease_fraction=0.3)}
+    replicas = [rate_limit.TokenBucketLimiter(engine, limits) for _ in range(2)]
+    replicas[0].create_table()
+
+    allowed = 0
+    for attempt in range(40):
+        replica = replicas[attempt % 2]
+        if replica.acquire(1, "POST /offers") is None:
+            allowed += 1
+        settle(replica)
+
+    # Each replica may run at most one lease (3 tokens) ahead of the shared bucket
+    assert allowed <= 10 + 2 * 3
+    assert allowed >= 10
+    retry_after = replicas[0].acquire(1, "POST /offers")
+    assert retry_after is not None and retry_after > 0
+    # Other users and unlimited routes are unaffected
+    assert replicas[0].acquire(2, "POST /offers") is None
+    assert replicas[0].acquire(1, "GET /games") is None
+
+
+def test_tokens_refill_over_time(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'limits.db'}")
+    limiter = rate_limit.TokenBucketLimiter(engine, {"GET /offers": rate_limit.Limit(rate=50, burst=1)})
+    limiter.create_table()
+    allowed = 0
+    while (retry_after := limiter.acquire(1, "GET /offers")) is None:
+        allowed += 1
+        settle(limiter)
+    assert allowed <= 2  # the burst, plus one lease on credit
+    assert 0 < retry_after <= 0.05
+    time.sleep(retry_after + 0.01)
+    assert limiter.acquire(1, "GET /offers") is None
+
+
+def test_requests_do_not_wait_for_the_shared_table(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'limits.db'}")
+    limiter = rate_limit.TokenBucketLimiter(engine, {"GET /offers": rate_limit.Limit(rate=20, burst=100)})
+    limiter.create_table()
+    lease = limiter._lease
+    monkeypatch.setattr(limiter, "_lease", lambda *args: time.sleep(0.2) or lease(*args))
+
+    start = time.perf_counter()
+    # A cold bucket runs on credit of one lease (10 tokens) while its first lease is in flight
+    assert all(limiter.acquire(1, "GET /offers") is None for _ in range(10))
+    assert limiter.acquire(1, "GET /offers") is not None
+    assert time.perf_counter() - start < 0.1
+    settle(limiter)
+    assert limiter._local["1:GET /offers"].tokens >= 0  # the credit was paid back
+
+
+def test_idle_buckets_are_evicted(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'limits.db'}")
+    limiter = rate_limit.TokenBucketLimiter(engine, {"GET /offers": rate_limit.Limit(rate=20, burst=100)},
+                                            max_buckets=2)
+    limiter.create_table()
+    for user_id in (1, 2, 1, 3):
+        limiter.acquire(user_id, "GET /offers")
+    settle(limiter)
+    assert list(limiter._local) == ["1:GET /offers", "3:GET /offers"]
+
+
+def test_limited_requests_get_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(main.rate_limiter, "limits", {"GET /offers": rate_limit.Limit(rate=0.01, burst=2)})
+    monkeypatch.setattr(main.rate_limiter, "_local", OrderedDict())
+    with TestClient(main.app) as client:
+        headers = {"X-User-ID": "424242"}
+        assert client.get("/offers", headers=headers).status_code == 200
+        settle(main.rate_limiter)
+        assert client.get("/offers", headers=headers).status_code == 200
+        settle(main.rate_limiter)
+        limited = client.get("/offers", headers=headers)
+        assert limited.status_code == 429
+        assert int(limited.headers["Retry-After"]) >= 1
+        assert client.get("/offers", headers={"X-User-ID": "424243"}).status_code == 200
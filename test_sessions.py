@@ -0,0 +1,73 @@
+import asyncio
+import json
+import time
+
+import pytest
+from sqlalchemy import event
+
+import main
+
+
+@pytest.fixture
+def pool_events():
+    main.create_tables()
+    events = []
+
+    def checkout(*args):
+        events.append(("checkout", time.perf_counter()))
+
+    def checkin(*args):
+        events.append(("checkin", time.perf_counter()))
+
+    event.listen(main.engine, "checkout", checkout)
+    event.listen(main.engine, "checkin", checkin)
+    yield events
+    event.remove(main.engine, "checkout", checkout)
+    event.remove(main.engine, "checkin", checkin)
+
+
+def call(method, path, body=b"", headers=(), send_delay=0.0):
+    """Run one request through the ASGI app, with a client that takes send_delay to accept each body chunk."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            sent.append(("body_started", time.perf_counter()))
+            await asyncio.sleep(send_delay)
+        else:
+            sent.append((message["status"], time.perf_counter()))
+
+    scope = {
+        "type": "http", "http_version": "1.1", "method": method, "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "scheme": "http", "server": ("test", 80), "client": ("test", 1),
+        "headers": [(b"content-type", b"application/json"), *headers],
+    }
+    asyncio.run(main.app(scope, receive, send))
+    return sent
+
+
+def test_connection_is_returned_before_a_slow_client_reads_the_response(pool_events):
+    sent = call("GET", "/games", send_delay=0.3)
+
+    assert [name for name, _ in pool_events] == ["checkout", "checkin"]
+    checkout_at, checkin_at = pool_events[0][1], pool_events[1][1]
+    body_started = next(at for name, at in sent if name == "body_started")
+    assert checkin_at <= body_started
+    # Held for the query and serialization only, not for the 300 ms the client takes
+    assert checkin_at - checkout_at < 0.1
+
+
+def test_rejected_requests_never_check_out_a_connection(pool_events):
+    assert call("POST", "/games", body=b'{"title": ')[0][0] == 422
+    assert call("GET", "/offers")[0][0] == 401
+    assert pool_events == []
+
+
+def test_committed_objects_are_returned_after_the_session_closes(pool_events):
+    body = json.dumps({"name": "Closed", "email": "c@example.com", "password": "pw", "address": "1 Road"}).encode()
+    sent = call("POST", "/users", body=body)
+    assert sent[0][0] == 201
+    assert [name for name, _ in pool_events] == ["checkout", "checkin"]
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import os
+import time
+
+import httpx
+from fastapi import FastAPI, Header
+
+import replay
+from traffic_capture import CaptureMiddleware, RotatingJSONLWriter
+
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/games/{game_id}")
+    def get_game(game_id: int):
+        return {"id": game_id}
+
+    @app.post("/offers")
+    def create_offer(offer: dict, x_user_id: int = Header()):
+        return {**offer, "requester_id": x_user_id}
+
+    return app
+
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_middleware_records_requests_for_replay(tmp_path):
+    path = str(tmp_path / "capture.jsonl")
+    writer = RotatingJSONLWriter(path)
+    app = CaptureMiddleware(make_app(), writer, sample_rate=1.0, headers=["x-user-id", "content-type"])
+
+    async def traffic():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/games/7", params={"fields": "id"}, headers={"Cookie": "session=secret"})
+            await client.post("/offers", json={"offered_game_id": 1}, headers={"X-User-ID": "3"})
+        await writer.aclose()
+
+    asyncio.run(traffic())
+
+    get, post = read_lines(path)
+    assert (get["method"], get["path"], get["query"], get["status"]) == ("GET", "/games/7", "fields=id", 200)
+    assert get["headers"] == {}
+    assert get["duration_ms"] > 0 and get["response_bytes"] == len(b'{"id":7}')
+    assert post["headers"] == {"x-user-id": "3", "content-type": "application/json"}
+    assert json.loads(post["body"]) == {"offered_game_id": 1}
+
+
+def test_sampling_skips_requests(tmp_path):
+    path = str(tmp_path / "capture.jsonl")
+    writer = RotatingJSONLWriter(path)
+    app = CaptureMiddleware(make_app(), writer, sample_rate=0.0)
+
+    async def traffic():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/games/7")
+        await writer.aclose()
+
+    asyncio.run(traffic())
+
+    assert not os.path.exists(path)
+
+
+def test_writer_rotates_and_keeps_a_bounded_number_of_files(tmp_path):
+    path = str(tmp_path / "capture.jsonl")
+    writer = RotatingJSONLWriter(path, max_bytes=1000, backups=2)
+
+    async def write():
+        for i in range(100):
+            writer.write({"i": i, "padding": "x" * 50})
+            await asyncio.sleep(0)
+        await writer.aclose()
+
+    asyncio.run(write())
+
+    assert sorted(os.listdir(tmp_path)) == ["capture.jsonl", "capture.jsonl.1", "capture.jsonl.2"]
+    assert all(os.path.getsize(tmp_path / name) <= 1000 for name in os.listdir(tmp_path))
+    assert read_lines(path)[-1]["i"] == 99
+    assert writer.rotations >= 2 and writer.dropped == 0
+
+
+def test_replay_keeps_scaled_timing_and_reports_differences(tmp_path):
+    capture = tmp_path / "capture.jsonl"
+    records = [
+        {"ts": 100.0, "method": "GET", "path": "/games/1", "query": "", "headers": {}, "status": 200, "duration_ms": 5},
+        {"ts": 100.2, "method": "GET", "path": "/games/2", "query": "", "headers": {}, "status": 200, "duration_ms": 7},
+        {"ts": 100.4, "method": "POST", "path": "/offers", "query": "", "headers": {"x-user-id": "3"},
+         "body": '{"offered_game_id": 1}', "status": 200, "duration_ms": 9},
+    ]
+    capture.write_text("".join(json.dumps(record) + "\n" for record in reversed(records)))
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, request.url.path, request.headers.get("x-user-id"), request.content))
+        return httpx.Response(404 if request.url.path == "/games/2" else 200)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://target") as client:
+            start = time.perf_counter()
+            results = await replay.replay(replay.load_records([str(capture)]), client, speed=4, concurrency=2)
+            return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+
+    assert [path for _, path, _, _ in seen] == ["/games/1", "/games/2", "/offers"]
+    assert seen[2][2:] == ("3", b'{"offered_game_id": 1}')
+    assert 0.09 <= elapsed < 0.5
+    summary = replay.summarize(results)
+    assert "GET /games/{id}" in summary
+    assert "3 requests replayed, 1 with a different status, 0 errors" in summary
+    assert "/games/2: 200 -> 404" in summary
+
+
+def test_writer_keeps_running_after_a_write_error(tmp_path, monkeypatch):
+    path = str(tmp_path / "capture.jsonl")
+    writer = RotatingJSONLWriter(path)
+    append = writer._append
+    failures = [OSError(28, "No space left on device")]
+
+    def flaky_append(lines):
+        if failures:
+            raise failures.pop()
+        append(lines)
+
+    monkeypatch.setattr(writer, "_append", flaky_append)
+
+    async def write():
+        writer.write({"i": 0})
+        await writer._queue.join()
+        writer.write({"i": 1})
+        await writer.aclose()
+
+    asyncio.run(write())
+
+    assert [line["i"] for line in read_lines(path)] == [1]
+    assert writer.write_errors == 1 and writer.dropped == 1
+
+
+def test_replay_keeps_at_most_concurrency_requests_in_flight():
+    records = [{"ts": 100.0, "method": "GET", "path": f"/games/{i}", "status": 200} for i in range(20)]
+    in_flight, peak = 0, 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return httpx.Response(200)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://target") as client:
+            return await replay.replay(records, client, speed=0, concurrency=3)
+
+    results = asyncio.run(run())
+    assert [result.record["path"] for result in results] == [record["path"] for record in records]
+    assert peak == 3
+
+
+def test_capture_outside_idempotency_records_replayed_retries(tmp_path):
+    from sqlmodel import create_engine
+
+    import idempotency
+
+    store = idempotency.IdempotencyStore(create_engine(f"sqlite:///{tmp_path / 'keys.db'}"))
+    store.create_table()
+    path = str(tmp_path / "capture.jsonl")
+    writer = RotatingJSONLWriter(path)
+    # The order main.py installs them in: capture outermost
+    app = CaptureMiddleware(idempotency.IdempotencyMiddleware(make_app(), store, ["/offers"]), writer, sample_rate=1.0)
+
+    async def traffic():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            for _ in range(2):
+                await client.post("/offers", json={"offered_game_id": 1},
+                                  headers={"X-User-ID": "3", "Idempotency-Key": "retry-me"})
+        await writer.aclose()
+
+    asyncio.run(traffic())
+
+    first, retry = read_lines(path)
+    assert first["headers"]["idempotency-key"] == retry["headers"]["idempotency-key"] == "retry-me"
+    assert first["status"] == retry["status"] == 200
+
+
+def test_replay_skips_truncated_bodies():
+    records = [
+        {"ts": 1.0, "method": "POST", "path": "/offers", "body": '{"offered', "body_truncated": True},
+        {"ts": 2.0, "method": "POST", "path": "/offers", "body": "{}"},
+    ]
+    assert replay.complete_records(records) == records[1:]
@@ -0,0 +1,216 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+# Capture is off unless CAPTURE_ENABLED is set
+CAPTURE_ENABLED = os.getenv("CAPTURE_ENABLED", "").lower() in ("1", "true", "yes")
+# Where captured requests go; rotated files get a .1, .2, ... suffix. "{pid}" is
+# replaced with the process id, so each server worker writes its own file.
+CAPTURE_PATH = os.getenv("CAPTURE_PATH", "captures/requests-{pid}.jsonl")
+# Share of requests captured (0.0 - 1.0)
+CAPTURE_SAMPLE_RATE = float(os.getenv("CAPTURE_SAMPLE_RATE", "1.0"))
+# Rotate the capture file once it grows past this many bytes, keeping CAPTURE_BACKUPS old files
+CAPTURE_MAX_BYTES = int(os.getenv("CAPTURE_MAX_BYTES", str(50 * 1024 * 1024)))
+CAPTURE_BACKUPS = int(os.getenv("CAPTURE_BACKUPS", "5"))
+# Request headers worth keeping; everything else (cookies, auth) is left out. Idempotency-Key
+# is kept so replayed retries hit the idempotency layer like the originals did.
+CAPTURE_HEADERS = [
+    name.strip().lower()
+    for name in os.getenv("CAPTURE_HEADERS", "x-user-id,content-type,if-none-match,accept,idempotency-key").split(",")
+    if name.strip()
+]
+# Longer bodies are truncated (and flagged) so one upload can't blow up the capture
+CAPTURE_MAX_BODY = int(os.getenv("CAPTURE_MAX_BODY", str(64 * 1024)))
+
+logger = logging.getLogger(__name__)
+
+
+class RotatingJSONLWriter:
+    """Appends records as JSON lines without blocking the event loop.
+
+    Records are queued and written by a background task, in batches, on a worker
+    thread. When the queue is full new records are dropped (and counted) rather
+    than slowing requests down. The file is rotated once it passes max_bytes.
+    A batch that can't be written (disk full, permissions) is logged and dropped,
+    and capture carries on with the next one.
+    """
+
+    def __init__(self, path: str, max_bytes: int = CAPTURE_MAX_BYTES, backups: int = CAPTURE_BACKUPS,
+                 max_queue: int = 10000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.rotations = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._max_queue = max_queue
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, record: dict):
+        """Queue a record; must be called from the event loop."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(self._max_queue)
+            self._task = loop.create_task(self._run())
+        try:
+            self._queue.put_nowait(json.dumps(record, separators=(",", ":")) + "\n")
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self):
+        while True:
+            lines = [await self._queue.get()]
+            while not self._queue.empty() and len(lines) < 1000:
+                lines.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._append, lines)
+            except OSError:
+                self.write_errors += 1
+                self.dropped += len(lines)
+                logger.exception("Dropped %d captured requests: could not write %s", len(lines), self.path)
+            finally:
+                for _ in lines:
+                    self._queue.task_done()
+
+    def _append(self, lines: List[str]):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        chunk: List[bytes] = []
+        for line in lines:
+            data = line.encode("utf-8")
+            if size and size + len(data) > self.max_bytes:
+                self._flush(chunk)
+                self._rotate()
+                chunk, size = [], 0
+            chunk.append(data)
+            size += len(data)
+        self._flush(chunk)
+        self.written += len(lines)
+
+    def _flush(self, chunk: List[bytes]):
+        if chunk:
+            with open(self.path, "ab") as f:
+                f.write(b"".join(chunk))
+
+    def _rotate(self):
+        if self.backups <= 0:
+            os.remove(self.path)
+        else:
+            for index in range(self.backups - 1, 0, -1):
+                older = f"{self.path}.{index}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self.rotations += 1
+
+    async def aclose(self):
+        """Write everything still queued, then stop the background task."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def encode_body(body: bytes) -> dict:
+    if not body:
+        return {}
+    fields = {}
+    if len(body) > CAPTURE_MAX_BODY:
+        body = body[:CAPTURE_MAX_BODY]
+        fields["body_truncated"] = True
+    try:
+        fields["body"] = body.decode("utf-8")
+    except UnicodeDecodeError:
+        fields["body_b64"] = base64.b64encode(body).decode("ascii")
+    return fields
+
+
+def decode_body(record: dict) -> bytes:
+    if "body_b64" in record:
+        return base64.b64decode(record["body_b64"])
+    return record.get("body", "").encode("utf-8")
+
+
+class CaptureMiddleware:
+    """ASGI middleware recording a sample of requests for later replay.
+
+    Each captured request becomes one JSON line with its wall-clock time, method,
+    path, query string, the headers named in CAPTURE_HEADERS, the body, and the
+    response status, size and duration.
+    """
+
+    def __init__(self, app, writer: RotatingJSONLWriter, sample_rate: float = CAPTURE_SAMPLE_RATE,
+                 headers: List[str] = CAPTURE_HEADERS):
+        self.app = app
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.headers = set(headers)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.time()
+        start = time.perf_counter()
+        body = bytearray()
+        response = {"status": None, "bytes": 0}
+
+        async def capture_receive():
+            message = await receive()
+            if message["type"] == "http.request" and len(body) <= CAPTURE_MAX_BODY:
+                body.extend(message.get("body", b""))
+            return message
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            headers: Dict[str, str] = {}
+            for name, value in scope.get("headers", []):
+                name = name.decode("latin-1").lower()
+                if name in self.headers:
+                    headers[name] = value.decode("latin-1")
+            self.writer.write({
+                "ts": round(started_at, 6),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "headers": headers,
+                **encode_body(bytes(body)),
+                "status": response["status"],
+                "response_bytes": response["bytes"],
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+
+def writer_from_env() -> Optional[RotatingJSONLWriter]:
+    """The capture writer configured by CAPTURE_* variables, or None when capture is off."""
+    if not CAPTURE_ENABLED:
+        return None
+    return RotatingJSONLWriter(CAPTURE_PATH.format(pid=os.getpid()))